@@ -9,13 +9,14 @@ from rich.prompt import Prompt
 
 
 # Internal utilities
+from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template import get_select_title
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
 
 
 # Logic class
-from .site import title_search, media_search_manager, table_show_manager
+from .site import title_search
 from .title import download_title
 
 
@@ -55,14 +56,15 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
         string_to_search = msg.ask(f"\n[purple]Insert word to search in [green]{site_constant.SITE_NAME}").strip()
 
     # Perform the database search
-    len_database = title_search(quote_plus(string_to_search))
+    media_search_manager = title_search(quote_plus(string_to_search))
+    len_database = media_search_manager.get_length()
 
     # If only the database is needed, return the manager
     if get_onlyDatabase:
         return media_search_manager
 
     if len_database > 0:
-        select_title = get_select_title(table_show_manager, media_search_manager, len_database)
+        select_title = get_select_title(TVShowManager(), media_search_manager, len_database)
         download_title(select_title)
 
     else:
@@ -3,7 +3,6 @@
 import sys
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
@@ -11,22 +10,20 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
 
 
 # Logic class
-from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('1337xx')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
-def title_search(query: str) -> int:
+def title_search(query: str) -> MediaManager:
     """
     Search for titles based on a search query.
 
@@ -34,16 +31,15 @@ def title_search(query: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        - int: The number of titles found.
+        - MediaManager: The titles found, a new object for every search.
     """
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
 
-    search_url = f"{site_constant.FULL_URL}/search/{query}/1/"
+    search_url = f"{site_context.full_url}/search/{query}/1/"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     try:
-        response = httpx.get(
+        response = site_context.client().get(
             search_url, 
             headers={'user-agent': get_userAgent()}, 
             timeout=max_timeout, 
@@ -52,8 +48,8 @@ def title_search(query: str) -> int:
         response.raise_for_status()
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        return 0
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
+        return media_search_manager
 
     # Create soup and find table
     soup = BeautifulSoup(response.text, "html.parser")
@@ -78,5 +74,5 @@ def title_search(query: str) -> int:
         except Exception as e:
             print(f"Error parsing a film entry: {e}")
 
-    # Return the number of titles found
-    return media_search_manager.get_length()
\ No newline at end of file
+    # Return the titles found
+    return media_search_manager
\ No newline at end of file
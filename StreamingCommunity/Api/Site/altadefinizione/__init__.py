@@ -11,6 +11,7 @@ from rich.prompt import Prompt
 
 
 # Internal utilities
+from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template import get_select_title
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
@@ -18,7 +19,7 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
-from .site import title_search, table_show_manager, media_search_manager
+from .site import title_search
 from .film import download_film
 from .series import download_series
 
@@ -100,7 +101,8 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
     string_to_search = get_user_input(string_to_search)
     
     # Perform the database search
-    len_database = title_search(quote_plus(string_to_search))
+    media_search_manager = title_search(quote_plus(string_to_search))
+    len_database = media_search_manager.get_length()
 
     # If only the database is needed, return the manager
     if get_onlyDatabase:
@@ -110,7 +112,7 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
         bot = get_bot_instance()
         
     if len_database > 0:
-        select_title = get_select_title(table_show_manager, media_search_manager, len_database)
+        select_title = get_select_title(TVShowManager(), media_search_manager, len_database)
         process_search_result(select_title, selections)
     
     else:
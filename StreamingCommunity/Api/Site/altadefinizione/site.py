@@ -2,7 +2,6 @@
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
@@ -10,23 +9,22 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('altadefinizione')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
-def title_search(query: str) -> int:
+def title_search(query: str) -> MediaManager:
     """
     Search for titles based on a search query.
       
@@ -34,19 +32,18 @@ def title_search(query: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        int: The number of titles found.
+        MediaManager: The titles found, a new object for every search.
     """
     if site_constant.TELEGRAM_BOT:
         bot = get_bot_instance()
 
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
 
-    search_url = f"{site_constant.FULL_URL}/?story={query}&do=search&subaction=search"
+    search_url = f"{site_context.full_url}/?story={query}&do=search&subaction=search"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     try:
-        response = httpx.post(
+        response = site_context.client().post(
             search_url, 
             headers={'user-agent': get_userAgent()}, 
             timeout=max_timeout, 
@@ -55,10 +52,10 @@ def title_search(query: str) -> int:
         response.raise_for_status()
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
         if site_constant.TELEGRAM_BOT:
             bot.send_message(f"ERRORE\n\nErrore nella richiesta di ricerca:\n\n{e}", None)
-        return 0
+        return media_search_manager
 
     # Prepara le scelte per l'utente
     if site_constant.TELEGRAM_BOT:
@@ -84,7 +81,7 @@ def title_search(query: str) -> int:
             'url': url,
             'name': title,
             'type': tipo,
-            'image': f"{site_constant.FULL_URL}{movie_div.find('img', class_='layer-image').get('data-src')}"
+            'image': f"{site_context.full_url}{movie_div.find('img', class_='layer-image').get('data-src')}"
         })
 
         if site_constant.TELEGRAM_BOT:
@@ -95,5 +92,5 @@ def title_search(query: str) -> int:
         if choices:
             bot.send_message(f"Lista dei risultati:", choices)
 	
-    # Return the number of titles found
-    return media_search_manager.get_length()
\ No newline at end of file
+    # Return the titles found
+    return media_search_manager
\ No newline at end of file
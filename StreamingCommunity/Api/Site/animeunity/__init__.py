@@ -10,6 +10,7 @@ from rich.prompt import Prompt
 
 
 # Internal utilities
+from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template import get_select_title
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
@@ -17,7 +18,7 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
-from .site import title_search, media_search_manager, table_show_manager
+from .site import title_search
 from .film import download_film
 from .serie import download_series
 
@@ -99,7 +100,8 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
     string_to_search = get_user_input(string_to_search)
 
     # Perform the database search
-    len_database = title_search(string_to_search)
+    media_search_manager = title_search(string_to_search)
+    len_database = media_search_manager.get_length()
 
     # If only the database is needed, return the manager
     if get_onlyDatabase:
@@ -109,7 +111,7 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
         bot = get_bot_instance()
 
     if len_database > 0:
-        select_title = get_select_title(table_show_manager, media_search_manager,len_database)
+        select_title = get_select_title(TVShowManager(), media_search_manager, len_database)
         process_search_result(select_title, selections)
     
     else:
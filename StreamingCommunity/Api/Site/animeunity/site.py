@@ -12,35 +12,31 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('animeunity')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
 def get_token() -> dict:
     """
     Function to retrieve session tokens from a specified website.
-
-    Parameters:
-        - site_name (str): The name of the site.
-        - domain (str): The domain of the site.
+    The session cookie is kept by the site client.
 
     Returns:
-        - dict: A dictionary containing session tokens. The keys are 'XSRF_TOKEN', 'animeunity_session', and 'csrf_token'.
+        - dict: A dictionary containing session tokens. The keys are 'animeunity_session' and 'csrf_token'.
     """
-    response = httpx.get(
-        url=site_constant.FULL_URL,
+    response = site_context.client().get(
+        url=site_context.full_url,
         timeout=max_timeout
     )
     response.raise_for_status()
@@ -59,6 +55,30 @@ def get_token() -> dict:
     }
 
 
+def post_with_token(url: str, json_data: dict) -> httpx.Response:
+    """
+    POST to the search APIs with the CSRF token, read once and cached in the site context.
+    The token and the session are read again when the site answers 419 (expired).
+
+    Parameters:
+        - url (str): The API url.
+        - json_data (dict): The request body.
+    """
+    return site_context.request_with_token(
+        'csrf_token',
+        lambda: get_token()['csrf_token'],
+        lambda csrf_token: site_context.client().post(
+            url,
+            headers={
+                'user-agent': get_userAgent(),
+                'x-csrf-token': csrf_token
+            },
+            json=json_data,
+            timeout=max_timeout
+        )
+    )
+
+
 def get_real_title(record):
     """
     Get the real title from a record.
@@ -77,7 +97,7 @@ def get_real_title(record):
         return record['title_it']
 
 
-def title_search(query: str) -> int:
+def title_search(query: str) -> MediaManager:
     """
     Function to perform an anime search using both APIs and combine results.
 
@@ -85,42 +105,25 @@ def title_search(query: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        - int: A number containing the length of media search manager.
+        - MediaManager: The titles found, a new object for every search.
     """
     if site_constant.TELEGRAM_BOT:  
         bot = get_bot_instance()
     
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
     seen_titles = set()
     choices = [] if site_constant.TELEGRAM_BOT else None
 
-    # Create parameter for request
-    data = get_token()
-    cookies = {
-        'animeunity_session': data.get('animeunity_session')
-    }
-    headers = {
-        'user-agent': get_userAgent(),
-        'x-csrf-token': data.get('csrf_token')
-    }
-
     # First API call - livesearch
     try:
-        response1 = httpx.post(
-            f'{site_constant.FULL_URL}/livesearch',
-            cookies=cookies,
-            headers=headers,
-            json={'title': query},
-            timeout=max_timeout
-        )
+        response1 = post_with_token(f'{site_context.full_url}/livesearch', {'title': query})
         
         response1.raise_for_status()
         process_results(response1.json()['records'], seen_titles, media_search_manager, choices)
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        return 0
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
+        return media_search_manager
 
     # Second API call - archivio
     try:
@@ -136,28 +139,21 @@ def title_search(query: str) -> int:
             'season': False
         }
 
-        response2 = httpx.post(
-            f'{site_constant.FULL_URL}/archivio/get-animes',
-            cookies=cookies,
-            headers=headers,
-            json=json_data,
-            timeout=max_timeout
-        )
+        response2 = post_with_token(f'{site_context.full_url}/archivio/get-animes', json_data)
 
         response2.raise_for_status()
         process_results(response2.json()['records'], seen_titles, media_search_manager, choices)
 
     except Exception as e:
-        console.print(f"Site: {site_constant.SITE_NAME}, archivio search error: {e}")
+        console.print(f"Site: {site_context.site_name}, archivio search error: {e}")
 
     if site_constant.TELEGRAM_BOT and choices and len(choices) > 0:
         bot.send_message(f"Lista dei risultati:", choices)
     
-    result_count = media_search_manager.get_length()
-    if result_count == 0:
+    if media_search_manager.get_length() == 0:
         console.print(f"Nothing matching was found for: {query}")
     
-    return result_count
+    return media_search_manager
 
 def process_results(records: list, seen_titles: set, media_manager: MediaManager, choices: list = None) -> None:
     """Helper function to process search results and add unique entries."""
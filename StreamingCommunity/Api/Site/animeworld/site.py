@@ -3,7 +3,6 @@
 import logging
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
@@ -11,30 +10,32 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent, get_headers
-from StreamingCommunity.Util.table import TVShowManager
 
 
 # Logic class
-from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('animeworld')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
-def get_session_and_csrf() -> dict:
+def get_session_and_csrf() -> tuple:
     """
     Get the session ID and CSRF token from the website's cookies and HTML meta data.
     """
+    client = site_context.client(verify=False)
+
+    # Ask for a new session, the one in the cookie jar may be the one the site rejected
+    client.cookies.delete('sessionId')
+
     # Send an initial GET request to the website
-    response = httpx.get(
-        site_constant.FULL_URL, 
-        headers=get_headers(), 
-        verify=False
+    response = client.get(
+        site_context.full_url, 
+        headers=get_headers()
     )
 
     # Extract the sessionId from the cookies
@@ -59,7 +60,13 @@ def get_session_and_csrf() -> dict:
     logging.info(f"CSRF Token: {csrf_token}")
     return session_id, csrf_token
 
-def title_search(query: str) -> int:
+def is_session_rejected(response) -> bool:
+    """
+    Tells if animeworld refused the session ID or CSRF token of a request (expired or rotated session).
+    """
+    return response.status_code in (403, 419) or 'invalid csrf token' in response.text.lower()
+
+def title_search(query: str) -> MediaManager:
     """
     Function to perform an anime search using a provided title.
 
@@ -67,23 +74,24 @@ def title_search(query: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        - int: A number containing the length of media search manager.
+        - MediaManager: The titles found, a new object for every search.
     """
-    search_url = f"{site_constant.FULL_URL}/search?keyword={query}"
+    media_search_manager = MediaManager()
+
+    search_url = f"{site_context.full_url}/search?keyword={query}"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     # Make the GET request
     try:
-        response = httpx.get(
+        response = site_context.client(verify=False).get(
             search_url, 
             headers={'User-Agent': get_userAgent()},
-            timeout=max_timeout,
-            verify=False
+            timeout=max_timeout
         )
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        return 0
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
+        return media_search_manager
 
     # Create soup istance
     soup = BeautifulSoup(response.text, 'html.parser')
@@ -92,7 +100,7 @@ def title_search(query: str) -> int:
     for element in soup.find_all('a', class_='poster'):
         try:
             title = element.find('img').get('alt')
-            url = f"{site_constant.FULL_URL}{element.get('href')}"
+            url = f"{site_context.full_url}{element.get('href')}"
             status_div = element.find('div', class_='status')
             is_dubbed = False
             anime_type = 'TV'
@@ -117,5 +125,5 @@ def title_search(query: str) -> int:
         except Exception as e:
             print(f"Error parsing a film entry: {e}")
 
-    # Return the length of media search manager
-    return media_search_manager.get_length()
+    # Return the titles found
+    return media_search_manager
@@ -14,7 +14,7 @@ from StreamingCommunity.Util.os import os_manager
 
 
 # Player
-from ..site import get_session_and_csrf
+from ..site import site_context, get_session_and_csrf, is_session_rejected
 from StreamingCommunity.Api.Player.sweetpixel import VideoSource
 
 
@@ -27,21 +27,35 @@ class ScrapSerie:
         """Initialize the ScrapSerie object with the provided URL and setup the HTTP client."""
         self.url = url
         self.link = httpx.URL(url).path 
-        self.session_id, self.csrf_token = get_session_and_csrf()
-        self.client = httpx.Client(
-            cookies={"sessionId": self.session_id},
-            headers={"User-Agent": get_userAgent(), "csrf-token": self.csrf_token},
-            base_url=full_url,
-            verify=False
-        )
+        self.full_url = full_url
+        self.client = None
 
         try:
-            self.response = self.client.get(self.link, timeout=max_timeout, follow_redirects=True)
+            self.response = site_context.request_with_token('session', get_session_and_csrf, self._get_page, is_stale=is_session_rejected)
             self.response.raise_for_status()
 
         except:
             raise Exception(f"Failed to retrieve anime page.")
 
+    def _get_page(self, session: tuple) -> httpx.Response:
+        """Get the anime page with a session, the client keeps it for the episode requests."""
+        self.session_id, self.csrf_token = session
+
+        # No session cookie, read the page again next time
+        if not self.session_id:
+            site_context.invalidate('session')
+
+        if self.client is not None:
+            self.client.close()
+
+        self.client = httpx.Client(
+            cookies={"sessionId": self.session_id},
+            headers={"User-Agent": get_userAgent(), "csrf-token": self.csrf_token},
+            base_url=self.full_url,
+            verify=False
+        )
+        return self.client.get(self.link, timeout=max_timeout, follow_redirects=True)
+
     def get_name(self):
         """Extract and return the name of the anime series."""
         soup = BeautifulSoup(self.response.content, "html.parser")
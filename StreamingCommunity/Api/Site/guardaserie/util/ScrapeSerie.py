@@ -1,17 +1,17 @@
 # 13.06.24
 
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import http_cache
 
 
 # Logic class
@@ -32,29 +32,82 @@ class GetSerieInfo:
         """
         self.headers = {'user-agent': get_userAgent()}
         self.url = dict_serie.url
+        self.name = dict_serie.name
         self.tv_name = None
         self.list_episodes = None
+        self.seasons: Optional[Dict[int, List[Dict[str, str]]]] = None
 
-    def get_seasons_number(self) -> int:
+    def collect_info(self) -> Dict[int, List[Dict[str, str]]]:
         """
-        Retrieves the number of seasons of a TV series.
+        Fetches and parses the series page once, indexing the episodes of every season.
 
         Returns:
-            int: Number of seasons of the TV series.
+            Dict[int, List[Dict[str, str]]]: Episodes of each season, by season number.
         """
-        try:
+        if self.seasons is not None:
+            return self.seasons
 
-            # Make an HTTP request to the series URL
-            response = httpx.get(self.url, headers=self.headers, timeout=max_timeout, follow_redirects=True)
-            response.raise_for_status()
+        # Make an HTTP request to the series URL
+        response = http_cache.get(self.url, 'series', headers=self.headers, timeout=max_timeout, follow_redirects=True)
+        response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(response.text, "html.parser")
 
-            table_content = soup.find('div', class_="tt_season")
-            seasons_number = len(table_content.find_all("li"))
+        try:
             self.tv_name = soup.find("h1", class_="entry-title").get_text(strip=True)
+        except Exception as e:
+            logging.error(f"Series title not found, using the search result name: {e}")
+            self.tv_name = self.name
+
+        # One tab for each season listed in the season selector
+        seasons_number = len(soup.find('div', class_="tt_season").find_all("li"))
+        seasons = {}
 
-            return seasons_number
+        # A malformed season only loses its own episodes
+        for n_season in range(1, seasons_number + 1):
+            try:
+                seasons[n_season] = self._parse_season(soup, n_season)
+            except Exception as e:
+                logging.error(f"Error parsing season {n_season}: {e}")
+                seasons[n_season] = []
+
+        self.seasons = seasons
+        return seasons
+
+    def _parse_season(self, soup: BeautifulSoup, n_season: int) -> List[Dict[str, str]]:
+        """
+        Episodes listed in the tab of a season, malformed entries are skipped.
+
+        Parameters:
+            soup (BeautifulSoup): Parsed series page.
+            n_season (int): The season number.
+        """
+        table_content = soup.find('div', class_="tab-pane", id=f"season-{n_season}")
+        list_dict_episode = []
+
+        for episode_div in table_content.find_all("li"):
+            link = episode_div.find("a")
+            if link is None or not link.get("data-link"):
+                logging.error(f"Skipping malformed episode in season {n_season}: {episode_div}")
+                continue
+
+            list_dict_episode.append({
+                'number': link.get("data-num"),
+                'name': link.get("data-title"),
+                'url': link.get("data-link")
+            })
+
+        return list_dict_episode
+
+    def get_seasons_number(self) -> int:
+        """
+        Retrieves the number of seasons of a TV series.
+
+        Returns:
+            int: Number of seasons of the TV series.
+        """
+        try:
+            return len(self.collect_info())
 
         except Exception as e:
             logging.error(f"Error parsing HTML page: {e}")
@@ -72,35 +125,9 @@ class GetSerieInfo:
             List[Dict[str, str]]: List of dictionaries containing episode information.
         """
         try:
+            self.list_episodes = self.collect_info().get(int(n_season), [])
+            return self.list_episodes
 
-            # Make an HTTP request to the series URL
-            response = httpx.get(self.url, headers=self.headers, timeout=max_timeout, follow_redirects=True)
-            response.raise_for_status()
-
-            # Parse HTML content of the page
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Find the container of episodes for the specified season
-            table_content = soup.find('div', class_="tab-pane", id=f"season-{n_season}")
-            episode_content = table_content.find_all("li")
-            list_dict_episode = []
-
-            for episode_div in episode_content:
-                index = episode_div.find("a").get("data-num")
-                link = episode_div.find("a").get("data-link")
-                name = episode_div.find("a").get("data-title")
-
-                obj_episode = {
-                    'number': index,
-                    'name': name,
-                    'url': link
-                }
-                
-                list_dict_episode.append(obj_episode)
-
-            self.list_episodes = list_dict_episode
-            return list_dict_episode
-        
         except Exception as e:
             logging.error(f"Error parsing HTML page: {e}")
 
@@ -1,23 +1,20 @@
 # 21.05.24
 
 # External libraries
-import httpx
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
-from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 from .util.ScrapeSerie import GetSerieInfo
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('raiplay')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
@@ -46,7 +43,7 @@ def determine_media_type(item):
         return "film"
 
 
-def title_search(query: str) -> int:
+def title_search(query: str) -> MediaManager:
     """
     Search for titles based on a search query.
       
@@ -54,10 +51,9 @@ def title_search(query: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        int: The number of titles found.
+        MediaManager: The titles found, a new object for every search.
     """
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
 
     search_url = f"https://www.raiplay.it/atomatic/raiplay-search-service/api/v1/msearch"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
@@ -74,7 +70,7 @@ def title_search(query: str) -> int:
     }
 
     try:
-        response = httpx.post(
+        response = site_context.client().post(
             search_url, 
             headers={'user-agent': get_userAgent()}, 
             json=json_data, 
@@ -84,8 +80,8 @@ def title_search(query: str) -> int:
         response.raise_for_status()
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        return 0
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
+        return media_search_manager
 
     # Limit to only 15 results for performance
     data = response.json().get('agg').get('titoli').get('cards')
@@ -102,4 +98,4 @@ def title_search(query: str) -> int:
             'image': f"https://www.raiplay.it{item.get('immagine', '')}",
         })
           
-    return media_search_manager.get_length()
\ No newline at end of file
+    return media_search_manager
\ No newline at end of file
@@ -11,6 +11,7 @@ from rich.prompt import Prompt
 
 
 # Internal utilities
+from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template import get_select_title
 from StreamingCommunity.Lib.Proxies.proxy import ProxyFinder
 from StreamingCommunity.Api.Template.config_loader import site_constant
@@ -19,7 +20,7 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
-from .site import title_search, table_show_manager, media_search_manager
+from .site import title_search
 from .film import download_film
 from .series import download_series
 
@@ -144,14 +145,15 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
     # Perform search on the database using the obtained query
     finder = ProxyFinder(site_constant.FULL_URL)
     proxy = finder.find_fast_proxy()
-    len_database = title_search(actual_search_query, proxy)
+    media_search_manager = title_search(actual_search_query, proxy)
+    len_database = media_search_manager.get_length()
 
     # If only the database object (media_search_manager populated by title_search) is needed
     if get_onlyDatabase:
         return media_search_manager 
     
     if len_database > 0:
-        select_title = get_select_title(table_show_manager, media_search_manager, len_database)
+        select_title = get_select_title(TVShowManager(), media_search_manager, len_database)
         process_search_result(select_title, selections, proxy)
     
     else:
@@ -12,23 +12,70 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
 # Logic class
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('streamingcommunity')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
-def title_search(query: str, proxy: str) -> int:
+def get_version(proxy: str = None) -> str:
+    """
+    Read the Inertia version of the site from the data-page of the homepage.
+
+    Parameters:
+        - proxy (str): Proxy to use for the request.
+
+    Returns:
+        str: The version, sent as 'x-inertia-version' by the JSON requests.
+    """
+    response = site_context.client(proxy).get(
+        f"{site_context.full_url}/it", 
+        headers={'user-agent': get_userAgent()}, 
+        timeout=max_timeout
+    )
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+    return json.loads(soup.find('div', {'id': "app"}).get("data-page"))['version']
+
+
+def inertia_get(url: str, proxy: str = None, headers: dict = None) -> httpx.Response:
+    """
+    GET an Inertia JSON page. The version is cached in the site context and
+    refreshed when the site answers 409 because it changed.
+
+    Parameters:
+        - url (str): The page to request.
+        - proxy (str): Proxy to use for the request.
+        - headers (dict): Extra headers, e.g. the cache validators.
+    """
+    return site_context.request_with_token(
+        'version',
+        lambda: get_version(proxy),
+        lambda version: site_context.client(proxy).get(
+            url, 
+            headers = {
+                'referer': site_context.full_url,
+                'user-agent': get_userAgent(),
+                'x-inertia': 'true',
+                'x-inertia-version': version,
+                **(headers or {})
+            },
+            timeout=max_timeout
+        )
+    )
+
+
+def title_search(query: str, proxy: str) -> MediaManager:
     """
     Search for titles based on a search query.
       
@@ -36,53 +83,26 @@ def title_search(query: str, proxy: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        int: The number of titles found.
+        MediaManager: The titles found, a new object for every search.
     """
     if site_constant.TELEGRAM_BOT:
         bot = get_bot_instance()
 
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
 
-    try:
-        response = httpx.get(
-            f"{site_constant.FULL_URL}/it", 
-            headers={'user-agent': get_userAgent()}, 
-            timeout=max_timeout,
-            proxy=proxy
-        )
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        version = json.loads(soup.find('div', {'id': "app"}).get("data-page"))['version']
-
-    except Exception as e:
-        if "WinError" in str(e) or "Errno" in str(e): console.print("\n[bold yellow]Please make sure you have enabled and configured a valid proxy.[/bold yellow]")
-        console.print(f"[red]Site: {site_constant.SITE_NAME} version, request error: {e}")
-        return 0
-
-    search_url = f"{site_constant.FULL_URL}/it/search?q={query}"
+    search_url = f"{site_context.full_url}/it/search?q={query}"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     try:
-        response = httpx.get(
-            search_url, 
-            headers = {
-                'referer': site_constant.FULL_URL,
-                'user-agent': get_userAgent(),
-                'x-inertia': 'true',
-                'x-inertia-version': version
-            },
-            timeout=max_timeout,
-            proxy=proxy
-        )
+        response = inertia_get(search_url, proxy)
         response.raise_for_status()
 
     except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
+        if "WinError" in str(e) or "Errno" in str(e): console.print("\n[bold yellow]Please make sure you have enabled and configured a valid proxy.[/bold yellow]")
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
         if site_constant.TELEGRAM_BOT:
             bot.send_message(f"ERRORE\n\nErrore nella richiesta di ricerca:\n\n{e}", None)
-        return 0
+        return media_search_manager
 
     # Prepara le scelte per l'utente
     if site_constant.TELEGRAM_BOT:
@@ -93,7 +113,7 @@ def title_search(query: str, proxy: str) -> int:
         data = response.json().get('props').get('titles')
     except Exception as e:
         console.log(f"Error parsing JSON response: {e}")
-        return 0
+        return media_search_manager
 
     for i, dict_title in enumerate(data):
         try:
@@ -103,7 +123,7 @@ def title_search(query: str, proxy: str) -> int:
                 'name': dict_title.get('name'),
                 'type': dict_title.get('type'),
                 'date': dict_title.get('last_air_date'),
-                'image': f"{site_constant.FULL_URL.replace('stream', 'cdn.stream')}/images/{dict_title.get('images')[0].get('filename')}"
+                'image': f"{site_context.full_url.replace('stream', 'cdn.stream')}/images/{dict_title.get('images')[0].get('filename')}"
             })
 
             if site_constant.TELEGRAM_BOT:
@@ -119,5 +139,5 @@ def title_search(query: str, proxy: str) -> int:
         if choices:
             bot.send_message(f"Lista dei risultati:", choices)
           
-    # Return the number of titles found
-    return media_search_manager.get_length()
+    # Return the titles found
+    return media_search_manager
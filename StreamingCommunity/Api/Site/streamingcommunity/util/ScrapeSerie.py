@@ -5,14 +5,15 @@ import logging
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import http_cache
 from StreamingCommunity.Api.Player.Helper.Vixcloud.util import SeasonManager
+from ..site import site_context, inertia_get
 
 
 # Variable
@@ -48,8 +49,9 @@ class GetSerieInfo:
             Exception: If there's an error fetching series information
         """
         try:
-            response = httpx.get(
-                url=f"{self.url}/titles/{self.media_id}-{self.series_name}",
+            response = http_cache.get(
+                f"{self.url}/titles/{self.media_id}-{self.series_name}",
+                'series',
                 headers=self.headers,
                 timeout=max_timeout,
                 proxy=self.proxy
@@ -60,6 +62,10 @@ class GetSerieInfo:
             soup = BeautifulSoup(response.text, "html.parser")
             json_response = json.loads(soup.find("div", {"id": "app"}).get("data-page"))
             self.version = json_response['version']
+
+            # A page served from the HTTP cache may carry the version of an older deploy
+            if response.headers.get('x-cache') != 'HIT':
+                site_context.set_token('version', self.version)
             
             # Extract information about available seasons
             title_data = json_response.get("props", {}).get("title", {})
@@ -99,15 +105,11 @@ class GetSerieInfo:
                 logging.error(f"Season {number_season} not found")
                 return
             
-            response = httpx.get(
-                url=f'{self.url}/titles/{self.media_id}-{self.series_name}/season-{number_season}', 
-                headers={
-                    'User-Agent': self.headers['user-agent'],
-                    'x-inertia': 'true',
-                    'x-inertia-version': self.version,
-                },
-                timeout=max_timeout,
-                proxy=self.proxy
+            # Version of the title page, refreshed if the site changed it since
+            response = http_cache.get(
+                f'{self.url}/titles/{self.media_id}-{self.series_name}/season-{number_season}',
+                'episodes',
+                send=lambda url, params, headers: inertia_get(url, self.proxy, headers)
             )
 
             # Extract episodes from JSON response
@@ -6,6 +6,7 @@ from rich.prompt import Prompt
 
 
 # Internal utilities
+from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template import get_select_title
 from StreamingCommunity.Lib.Proxies.proxy import ProxyFinder
 from StreamingCommunity.Api.Template.config_loader import site_constant
@@ -13,7 +14,7 @@ from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
 
 
 # Logic class
-from .site import title_search, table_show_manager, media_search_manager
+from .site import title_search
 from .film import download_film
 from .series import download_series
 
@@ -86,14 +87,15 @@ def search(string_to_search: str = None, get_onlyDatabase: bool = False, direct_
     # Perform search on the database using the obtained query
     finder = ProxyFinder(url=f"{site_constant.FULL_URL}/serie/euphoria/")
     proxy = finder.find_fast_proxy()
-    len_database = title_search(string_to_search, proxy)
+    media_search_manager = title_search(string_to_search, proxy)
+    len_database = media_search_manager.get_length()
 
     # If only the database is needed, return the manager
     if get_onlyDatabase:
         return media_search_manager
     
     if len_database > 0:
-        select_title = get_select_title(table_show_manager, media_search_manager,len_database)
+        select_title = get_select_title(TVShowManager(), media_search_manager, len_database)
         process_search_result(select_title, selections, proxy)
     
     else:
@@ -4,7 +4,6 @@ import re
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
@@ -12,28 +11,25 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.table import TVShowManager
 
 
 # Logic class
-from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaManager
+from StreamingCommunity.Api.Template.Class.SiteContext import SiteContext
 
 
 # Variable
 console = Console()
-media_search_manager = MediaManager()
-table_show_manager = TVShowManager()
+site_context = SiteContext('streamingwatch')
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 
 def extract_nonce(proxy) -> str:
     """Extract nonce value from the page script"""
-    response = httpx.get(
-        site_constant.FULL_URL, 
+    response = site_context.client(proxy).get(
+        site_context.full_url, 
         headers={'user-agent': get_userAgent()}, 
-        timeout=max_timeout,
-        proxy=proxy
+        timeout=max_timeout
     )
     
     soup = BeautifulSoup(response.content, 'html.parser')
@@ -45,7 +41,20 @@ def extract_nonce(proxy) -> str:
     return ""
 
 
-def title_search(query: str, proxy: str) -> int:
+def get_nonce(proxy) -> str:
+    """Nonce of the search form, raises if the page has none."""
+    nonce = extract_nonce(proxy)
+    if not nonce:
+        raise ValueError("Failed to extract nonce")
+    return nonce
+
+
+def is_nonce_rejected(response) -> bool:
+    """WordPress answers 403, or a bare -1, to a request with an expired nonce."""
+    return response.status_code == 403 or response.text.strip() == '-1'
+
+
+def title_search(query: str, proxy: str) -> MediaManager:
     """
     Search for titles based on a search query.
       
@@ -53,44 +62,39 @@ def title_search(query: str, proxy: str) -> int:
         - query (str): The query to search for.
 
     Returns:
-        int: The number of titles found.
+        MediaManager: The titles found, a new object for every search.
     """
-    media_search_manager.clear()
-    table_show_manager.clear()
+    media_search_manager = MediaManager()
 
-    search_url = f"{site_constant.FULL_URL}/wp-admin/admin-ajax.php"
+    search_url = f"{site_context.full_url}/wp-admin/admin-ajax.php"
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     try:
-        _wpnonce = extract_nonce(proxy)
-        
-        if not _wpnonce:
-            console.print("[red]Error: Failed to extract nonce")
-            return 0
-
-        data = {
-            'action': 'data_fetch',
-            'keyword': query,
-            '_wpnonce': _wpnonce
-        }
-
-        response = httpx.post(
-            search_url,
-            headers={
-                'origin': site_constant.FULL_URL,
-                'user-agent': get_userAgent()
-            },
-            data=data,
-            timeout=max_timeout,
-            proxy=proxy
+        response = site_context.request_with_token(
+            'nonce',
+            lambda: get_nonce(proxy),
+            lambda nonce: site_context.client(proxy).post(
+                search_url,
+                headers={
+                    'origin': site_context.full_url,
+                    'user-agent': get_userAgent()
+                },
+                data={
+                    'action': 'data_fetch',
+                    'keyword': query,
+                    '_wpnonce': nonce
+                },
+                timeout=max_timeout
+            ),
+            is_stale=is_nonce_rejected
         )
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
 
     except Exception as e:
         if "WinError" in str(e) or "Errno" in str(e): console.print("\n[bold yellow]Please make sure you have enabled and configured a valid proxy.[/bold yellow]")
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        return 0
+        console.print(f"[red]Site: {site_context.site_name}, request search error: {e}")
+        return media_search_manager
 
     for item in soup.find_all('div', class_='searchelement'):
         try:
@@ -114,5 +118,5 @@ def title_search(query: str, proxy: str) -> int:
         except Exception as e:
             print(f"Error parsing a film entry: {e}")
           
-    # Return the number of titles found
-    return media_search_manager.get_length()
\ No newline at end of file
+    # Return the titles found
+    return media_search_manager
\ No newline at end of file
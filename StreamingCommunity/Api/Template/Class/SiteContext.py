@@ -0,0 +1,142 @@
+# 18.10.26
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# External libraries
+import httpx
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.headers import get_userAgent
+
+
+# Config
+TOKEN_TTL = config_manager.get_int("REQUESTS", "token_ttl")
+
+
+# Variable
+max_timeout = config_manager.get_int("REQUESTS", "timeout")
+STALE_TOKEN_STATUS = (409, 419)     # Inertia version mismatch, Laravel CSRF token expired
+
+
+class SiteContext:
+    def __init__(self, site_name: str):
+        """
+        State shared by every search and scrape of one site: HTTP clients (with their cookies)
+        and the tokens read from the site pages. Safe to use from several threads at once.
+
+        Parameters:
+            - site_name (str): Name of the site folder, as in the SITE config.
+        """
+        self.site_name = site_name
+        self.lock = threading.Lock()
+        self.clients: Dict[Tuple[Optional[str], bool], httpx.Client] = {}
+        self.tokens: Dict[str, Tuple[Any, float]] = {}
+        self.fetch_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def full_url(self) -> str:
+        return config_manager.get_site(self.site_name, 'full_url').rstrip('/')
+
+    def client(self, proxy: Optional[str] = None, verify: bool = True) -> httpx.Client:
+        """
+        Pooled client of the site, one for each proxy, cookies set by the site are kept between requests.
+
+        Parameters:
+            - proxy (str): Proxy url, None for a direct connection.
+            - verify (bool): Verify the SSL certificate.
+        """
+        key = (proxy, verify)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                client = self.clients[key] = httpx.Client(
+                    headers={'user-agent': get_userAgent()},
+                    timeout=max_timeout,
+                    follow_redirects=True,
+                    verify=verify,
+                    proxy=proxy
+                )
+            return client
+
+    def get_token(self, name: str, default: Any = None) -> Any:
+        """Value of a token, `default` if it is missing or expired."""
+        with self.lock:
+            entry = self.tokens.get(name)
+            if entry is None or time.monotonic() >= entry[1]:
+                return default
+            return entry[0]
+
+    def set_token(self, name: str, value: Any, ttl: float = TOKEN_TTL) -> None:
+        with self.lock:
+            self.tokens[name] = (value, time.monotonic() + ttl)
+
+    def invalidate(self, name: str) -> None:
+        with self.lock:
+            self.tokens.pop(name, None)
+
+    def cached_token(self, name: str, fetch: Callable[[], Any], ttl: float = TOKEN_TTL) -> Any:
+        """
+        Value of a token, calling `fetch` only when it is missing or older than `ttl` seconds.
+        Threads asking for the same token while it is fetched wait for that single fetch.
+
+        Parameters:
+            - name (str): Name of the token, e.g. 'version'.
+            - fetch (Callable): Reads the token from the site.
+            - ttl (float): Seconds the token is reused.
+        """
+        value = self.get_token(name)
+        if value is not None:
+            return value
+
+        with self.lock:
+            fetch_lock = self.fetch_locks.setdefault(name, threading.Lock())
+
+        with fetch_lock:
+            value = self.get_token(name)
+            if value is None:
+                value = fetch()
+                self.set_token(name, value, ttl)
+                logging.info(f"{self.site_name}: fetched token '{name}'")
+
+        return value
+
+    def request_with_token(self, name: str, fetch: Callable[[], Any], send: Callable[[Any], httpx.Response], ttl: float = TOKEN_TTL,
+                           is_stale: Optional[Callable[[httpx.Response], bool]] = None) -> httpx.Response:
+        """
+        Sends a request that needs a token, refreshing the token and sending it again once
+        if the server rejects it as stale (409 Inertia version mismatch, 419 CSRF token expired).
+
+        Parameters:
+            - name (str): Name of the token.
+            - fetch (Callable): Reads the token from the site.
+            - send (Callable): Sends the request with the token it receives, returns the response.
+            - ttl (float): Seconds the token is reused.
+            - is_stale (Callable): Tells if the response rejects the token, for sites not answering 409/419.
+        """
+        if is_stale is None:
+            is_stale = lambda response: response.status_code in STALE_TOKEN_STATUS
+
+        response = send(self.cached_token(name, fetch, ttl))
+
+        if is_stale(response):
+            logging.info(f"{self.site_name}: token '{name}' rejected ({response.status_code}), refreshing")
+            self.invalidate(name)
+            response = send(self.cached_token(name, fetch, ttl))
+
+        return response
+
+    def clear(self) -> None:
+        """Forget tokens and cookies, e.g. after a domain change."""
+        with self.lock:
+            self.tokens.clear()
+            for client in self.clients.values():
+                client.cookies.clear()
+
+    def __str__(self):
+        return f"SiteContext(site={self.site_name}, clients={len(self.clients)}, tokens={list(self.tokens)})"
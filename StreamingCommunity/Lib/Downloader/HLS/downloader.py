@@ -3,9 +3,12 @@
 import os
 import re
 import time
+import signal
 import logging
 import shutil
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 # External libraries
@@ -17,7 +20,7 @@ from rich.panel import Panel
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.os import compute_sha1_hash, os_manager, internet_manager
+from StreamingCommunity.Util.os import compute_sha1_hash, os_manager, internet_manager, get_ffmpeg_path
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
@@ -26,9 +29,11 @@ from ...FFmpeg import (
     print_duration_table,
     join_video,
     join_audios,
-    join_subtitle
+    join_subtitle,
+    join_all,
+    postprocess_scheduler
 )
-from ...M3U8 import M3U8_Parser, M3U8_UrlFix
+from ...M3U8 import M3U8_Parser, M3U8_UrlFix, M3U8_Journal, M3U8_Connection_Budget
 from .segments import M3U8_Segments
 
 
@@ -45,10 +50,20 @@ GET_ONLY_LINK = config_manager.get_bool('M3U8_PARSER', 'get_only_link')
 RETRY_LIMIT = config_manager.get_int('REQUESTS', 'max_retry')
 MAX_TIMEOUT = config_manager.get_int("REQUESTS", "timeout")
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
+PARALLEL_TRACKS = config_manager.get_bool('M3U8_DOWNLOAD', 'parallel_tracks')
+MAX_TOTAL_CONNECTIONS = config_manager.get_int('M3U8_DOWNLOAD', 'max_total_connections')
+REMUX_WHILE_DOWNLOADING = config_manager.get_bool('M3U8_DOWNLOAD', 'remux_while_downloading')
+USE_CODEC = config_manager.get_bool('M3U8_CONVERSION', 'use_codec')
 
 console = Console()
 
 
+def stream_file(folder: str) -> str:
+    """Path of the file a track is downloaded to: 0.mp4 for fragmented MP4 streams, 0.ts otherwise."""
+    mp4_file = os.path.join(folder, '0.mp4')
+    return mp4_file if os.path.exists(mp4_file) else os.path.join(folder, '0.ts')
+
+
 class HLSClient:
     """Client for making HTTP requests to HLS endpoints with retry mechanism."""
     def __init__(self):
@@ -133,6 +148,7 @@ class M3U8Manager:
         self.url_fixer = M3U8_UrlFix()
         self.video_url = None
         self.video_res = None
+        self.video_bandwidth = None
         self.audio_streams = []
         self.sub_streams = []
         self.is_master = False
@@ -171,6 +187,8 @@ class M3U8Manager:
                 logging.error("Resolution not recognized.")
                 self.video_url, self.video_res = self.parser._video.get_best_uri()
 
+            self.video_bandwidth = self.parser._video.get_bandwidth(self.video_url)
+
             self.audio_streams = []
             if ENABLE_AUDIO:
                 self.audio_streams = [
@@ -245,36 +263,52 @@ class DownloadManager:
         self.url_fixer = url_fixer
         self.missing_segments = []
         self.stopped = False
+        self.video_bandwidth = None
+        self.remux_path = None
+        self.remuxed_file = None
+        self.containers: Dict[str, str] = {}
+
+        # Shared by every track when they are downloaded together
+        self.connection_budget = M3U8_Connection_Budget(MAX_TOTAL_CONNECTIONS) if PARALLEL_TRACKS else None
+        self.active_downloaders: List[M3U8_Segments] = []
+
+    def _download_segments(self, url: str, tmp_dir: str, description: str, stream_type: str, position: Optional[int], bandwidth: Optional[int] = None, remux_path: Optional[str] = None) -> bool:
+        """Downloads the segments of a media playlist and records the result."""
+        downloader = M3U8_Segments(
+            url=url, 
+            tmp_folder=tmp_dir, 
+            connection_budget=self.connection_budget, 
+            position=position,
+            bandwidth=bandwidth,
+            remux_path=remux_path
+        )
+        self.active_downloaders.append(downloader)
 
-    def download_video(self, video_url: str):
-        """Downloads video segments from the M3U8 playlist."""
-        video_full_url = self.url_fixer.generate_full_url(video_url)
-        video_tmp_dir = os.path.join(self.temp_dir, 'video')
-
-        downloader = M3U8_Segments(url=video_full_url, tmp_folder=video_tmp_dir)
-        result = downloader.download_streams("Video", "video")
+        result = downloader.download_streams(description, stream_type)
         self.missing_segments.append(result)
 
         if result.get('stopped', False):
             self.stopped = True
+
+        if result.get('remux'):
+            self.remuxed_file = result['remux']
+
+        if result.get('container'):
+            self.containers[stream_file(tmp_dir)] = result['container']
         
         return self.stopped
 
-    def download_audio(self, audio: Dict):
-        """Downloads audio segments for a specific language track."""
-        #if self.stopped:
-        #    return True
+    def download_video(self, video_url: str, position: Optional[int] = None):
+        """Downloads video segments from the M3U8 playlist."""
+        video_full_url = self.url_fixer.generate_full_url(video_url)
+        video_tmp_dir = os.path.join(self.temp_dir, 'video')
+        return self._download_segments(video_full_url, video_tmp_dir, "Video", "video", position, self.video_bandwidth, self.remux_path)
 
+    def download_audio(self, audio: Dict, position: Optional[int] = None):
+        """Downloads audio segments for a specific language track."""
         audio_full_url = self.url_fixer.generate_full_url(audio['uri'])
         audio_tmp_dir = os.path.join(self.temp_dir, 'audio', audio['language'])
-
-        downloader = M3U8_Segments(url=audio_full_url, tmp_folder=audio_tmp_dir)
-        result = downloader.download_streams(f"Audio {audio['language']}", "audio")
-        self.missing_segments.append(result)
-
-        if result.get('stopped', False):
-            self.stopped = True
-        return self.stopped
+        return self._download_segments(audio_full_url, audio_tmp_dir, f"Audio {audio['language']}", "audio", position)
 
     def download_subtitle(self, sub: Dict):
         """Downloads and saves subtitle file for a specific language."""
@@ -295,52 +329,103 @@ class DownloadManager:
 
         return self.stopped
 
-    def download_all(self, video_url: str, audio_streams: List[Dict], sub_streams: List[Dict]):
+    def _can_remux(self, audio_streams: List[Dict], sub_streams: List[Dict]) -> bool:
+        """
+        The video can be remuxed while downloading when nothing else has to be merged into it
+        and the streams are copied, a re-encode would slow the download down to the encoder speed.
+        """
+        return REMUX_WHILE_DOWNLOADING and not audio_streams and not sub_streams and not USE_CODEC and bool(get_ffmpeg_path())
+
+    def _need_download(self, ts_file: str) -> bool:
+        """Check if a stream is missing or was left unfinished by a previous run."""
+        return not os.path.exists(ts_file) or M3U8_Journal(ts_file).exists()
+
+    @property
+    def resumable(self) -> bool:
+        """True if at least one stream can be resumed by a later run."""
+        return any(result.get('resumable', False) for result in self.missing_segments)
+
+    def _forward_interrupt(self, signum, frame):
+        """Signal handler used while tracks run in worker threads."""
+        for downloader in list(self.active_downloaders):
+            downloader.handle_interrupt()
+
+    def _run_parallel(self, jobs: List[Tuple[Callable, tuple, dict]]) -> List[bool]:
+        """
+        Runs every download job at the same time, each in its own thread.
+
+        Args:
+            jobs: List of (function, args, kwargs) tuples, kwargs set the progress bar line
+
+        Returns:
+            The stopped flag returned by each job
+        """
+        original_handler = None
+        if threading.current_thread() is threading.main_thread():
+            original_handler = signal.signal(signal.SIGINT, self._forward_interrupt)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = [executor.submit(func, *args, **kwargs) for func, args, kwargs in jobs]
+
+                # Short waits so the main thread keeps handling Ctrl+C
+                while wait(futures, timeout=0.5).not_done:
+                    pass
+
+            return [future.result() for future in futures]
+
+        finally:
+            if original_handler is not None:
+                signal.signal(signal.SIGINT, original_handler)
+
+    def download_all(self, video_url: str, audio_streams: List[Dict], sub_streams: List[Dict], video_bandwidth: Optional[int] = None):
         """
         Downloads all selected streams (video, audio, subtitles).
+        With `parallel_tracks` enabled every track is downloaded at the same time.
+        `video_bandwidth` (bits/s from the master playlist) seeds the size estimate of the video.
         """
-        return_stopped = False
+        self.video_bandwidth = video_bandwidth
+        self.remux_path = os.path.join(self.temp_dir, 'video.mp4') if self._can_remux(audio_streams, sub_streams) else None
+        jobs = []
+        position = 0
 
-        video_file = os.path.join(self.temp_dir, 'video', '0.ts')
-        if not os.path.exists(video_file):
-            if self.download_video(video_url):
-                if not return_stopped:
-                    return_stopped = True
+        video_file = stream_file(os.path.join(self.temp_dir, 'video'))
+        if self.remux_path or self._need_download(video_file):
+            jobs.append((self.download_video, (video_url,), {'position': position}))
+            position += 1
 
         for audio in audio_streams:
-            #if self.stopped:
-            #    break
-
-            audio_file = os.path.join(self.temp_dir, 'audio', audio['language'], '0.ts')
-            if not os.path.exists(audio_file):
-                if self.download_audio(audio):
-                    if not return_stopped:
-                        return_stopped = True
+            audio_file = stream_file(os.path.join(self.temp_dir, 'audio', audio['language']))
+            if self._need_download(audio_file):
+                jobs.append((self.download_audio, (audio,), {'position': position}))
+                position += 1
 
         for sub in sub_streams:
-            #if self.stopped:
-            #    break
-
             sub_file = os.path.join(self.temp_dir, 'subs', f"{sub['language']}.vtt")
             if not os.path.exists(sub_file):
-                if self.download_subtitle(sub):
-                    if not return_stopped:
-                        return_stopped = True
+                jobs.append((self.download_subtitle, (sub,), {}))
+
+        if PARALLEL_TRACKS and len(jobs) > 1:
+            results = self._run_parallel(jobs)
+        else:
+            results = [func(*args) for func, args, _ in jobs]
 
-        return return_stopped
+        return any(results)
 
 
 class MergeManager:
     """Handles merging of video, audio, and subtitle streams."""
-    def __init__(self, temp_dir: str, parser: M3U8_Parser, audio_streams: List[Dict], sub_streams: List[Dict]):
+    def __init__(self, temp_dir: str, parser: M3U8_Parser, audio_streams: List[Dict], sub_streams: List[Dict], containers: Optional[Dict[str, str]] = None):
         """
         Args:
             temp_dir: Directory containing temporary files
             parser: M3U8 parser instance with codec information
             audio_streams: List of audio streams to merge
             sub_streams: List of subtitle streams to merge
+            containers: Input format of each downloaded file, detected from the segments
         """
         self.temp_dir = temp_dir
+        self.containers = containers or {}
         self.parser = parser
         self.audio_streams = audio_streams
         self.sub_streams = sub_streams
@@ -352,40 +437,62 @@ class MergeManager:
 
         Process:
         1. If no audio/subs, just process video
-        2. If audio exists, merge with video
-        3. If subtitles exist, add them to the video
+        2. If both audio and subtitles exist, merge everything in one pass
+        3. Otherwise (or if the single pass fails) merge audio with video, then add the subtitles
         """
-        video_file = os.path.join(self.temp_dir, 'video', '0.ts')
+        video_file = stream_file(os.path.join(self.temp_dir, 'video'))
+        video_format = self.containers.get(video_file)
         merged_file = video_file
 
+        audio_files = [stream_file(os.path.join(self.temp_dir, 'audio', a['language'])) for a in self.audio_streams]
+        audio_tracks = [{
+            'path': audio_file,
+            'name': a['language'],
+            'format': self.containers.get(audio_file)
+        } for a, audio_file in zip(self.audio_streams, audio_files)]
+
+        sub_tracks = [{
+            'path': os.path.join(self.temp_dir, 'subs', f"{s['language']}.vtt"),
+            'language': s['language']
+        } for s in self.sub_streams]
+
         if not self.audio_streams and not self.sub_streams:
+
+            # Init section + fragments are already an mp4, unless it has to be re-encoded
+            if video_file.endswith('.mp4') and not USE_CODEC:
+                return video_file
+
             merged_file = join_video(
                 video_path=video_file,
                 out_path=os.path.join(self.temp_dir, 'video.mp4'),
-                codec=self.parser.codec
+                codec=self.parser.codec,
+                input_format=video_format
             )
 
         else:
-            if MERGE_AUDIO and self.audio_streams:
-                audio_tracks = [{
-                    'path': os.path.join(self.temp_dir, 'audio', a['language'], '0.ts'),
-                    'name': a['language']
-                } for a in self.audio_streams]
+            if MERGE_AUDIO and self.audio_streams and MERGE_SUBTITLE and self.sub_streams:
+                single_pass_file = join_all(
+                    video_path=video_file,
+                    audio_tracks=audio_tracks,
+                    subtitles_list=sub_tracks,
+                    out_path=os.path.join(self.temp_dir, 'final.mp4'),
+                    codec=self.parser.codec,
+                    video_format=video_format
+                )
+                if single_pass_file is not None:
+                    return single_pass_file
 
+            if MERGE_AUDIO and self.audio_streams:
                 merged_audio_path = os.path.join(self.temp_dir, 'merged_audio.mp4')
                 merged_file = join_audios(
                     video_path=video_file,
                     audio_tracks=audio_tracks,
                     out_path=merged_audio_path,
-                    codec=self.parser.codec
+                    codec=self.parser.codec,
+                    video_format=video_format
                 )
 
             if MERGE_SUBTITLE and self.sub_streams:
-                sub_tracks = [{
-                    'path': os.path.join(self.temp_dir, 'subs', f"{s['language']}.vtt"),
-                    'language': s['language']
-                } for s in self.sub_streams]
-
                 merged_subs_path = os.path.join(self.temp_dir, 'final.mp4')
                 merged_file = join_subtitle(
                     video_path=merged_file,
@@ -466,20 +573,47 @@ class HLS_Downloader:
             download_stopped = self.download_manager.download_all(
                 video_url=self.m3u8_manager.video_url,
                 audio_streams=self.m3u8_manager.audio_streams,
-                sub_streams=self.m3u8_manager.sub_streams
+                sub_streams=self.m3u8_manager.sub_streams,
+                video_bandwidth=self.m3u8_manager.video_bandwidth
             )
 
+            # Unfinished streams stay in the temporary folder for the next run: merging them now
+            # would leave an output file that makes the next run skip the download
+            if self.download_manager.resumable:
+                console.print(f"[yellow]Download incomplete, run it again to resume from [bold]{self.path_manager.temp_dir}[/bold]")
+                return {
+                    'path': None,
+                    'url': self.m3u8_url,
+                    'is_master': self.m3u8_manager.is_master,
+                    'msg': 'Download incomplete, resumable',
+                    'error': None,
+                    'stopped': True
+                }
+
             self.merge_manager = MergeManager(
                 temp_dir=self.path_manager.temp_dir,
                 parser=self.m3u8_manager.parser,
                 audio_streams=self.m3u8_manager.audio_streams,
-                sub_streams=self.m3u8_manager.sub_streams
+                sub_streams=self.m3u8_manager.sub_streams,
+                containers=self.download_manager.containers
             )
 
-            final_file = self.merge_manager.merge()
-            self.path_manager.move_final_file(final_file)
-            self._print_summary()
-            self.path_manager.cleanup()
+            # Merge in background while the caller starts the next download
+            if postprocess_scheduler.enabled:
+                job = postprocess_scheduler.submit(os.path.basename(self.path_manager.output_path), self._finalize)
+                console.print(f"[cyan]Post-processing queued: [bold]{job.name}[/bold]")
+
+                return {
+                    'path': self.path_manager.output_path,
+                    'url': self.m3u8_url,
+                    'is_master': self.m3u8_manager.is_master,
+                    'msg': 'Post-processing queued',
+                    'error': None,
+                    'stopped': download_stopped,
+                    'postprocess': job
+                }
+
+            self._finalize()
 
             return {
                 'path': self.path_manager.output_path,
@@ -504,6 +638,16 @@ class HLS_Downloader:
                 'stopped': False
             }
 
+    def _finalize(self) -> str:
+        """Merges the downloaded streams, moves the result to the output path and removes the temporary files."""
+        # Remuxed while downloading, nothing left to merge
+        final_file = self.download_manager.remuxed_file or self.merge_manager.merge()
+        self.path_manager.move_final_file(final_file)
+        self._print_summary()
+        self.path_manager.cleanup()
+
+        return self.path_manager.output_path
+
     def _print_summary(self):
         """Prints download summary including file size, duration, and any missing segments."""
         if TELEGRAM_BOT:
@@ -4,14 +4,18 @@ import os
 import sys
 import time
 import queue
+import shutil
+import asyncio
 import signal
 import logging
-import binascii
 import threading
+import importlib.util
 from queue import PriorityQueue
+from collections import OrderedDict
 from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from typing import Dict, Optional
 
 
 # External libraries
@@ -24,15 +28,22 @@ from rich.console import Console
 from StreamingCommunity.Util.color import Colors
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.os import internet_manager
 
 
 # Logic class
 from ...M3U8 import (
+    M3U8_Connection_Budget,
     M3U8_Decryption,
     M3U8_Ts_Estimator,
+    M3U8_Journal,
+    M3U8_Metrics,
     M3U8_Parser,
-    M3U8_UrlFix
+    M3U8_UrlFix,
+    M3U8_Worker_Controller,
+    detect_container
 )
+from ...FFmpeg import start_remux, finish_remux
 
 # Config
 TQDM_DELAY_WORKER = config_manager.get_float('M3U8_DOWNLOAD', 'tqdm_delay')
@@ -42,15 +53,33 @@ DEFAULT_VIDEO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_video_w
 DEFAULT_AUDIO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_audio_workser')
 MAX_TIMEOOUT = config_manager.get_int("REQUESTS", "timeout")
 SEGMENT_MAX_TIMEOUT = config_manager.get_int("M3U8_DOWNLOAD", "segment_timeout")
+MAX_CONNECTIONS = config_manager.get_int('M3U8_DOWNLOAD', 'max_connections')
+MAX_KEEPALIVE_CONNECTIONS = config_manager.get_int('M3U8_DOWNLOAD', 'max_keepalive_connections')
+KEEPALIVE_EXPIRY = config_manager.get_float('M3U8_DOWNLOAD', 'keepalive_expiry')
+USE_HTTP2 = config_manager.get_bool('M3U8_DOWNLOAD', 'use_http2')
+DOWNLOAD_ENGINE = str(config_manager.get('M3U8_DOWNLOAD', 'engine')).strip().lower()
+ASYNC_CONCURRENCY = config_manager.get_int('M3U8_DOWNLOAD', 'async_concurrency')
+REORDER_WINDOW = max(1, config_manager.get_int('M3U8_DOWNLOAD', 'reorder_window'))
+RESUME_DOWNLOAD = config_manager.get_bool('M3U8_DOWNLOAD', 'resume_download')
+DECRYPT_WORKERS = max(1, config_manager.get_int('M3U8_DOWNLOAD', 'decrypt_workers'))
+ADAPTIVE_WORKERS = config_manager.get_bool('M3U8_DOWNLOAD', 'adaptive_workers')
+MAX_ADAPTIVE_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'max_adaptive_workers')
+SIZE_PROBES = config_manager.get_int('M3U8_DOWNLOAD', 'size_probes')
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
 MAX_INTERRUPT_COUNT = 3
+KEY_CACHE_SIZE = 32
+WRITEV_MAX_BUFFERS = 512
 
 # Variable
 console = Console()
+h2_installed = importlib.util.find_spec("h2") is not None
+
+if USE_HTTP2 and not h2_installed:
+    logging.warning("HTTP/2 requested for segments but 'h2' is not installed, falling back to HTTP/1.1")
 
 
 class M3U8_Segments:
-    def __init__(self, url: str, tmp_folder: str, is_index_url: bool = True):
+    def __init__(self, url: str, tmp_folder: str, is_index_url: bool = True, connection_budget: M3U8_Connection_Budget = None, position: int = None, bandwidth: int = None, remux_path: str = None):
         """
         Initializes the M3U8_Segments object.
 
@@ -58,26 +87,57 @@ class M3U8_Segments:
             - url (str): The URL of the M3U8 playlist.
             - tmp_folder (str): The temporary folder to store downloaded segments.
             - is_index_url (bool): Flag indicating if `m3u8_index` is a URL (default True).
+            - connection_budget (M3U8_Connection_Budget): Optional budget shared with other streams, limits requests in flight.
+            - position (int): Line of the progress bar when several streams are downloaded together.
+            - bandwidth (int): Bitrate of the variant from the master playlist (bits/s), seeds the size estimate.
+            - remux_path (str): Pipe the segments into FFmpeg while downloading and write this mp4 instead of `0.ts`.
         """
         self.url = url
         self.tmp_folder = tmp_folder
+        self.connection_budget = connection_budget
+        self.position = position
+        self.bandwidth = bandwidth
+        self.remux_path = remux_path
+        self.remux_log_path = os.path.join(tmp_folder, "remux.log")
+        self.remux_process = None
+        self.remuxed = False
+        self.write_error: Optional[Exception] = None
         self.is_index_url = is_index_url
         self.expected_real_time = None
         self.tmp_file_path = os.path.join(self.tmp_folder, "0.ts")
         os.makedirs(self.tmp_folder, exist_ok=True)
 
         # Util class
-        self.decryption: M3U8_Decryption = None 
+        self.segment_keys = []
+        self.segment_sequences = []
+        self.segment_durations = []
+        self.segment_init = []
+        self.fragmented = False
+        self.init_cache: Dict[tuple, bytes] = {}
+        self.last_init = None
+        self.estimated_size = 0
+        self.container_counts: Dict[str, int] = {}
+        self.container_lock = threading.Lock()
+        self.encrypted = False
+        self.key_cache: OrderedDict[str, bytes] = OrderedDict()
+        self.key_cache_lock = threading.Lock()
+        self.key_futures: Dict[str, Future] = {}
+        self.decrypt_executor: ThreadPoolExecutor = None
+        self.decrypt_futures = []
         self.class_ts_estimator = M3U8_Ts_Estimator(0, self) 
         self.class_url_fixer = M3U8_UrlFix(url)
+        self.journal = M3U8_Journal(self.tmp_file_path)
 
         # Sync
         self.queue = PriorityQueue()
         self.buffer = {}
         self.expected_index = 0 
+        self.window_condition = threading.Condition()
+        self.resume_index = 0
 
         self.stop_event = threading.Event()
         self.downloaded_segments = set()
+        self.failed_segments = set()
         self.base_timeout = 0.5
         self.current_timeout = 3.0
 
@@ -94,31 +154,76 @@ class M3U8_Segments:
         self.info_nFailed = 0
         self.active_retries = 0 
         self.active_retries_lock = threading.Lock()
+        self.controller: M3U8_Worker_Controller = None
+        self.metrics: M3U8_Metrics = None
+
+        # Pooled clients, one for each CDN host
+        self.http_clients: Dict[str, httpx.Client] = {}
+        self.http_clients_lock = threading.Lock()
+        self.async_http_clients: Dict[str, httpx.AsyncClient] = {}
+        self.slot_condition: Optional[asyncio.Condition] = None
 
-    def __get_key__(self, m3u8_parser: M3U8_Parser) -> bytes:
+    def __get_key__(self, key_uri: str) -> bytes:
         """
-        Fetches the encryption key from the M3U8 playlist.
+        Fetches an encryption key of the M3U8 playlist.
 
         Args:
-            m3u8_parser (M3U8_Parser): An instance of M3U8_Parser containing parsed M3U8 data.
+            key_uri (str): Absolute url of the key.
 
         Returns:
             bytes: The decryption key in byte format.
         """
-        key_uri = urljoin(self.url, m3u8_parser.keys.get('uri'))
-        parsed_url = urlparse(key_uri)
-        self.key_base_url = f"{parsed_url.scheme}://{parsed_url.netloc}/"
-        
         try:
-            client_params = {'headers': {'User-Agent': get_userAgent()}, 'timeout': MAX_TIMEOOUT}
-            response = httpx.get(url=key_uri, **client_params)
+            response = self._get_http_client(key_uri).get(key_uri, timeout=MAX_TIMEOOUT)
             response.raise_for_status()
-
-            hex_content = binascii.hexlify(response.content).decode('utf-8')
-            return bytes.fromhex(hex_content)
+            return response.content
             
         except Exception as e:
             raise Exception(f"Failed to fetch key: {e}")
+
+    def _get_key(self, key_uri: str, fetch: bool = True) -> Optional[bytes]:
+        """
+        Returns a key from the LRU cache, fetching it on a miss. The lock is not held while fetching:
+        the first thread missing a key fetches it, the others asking for the same uri wait on its future.
+
+        Parameters:
+            - key_uri (str): Absolute url of the key.
+            - fetch (bool): Fetch the key if it is not cached yet, otherwise return None.
+        """
+        with self.key_cache_lock:
+            key = self.key_cache.get(key_uri)
+            if key is not None:
+                self.key_cache.move_to_end(key_uri)
+                return key
+
+            if not fetch:
+                return None
+
+            future = self.key_futures.get(key_uri)
+            owner = future is None
+            if owner:
+                future = self.key_futures[key_uri] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            key = self.__get_key__(key_uri)
+
+        except Exception as e:
+            with self.key_cache_lock:
+                self.key_futures.pop(key_uri, None)
+            future.set_exception(e)
+            raise
+
+        with self.key_cache_lock:
+            self.key_cache[key_uri] = key
+            if len(self.key_cache) > KEY_CACHE_SIZE:
+                self.key_cache.popitem(last=False)
+            self.key_futures.pop(key_uri, None)
+
+        future.set_result(key)
+        return key
     
     def parse_data(self, m3u8_content: str) -> None:
         """
@@ -132,20 +237,120 @@ class M3U8_Segments:
 
         self.expected_real_time_s = m3u8_parser.duration
 
-        if m3u8_parser.keys:
-            key = self.__get_key__(m3u8_parser)    
-            self.decryption = M3U8_Decryption(
-                key, 
-                m3u8_parser.keys.get('iv'), 
-                m3u8_parser.keys.get('method')
-            )
-
         self.segments = [
             self.class_url_fixer.generate_full_url(seg)
             if "http" not in seg else seg
             for seg in m3u8_parser.segments
         ]
-        self.class_ts_estimator.total_segments = len(self.segments)
+        self.segment_keys = m3u8_parser.segment_keys or [None] * len(self.segments)
+        self.segment_sequences = m3u8_parser.segment_sequences
+        self.segment_durations = m3u8_parser.segment_durations
+        self.segment_init = m3u8_parser.segment_init or [None] * len(self.segments)
+        self.encrypted = any(self.segment_keys)
+        self.class_ts_estimator.set_playlist(self.segment_durations, self.bandwidth)
+
+        # Fragmented MP4 (CMAF): init section + fragments already make an mp4 file
+        self.fragmented = any(self.segment_init)
+        if self.fragmented:
+            self.tmp_file_path = os.path.join(self.tmp_folder, "0.mp4")
+            self.journal = M3U8_Journal(self.tmp_file_path)
+
+            for index in {self._init_key(i): i for i in range(len(self.segments)) if self.segment_init[i]}.values():
+                self._get_init_section(index)
+
+        # Fetch the first key now, so an unreachable key fails before any segment is downloaded
+        if self.encrypted:
+            self._get_decryption(next(i for i, key_info in enumerate(self.segment_keys) if key_info))
+
+    def _get_decryption(self, index: int, fetch: bool = True) -> Optional[M3U8_Decryption]:
+        """
+        Resolves key and IV of a segment. Keys are fetched once and kept in a LRU cache keyed by uri,
+        so streams rotating their key only fetch each key once.
+
+        Parameters:
+            - index (int): The index of the segment.
+            - fetch (bool): Fetch the key if it is not cached yet, otherwise return None.
+
+        Returns:
+            M3U8_Decryption: Decryption of the segment, None if the segment is not encrypted.
+        """
+        key_info = self.segment_keys[index]
+        if key_info is None:
+            return None
+
+        return self._new_decryption(key_info, self.segment_sequences[index], fetch)
+
+    def _new_decryption(self, key_info: dict, sequence: int, fetch: bool = True) -> Optional[M3U8_Decryption]:
+        """
+        Decryption for a key tag, the key is taken from the LRU cache.
+
+        Parameters:
+            - key_info (dict): 'method', 'uri' and 'iv' of the key tag.
+            - sequence (int): Media sequence number, the IV when the key tag has none.
+            - fetch (bool): Fetch the key if it is not cached yet, otherwise return None.
+        """
+        key = self._get_key(urljoin(self.url, key_info.get('uri')), fetch)
+        if key is None:
+            return None
+
+        # Without an explicit IV, the media sequence number is the IV
+        iv = key_info.get('iv') or M3U8_Decryption.sequence_iv(sequence)
+        return M3U8_Decryption(key, iv, key_info.get('method'))
+
+    def _init_key(self, index: int) -> Optional[tuple]:
+        """Absolute uri and byterange of the init section of a segment, None for MPEG-TS segments."""
+        init_info = self.segment_init[index] if index < len(self.segment_init) else None
+        if init_info is None:
+            return None
+        return urljoin(self.url, init_info['uri']), init_info.get('byterange')
+
+    def _get_init_section(self, index: int) -> bytes:
+        """
+        Returns the init section (EXT-X-MAP) of a segment, fetched once and cached.
+
+        Parameters:
+            - index (int): The index of the segment.
+        """
+        init_key = self._init_key(index)
+        if init_key in self.init_cache:
+            return self.init_cache[init_key]
+
+        init_uri, byterange = init_key
+        headers = {}
+
+        # BYTERANGE is "<length>[@<offset>]", without it the init section is the whole resource
+        if byterange:
+            length, _, offset = str(byterange).partition('@')
+            start = int(offset or 0)
+            headers['Range'] = f"bytes={start}-{start + int(length) - 1}"
+
+        try:
+            response = self._get_http_client(init_uri).get(init_uri, headers=headers, timeout=MAX_TIMEOOUT)
+            response.raise_for_status()
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch init section {init_uri}: {e}")
+
+        # Encrypted by the key in effect at its EXT-X-MAP, like the segments after it
+        content = response.content
+        init_info = self.segment_init[index]
+        if init_info.get('key') is not None:
+            content = bytes(self._new_decryption(init_info['key'], init_info['sequence']).decrypt(content))
+
+        self.init_cache[init_key] = content
+        return content
+
+    def _with_init_section(self, index: int, segment_content: bytes) -> bytes:
+        """
+        Prepends the init section to the first fragment written after it changes (or at the start),
+        so the output is a playable fragmented mp4 and the journal still has one entry per segment.
+        """
+        init_key = self._init_key(index)
+        if init_key is None or init_key == self.last_init:
+            return segment_content
+
+        self.last_init = init_key
+        return b''.join((self._get_init_section(index), segment_content))
 
     def get_info(self) -> None:
         """
@@ -168,44 +373,306 @@ class M3U8_Segments:
                     
             except Exception as e:
                 raise RuntimeError(f"M3U8 info retrieval failed: {e}")
+
+            self._probe_segment_sizes()
+            self._check_free_space()
+
+    def _probe_segment_sizes(self) -> None:
+        """
+        Sends a HEAD request to `SIZE_PROBES` segments spread over the playlist and seeds
+        the size estimate with their Content-Length. Segments without it are ignored.
+        """
+        if SIZE_PROBES <= 0 or not self.segments:
+            return
+
+        count = min(SIZE_PROBES, len(self.segments))
+        indices = sorted({round(i * (len(self.segments) - 1) / max(count - 1, 1)) for i in range(count)})
+
+        def probe(index: int) -> Optional[int]:
+            try:
+                response = self._get_http_client(self.segments[index]).head(self.segments[index], timeout=MAX_TIMEOOUT)
+                response.raise_for_status()
+                return int(response.headers['Content-Length'])
+            
+            except Exception as e:
+                logging.info(f"Size probe of segment {index} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            sizes = list(executor.map(probe, indices))
+
+        probed = [(size, self.segment_durations[index]) for index, size in zip(indices, sizes) if size]
+        self.class_ts_estimator.add_probes([size for size, _ in probed], [duration for _, duration in probed])
+
+    def _check_free_space(self) -> None:
+        """
+        Warns if the estimated size of the stream does not fit in the free space of the temporary folder.
+        """
+        self.estimated_size = self.class_ts_estimator.estimate_total_size()
+        if not self.estimated_size:
+            return
+
+        # A resumed download already has part of the stream on disk
+        required = self.estimated_size
+        if os.path.exists(self.tmp_file_path):
+            required -= os.path.getsize(self.tmp_file_path)
+
+        free = shutil.disk_usage(self.tmp_folder).free
+        logging.info(f"Estimated size of {self.url}: {internet_manager.format_file_size(self.estimated_size)}, free: {internet_manager.format_file_size(free)}")
+
+        if required > free:
+            console.print(
+                f"[yellow]Not enough free space for this stream: ~{internet_manager.format_file_size(required)} needed, "
+                f"{internet_manager.format_file_size(free)} available in {self.tmp_folder}"
+            )
     
+    def handle_interrupt(self) -> None:
+        """
+        React to a Ctrl+C: stop gracefully, or force the stop after `MAX_INTERRUPT_COUNT` presses.
+        """
+        with self.interrupt_lock:
+            self.interrupt_count += 1
+            if self.interrupt_count >= MAX_INTERRUPT_COUNT:
+                self.force_stop = True
+                
+        if self.force_stop:
+            console.print("\n[red]Force stop triggered! Exiting immediately.")
+
+        else:
+            if not self.interrupt_flag.is_set():
+                remaining = MAX_INTERRUPT_COUNT - self.interrupt_count
+                console.print(f"\n[red]- Stopping gracefully... (Ctrl+C {remaining}x to force)")
+                self.download_interrupted = True
+
+                if remaining == 1:
+                    self.interrupt_flag.set()
+
     def setup_interrupt_handler(self):
         """
         Set up a signal handler for graceful interruption.
+        Outside the main thread the caller is expected to forward interrupts with `handle_interrupt`.
         """
         def interrupt_handler(signum, frame):
-            with self.interrupt_lock:
-                self.interrupt_count += 1
-                if self.interrupt_count >= MAX_INTERRUPT_COUNT:
-                    self.force_stop = True
+            self.handle_interrupt()
                     
-            if self.force_stop:
-                console.print("\n[red]Force stop triggered! Exiting immediately.")
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, interrupt_handler)
+        else:
+            logging.info("Not in the main thread, interrupts are forwarded by the caller")
 
-            else:
-                if not self.interrupt_flag.is_set():
-                    remaining = MAX_INTERRUPT_COUNT - self.interrupt_count
-                    console.print(f"\n[red]- Stopping gracefully... (Ctrl+C {remaining}x to force)")
-                    self.download_interrupted = True
+    def _get_http_client(self, url: str) -> httpx.Client:
+        """
+        Returns the pooled keep-alive client for the host of `url`, creating it on first use.
 
-                    if remaining == 1:
-                        self.interrupt_flag.set()
+        Parameters:
+            - url (str): The URL that is about to be requested.
+        """
+        host = urlparse(url).netloc
 
-                    
-        if threading.current_thread() is threading.main_thread():
-            signal.signal(signal.SIGINT, interrupt_handler)
+        with self.http_clients_lock:
+            client = self.http_clients.get(host)
+
+            if client is None:
+                client_params = {
+                    'headers': {'User-Agent': get_userAgent()},
+                    'timeout': SEGMENT_MAX_TIMEOUT,
+                    'follow_redirects': True,
+                    'http2': USE_HTTP2 and h2_installed,
+                    'limits': httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY
+                    )
+                }
+                client = httpx.Client(**client_params)
+                self.http_clients[host] = client
+
+            return client
+
+    def _close_http_clients(self) -> None:
+        """Close every pooled client and release its connections."""
+        with self.http_clients_lock:
+            for client in self.http_clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logging.error(f"Error closing http client: {str(e)}")
+
+            self.http_clients = {}
+
+    def _store_segment(self, index: int, segment_content: bytes, content_size: int, progress_bar: tqdm) -> None:
+        """
+        Hands a ready (plain) segment over to the writer.
+
+        Parameters:
+            - index (int): The index of the segment.
+            - segment_content (bytes): The content of the segment, bytes or memoryview.
+            - content_size (int): Size of the segment as downloaded.
+            - progress_bar (tqdm): Progress counter for tracking download progress.
+        """
+        self.class_ts_estimator.update_progress_bar(content_size, progress_bar, self.segment_durations[index] if index < len(self.segment_durations) else 0)
+        segment_content = self._sniff_segment(index, segment_content)
+
+        # Added before queuing, so the writer can take it back if the segment arrives too late
+        self.downloaded_segments.add(index)
+        self.queue.put((index, segment_content))
+        progress_bar.update(1)
+
+    def _sniff_segment(self, index: int, segment_content: bytes) -> bytes:
+        """
+        Detects the container of a plain segment from its magic bytes and strips
+        the PNG some CDNs prepend to disguise MPEG-TS segments as images.
+
+        Parameters:
+            - index (int): The index of the segment.
+            - segment_content (bytes): The content of the segment, bytes or memoryview.
+        """
+        container, offset = detect_container(segment_content)
+
+        with self.container_lock:
+            if self.container_counts and container not in self.container_counts:
+                logging.warning(f"Segment {index} is {container}, previous segments were {list(self.container_counts)}")
+            self.container_counts[container] = self.container_counts.get(container, 0) + 1
+
+        if offset:
+            return memoryview(segment_content)[offset:]
+        return segment_content
+
+    @property
+    def container(self) -> Optional[str]:
+        """FFmpeg input format of most segments, None if unknown."""
+        with self.container_lock:
+            known = {name: count for name, count in self.container_counts.items() if name is not None}
+        return max(known, key=known.get) if known else None
+
+    def _decrypt_and_store(self, index: int, buffer: bytearray, decryption: M3U8_Decryption, progress_bar: tqdm) -> None:
+        """
+        Decrypts a segment in place, runs on the decryption pool.
+        """
+        content_size = len(buffer)
+
+        try:
+            start_time = time.perf_counter()
+            segment_content = decryption.decrypt_inplace(buffer)
+            self.metrics.segment_decrypted(time.perf_counter() - start_time)
+
+        except Exception as e:
+            logging.error(f"Decryption failed for segment {index}: {str(e)}")
+            self.interrupt_flag.set()   # Interrupt the download process
+            self.stop_event.set()       # Trigger the stopping event for all threads
+            return
+
+        self._store_segment(index, segment_content, content_size, progress_bar)
+
+    def _submit_segment(self, index: int, data: bytearray, decryption: Optional[M3U8_Decryption], progress_bar: tqdm) -> None:
+        """
+        Queues a downloaded segment, encrypted ones go through the decryption pool
+        so the network threads don't wait on the CPU.
+
+        Parameters:
+            - index (int): The index of the segment.
+            - data (bytearray): The raw content of the segment.
+            - decryption (M3U8_Decryption): Decryption of the segment, None if it is not encrypted.
+            - progress_bar (tqdm): Progress counter for tracking download progress.
+        """
+        if decryption is None:
+            self._store_segment(index, data, len(data), progress_bar)
         else:
-            print("Signal handler must be set in the main thread")
-
-    def _get_http_client(self):
-        client_params = {
-            'headers': {'User-Agent': get_userAgent()},
-            'timeout': SEGMENT_MAX_TIMEOUT,
-            'follow_redirects': True,
-            'http2': False
-        }
-        return httpx.Client(**client_params)
-                            
+            self.decrypt_futures.append(self.decrypt_executor.submit(self._decrypt_and_store, index, data, decryption, progress_bar))
+
+    def _wait_decryption(self) -> None:
+        """Wait for every segment already handed to the decryption pool."""
+        futures, self.decrypt_futures = self.decrypt_futures, []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error in decryption thread: {str(e)}")
+
+    def _new_segment_buffer(self, response: httpx.Response) -> Optional[bytearray]:
+        """
+        Preallocate the buffer a segment is read into, None if its size is not known upfront.
+        """
+        size = int(response.headers.get('content-length', 0) or 0)
+        encoding = response.headers.get('content-encoding', 'identity').lower()
+        
+        if size <= 0 or encoding != 'identity':
+            return None
+        return bytearray(size)
+
+    def _read_segment(self, response: httpx.Response) -> bytearray:
+        """
+        Reads the body of a streamed response into a preallocated buffer, chunk by chunk.
+
+        Parameters:
+            - response (httpx.Response): Response opened with `client.stream`.
+        """
+        buffer = self._new_segment_buffer(response)
+        if buffer is None:
+            body = bytearray(response.read())
+            self.class_ts_estimator.add_bytes(len(body))
+            return body
+
+        offset = 0
+        with memoryview(buffer) as view:
+            for chunk in response.iter_bytes():
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+                self.class_ts_estimator.add_bytes(len(chunk))
+
+        if offset != len(buffer):
+            raise ValueError(f"Incomplete segment: {offset}/{len(buffer)} bytes")
+        return buffer
+
+    async def _read_segment_async(self, response: httpx.Response) -> bytearray:
+        """
+        Async counterpart of `_read_segment`.
+
+        Parameters:
+            - response (httpx.Response): Response opened with `client.stream`.
+        """
+        buffer = self._new_segment_buffer(response)
+        if buffer is None:
+            body = bytearray(await response.aread())
+            self.class_ts_estimator.add_bytes(len(body))
+            return body
+
+        offset = 0
+        with memoryview(buffer) as view:
+            async for chunk in response.aiter_bytes():
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+                self.class_ts_estimator.add_bytes(len(chunk))
+
+        if offset != len(buffer):
+            raise ValueError(f"Incomplete segment: {offset}/{len(buffer)} bytes")
+        return buffer
+
+    def _register_failed_attempt(self, ts_url: str, index: int, attempt: int, error: Exception, progress_bar: tqdm) -> bool:
+        """
+        Updates retry statistics after a failed attempt.
+
+        Returns:
+            bool: True if it was the last attempt and the segment has been marked as failed.
+        """
+        logging.info(f"Attempt {attempt + 1} failed for segment {index} - '{ts_url}': {error}")
+        self.metrics.segment_retry(error)
+        
+        if attempt > self.info_maxRetry:
+            self.info_maxRetry = ( attempt + 1 )
+        self.info_nRetry += 1
+
+        if attempt + 1 == REQUEST_MAX_RETRY:
+            console.log(f"[red]Final retry failed for segment: {index}")
+            self.queue.put((index, None))  # Marker for failed segment
+            progress_bar.update(1)
+            self.failed_segments.add(index)
+            self.info_nFailed += 1
+            self.metrics.segment_failed()
+            return True
+        
+        return False
+
     def download_segment(self, ts_url: str, index: int, progress_bar: tqdm, backoff_factor: float = 1.1) -> None:
         """
         Downloads a TS segment and adds it to the segment queue with retry logic.
@@ -220,44 +687,31 @@ class M3U8_Segments:
             if self.interrupt_flag.is_set():
                 return
             
+            if not self.controller.acquire(self.interrupt_flag):
+                return
+
             try:
-                with self._get_http_client() as client:
-                    response = client.get(ts_url)
+                client = self._get_http_client(ts_url)
+                start_time = time.monotonic()
+
+                try:
+                    with self.connection_budget if self.connection_budget is not None else nullcontext():
+                        with client.stream("GET", ts_url) as response:
         
-                    # Validate response and content
-                    response.raise_for_status()
-                    segment_content = response.content
-                    content_size = len(segment_content)
+                            # Validate response and content
+                            response.raise_for_status()
+                            data = self._read_segment(response)
+                finally:
+                    self.controller.release()
 
-                    # Decrypt if needed and verify decrypted content
-                    if self.decryption is not None:
-                        try:
-                            segment_content = self.decryption.decrypt(segment_content)
-                            
-                        except Exception as e:
-                            logging.error(f"Decryption failed for segment {index}: {str(e)}")
-                            self.interrupt_flag.set()   # Interrupt the download process
-                            self.stop_event.set()       # Trigger the stopping event for all threads
-                            break                       # Stop the current task immediately
-
-                    self.class_ts_estimator.update_progress_bar(content_size, progress_bar)
-                    self.queue.put((index, segment_content))
-                    self.downloaded_segments.add(index)  
-                    progress_bar.update(1)
-                    return
+                self.controller.record_success(time.monotonic() - start_time, len(data))
+                self.metrics.segment_downloaded(time.monotonic() - start_time, len(data))
+                self._submit_segment(index, data, self._get_decryption(index), progress_bar)
+                return
 
             except Exception as e:
-                logging.info(f"Attempt {attempt + 1} failed for segment {index} - '{ts_url}': {e}")
-                
-                if attempt > self.info_maxRetry:
-                    self.info_maxRetry = ( attempt + 1 )
-                self.info_nRetry += 1
-
-                if attempt + 1 == REQUEST_MAX_RETRY:
-                    console.log(f"[red]Final retry failed for segment: {index}")
-                    self.queue.put((index, None))  # Marker for failed segment
-                    progress_bar.update(1)
-                    self.info_nFailed += 1
+                self.controller.record_failure(e)
+                if self._register_failed_attempt(ts_url, index, attempt, e, progress_bar):
                     return
                 
                 with self.active_retries_lock:
@@ -270,55 +724,339 @@ class M3U8_Segments:
                 with self.active_retries_lock:
                     self.active_retries -= 1
 
+    def _get_async_http_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Async counterpart of `_get_http_client`, clients only live inside the running event loop.
+
+        Parameters:
+            - url (str): The URL that is about to be requested.
+        """
+        host = urlparse(url).netloc
+        client = self.async_http_clients.get(host)
+
+        if client is None:
+            client_params = {
+                'headers': {'User-Agent': get_userAgent()},
+                'timeout': SEGMENT_MAX_TIMEOUT,
+                'follow_redirects': True,
+                'http2': USE_HTTP2 and h2_installed,
+                'limits': httpx.Limits(
+                    max_connections=ASYNC_CONCURRENCY,
+                    max_keepalive_connections=ASYNC_CONCURRENCY,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+            }
+            client = httpx.AsyncClient(**client_params)
+            self.async_http_clients[host] = client
+
+        return client
+
+    def _try_take_slots(self) -> bool:
+        """
+        Take a slot under the adaptive worker limit and one of the shared connection budget,
+        both or none, so a request never holds one while waiting for the other.
+        """
+        if not self.controller.try_acquire():
+            return False
+
+        if self.connection_budget is not None and not self.connection_budget.acquire(blocking=False):
+            self.controller.release()
+            return False
+
+        return True
+
+    def _release_slots(self) -> None:
+        """Give back the slots taken by `_try_take_slots`."""
+        self.controller.release()
+        if self.connection_budget is not None:
+            self.connection_budget.release()
+        self._wake_slot_waiters()
+
+    async def _notify_slot_waiters(self) -> None:
+        async with self.slot_condition:
+            self.slot_condition.notify_all()
+
+    def _wake_slot_waiters(self) -> None:
+        """
+        Wake the requests waiting for a slot, called on the event loop when a slot is released
+        or the adaptive limit changes.
+        """
+        if self.slot_condition is not None:
+            asyncio.ensure_future(self._notify_slot_waiters())
+
+    async def download_segment_async(self, ts_url: str, index: int, progress_bar: tqdm, semaphore: asyncio.Semaphore, backoff_factor: float = 1.1) -> None:
+        """
+        Downloads a TS segment from the event loop, same retry semantics as `download_segment`.
+
+        Parameters:
+            - ts_url (str): The URL of the TS segment.
+            - index (int): The index of the segment.
+            - progress_bar (tqdm): Progress counter for tracking download progress.
+            - semaphore (asyncio.Semaphore): Bounds the number of requests in flight.
+            - backoff_factor (float): The backoff factor for exponential backoff.
+        """
+        for attempt in range(REQUEST_MAX_RETRY):
+            if self.interrupt_flag.is_set():
+                return
+            
+            try:
+                async with semaphore:
+                    client = self._get_async_http_client(ts_url)
+                    taken = False
+
+                    # Set in the same step the slots are taken, a cancellation can't leak them
+                    def take_slots() -> bool:
+                        nonlocal taken
+                        taken = self._try_take_slots()
+                        return taken
+
+                    try:
+                        async with self.slot_condition:
+                            await self.slot_condition.wait_for(take_slots)
+
+                        start_time = time.monotonic()
+                        async with client.stream("GET", ts_url) as response:
+                            response.raise_for_status()
+                            data = await self._read_segment_async(response)
+                    finally:
+                        if taken:
+                            self._release_slots()
+
+                self.controller.record_success(time.monotonic() - start_time, len(data))
+                self._wake_slot_waiters()
+                self.metrics.segment_downloaded(time.monotonic() - start_time, len(data))
+
+                # A key not cached yet is fetched off the event loop
+                decryption = self._get_decryption(index, fetch=False)
+                if decryption is None and self.segment_keys[index] is not None:
+                    decryption = await asyncio.to_thread(self._get_decryption, index)
+
+                self._submit_segment(index, data, decryption, progress_bar)
+                return
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.controller.record_failure(e)
+                self._wake_slot_waiters()
+                if self._register_failed_attempt(ts_url, index, attempt, e, progress_bar):
+                    return
+                
+                with self.active_retries_lock:
+                    self.active_retries += 1
+                
+                # The slot is released while waiting, so other segments keep flowing
+                sleep_time = backoff_factor * (2 ** attempt)
+                logging.info(f"Retrying segment {index} in {sleep_time} seconds...")
+
+                try:
+                    await asyncio.sleep(sleep_time)
+                finally:
+                    with self.active_retries_lock:
+                        self.active_retries -= 1
+
+    async def _download_all_async(self, progress_bar: tqdm) -> None:
+        """
+        Schedules every segment on a single event loop, bounded by `async_concurrency` and `reorder_window`.
+        """
+        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+        total_segments = len(self.segments)
+        next_index = self.resume_index
+        pending = set()
+
+        # Slots given back by the other streams sharing the connection budget
+        loop = asyncio.get_running_loop()
+        self.slot_condition = asyncio.Condition()
+
+        def budget_listener():
+            try:
+                loop.call_soon_threadsafe(self._wake_slot_waiters)
+            except RuntimeError:
+                pass    # Loop already closed, this stream is done
+
+        if self.connection_budget is not None:
+            self.connection_budget.add_listener(budget_listener)
+
+        try:
+            while next_index < total_segments or pending:
+
+                # Schedule new segments only while the writer has room for them
+                while next_index < total_segments and self._in_reorder_window(next_index):
+                    pending.add(asyncio.ensure_future(
+                        self.download_segment_async(self.segments[next_index], next_index, progress_bar, semaphore)
+                    ))
+                    next_index += 1
+
+                if pending:
+                    done, pending = await asyncio.wait(pending, timeout=0.25, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        if not task.cancelled() and task.exception() is not None:
+                            logging.error(f"Error in download task: {str(task.exception())}")
+
+                else:
+                    await asyncio.sleep(0.05)
+
+                # Interrupt: drop every request still in flight
+                if self.interrupt_flag.is_set() or self.stop_event.is_set():
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    break
+
+        finally:
+            if self.connection_budget is not None:
+                self.connection_budget.remove_listener(budget_listener)
+            self.slot_condition = None
+
+            for client in self.async_http_clients.values():
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logging.error(f"Error closing async http client: {str(e)}")
+
+            self.async_http_clients = {}
+
+    def _in_reorder_window(self, index: int) -> bool:
+        """
+        Check if segment `index` can be fetched without growing the reorder buffer past `reorder_window`.
+        """
+        return index < self.expected_index + REORDER_WINDOW
+
+    def _wait_for_reorder_window(self, index: int) -> bool:
+        """
+        Blocks the caller until the writer has room for segment `index` (backpressure).
+
+        Returns:
+            bool: False if the download was stopped while waiting.
+        """
+        with self.window_condition:
+            while not self._in_reorder_window(index):
+                if self.interrupt_flag.is_set() or self.stop_event.is_set():
+                    return False
+                self.window_condition.wait(timeout=0.5)
+
+        return True
+
+    def _write_batch(self, f, batch: list) -> None:
+        """
+        Writes a run of in-order segments with as few syscalls as possible.
+
+        Parameters:
+            - f: Unbuffered binary file object.
+            - batch (list): Contiguous segments content, in order.
+        """
+        if not hasattr(os, 'writev'):
+            f.writelines(batch)
+            return
+
+        fd = f.fileno()
+        for start in range(0, len(batch), WRITEV_MAX_BUFFERS):
+            chunk = batch[start:start + WRITEV_MAX_BUFFERS]
+            written = os.writev(fd, chunk)
+
+            # Short write: finish the rest of the chunk by hand
+            for data in chunk:
+                if written >= len(data):
+                    written -= len(data)
+                    continue
+
+                view = memoryview(data)[written:]
+                while view:
+                    view = view[os.write(fd, view):]
+                written = 0
+
+    def _open_output(self):
+        """
+        Opens the unbuffered output of the writer: the stdin of the FFmpeg remux, or `0.ts`.
+        """
+        if self.remux_process is not None:
+            return self.remux_process.stdin
+
+        return open(self.tmp_file_path, 'ab' if self.resume_index else 'wb', buffering=0)
+
     def write_segments_to_file(self):
         """
-        Writes segments to file with additional verification.
+        Writes segments to file in order, keeping at most `reorder_window` segments in memory.
         """
-        with open(self.tmp_file_path, 'wb') as f:
+        with self._open_output() as f:
             while not self.stop_event.is_set() or not self.queue.empty():
                 if self.interrupt_flag.is_set():
                     break
                 
                 try:
-                    index, segment_content = self.queue.get(timeout=self.current_timeout)
+                    items = [self.queue.get(timeout=self.current_timeout)]
+                    queue_depth = self.queue.qsize() + 1    # Backlog the writer woke up to, before draining it
 
                     # Successful queue retrieval: reduce timeout
                     self.current_timeout = max(self.base_timeout, self.current_timeout / 2)
 
-                    # Handle failed segments
-                    if segment_content is None:
-                        if index == self.expected_index:
-                            self.expected_index += 1
-                        continue
+                    # Drain whatever else is already available
+                    while True:
+                        try:
+                            items.append(self.queue.get_nowait())
+                        except queue.Empty:
+                            break
+
+                    for index, segment_content in items:
+                        if index < self.expected_index:
+                            logging.warning(f"Segment {index} arrived after the writer moved past it, dropped")
+                            if segment_content is not None:
+                                self.downloaded_segments.discard(index)
+                            continue
+                        self.buffer[index] = segment_content
+
+                    # Collect the run of segments that are now in order
+                    batch, batch_index = [], []
+                    while self.expected_index in self.buffer:
+                        segment_content = self.buffer.pop(self.expected_index)
 
-                    # Write segment if it's the next expected one
-                    if index == self.expected_index:
-                        f.write(segment_content)
-                        f.flush()
+                        # Failed segments are skipped
+                        if segment_content is not None:
+                            if self.fragmented:
+                                segment_content = self._with_init_section(self.expected_index, segment_content)
+                            batch.append(segment_content)
+                            batch_index.append(self.expected_index)
                         self.expected_index += 1
 
-                        # Write any buffered segments that are now in order
-                        while self.expected_index in self.buffer:
-                            next_segment = self.buffer.pop(self.expected_index)
+                    if batch:
+                        self._write_batch(f, batch)
 
-                            if next_segment is not None:
-                                f.write(next_segment)
-                                f.flush()
+                        # Journal entries only after the data is on disk
+                        for index, segment_content in zip(batch_index, batch):
+                            self.journal.record(index, segment_content)
+                        self.journal.flush()
 
-                            self.expected_index += 1
-                    
-                    else:
-                        self.buffer[index] = segment_content
+                    with self.window_condition:
+                        self.window_condition.notify_all()
+
+                    self.metrics.writer_state(queue_depth, len(self.buffer))
+                    self.metrics.workers(self.controller.limit)
+
+                except BrokenPipeError:
+                    logging.error(f"Remux process exited while writing segment {self.expected_index}")
+                    self.interrupt_flag.set()
+                    self.stop_event.set()
+                    break
 
                 except queue.Empty:
                     self.current_timeout = min(MAX_TIMEOOUT, self.current_timeout * 1.1)
                     time.sleep(0.05)
 
-                    if self.stop_event.is_set():
+                    # A late segment may have been queued while sleeping
+                    if self.stop_event.is_set() and self.queue.empty():
                         break
 
                 except Exception as e:
-                    logging.error(f"Error writing segment {index}: {str(e)}")
+                    logging.error(f"Error writing segments at index {self.expected_index}: {str(e)}")
+
+                    # Part of the batch may be missing from disk, the journal can't be trusted anymore
+                    self.write_error = e
+                    self.journal.close(remove=True)
+                    self.interrupt_flag.set()
+                    self.stop_event.set()
+                    break
     
     def download_streams(self, description: str, type: str):
         """
@@ -335,12 +1073,30 @@ class M3U8_Segments:
           
         self.get_info()
         self.setup_interrupt_handler()
+        self.controller = self._create_controller(type)
+        self.metrics = M3U8_Metrics(self.url, type)
+
+        # A remuxed stream never reaches disk as ts, there is nothing to resume from
+        if RESUME_DOWNLOAD and not self.remux_path:
+            self._resume_from_journal(description)
+
+        # Fragments are written as mp4 already, there is nothing to remux
+        if self.fragmented:
+            self.remux_path = None
+            if self.resume_index:
+                self.last_init = self._init_key(self.resume_index - 1)
+
+        # Started here so a missing FFmpeg fails before any segment is downloaded
+        if self.remux_path:
+            self.remux_process = start_remux(self.remux_path, self.remux_log_path)
 
         progress_bar = tqdm(
             total=len(self.segments), 
             unit='s',
             ascii='░▒█',
             bar_format=self._get_bar_format(description),
+            initial=self.resume_index,
+            position=self.position,
             mininterval=0.6,
             maxinterval=1.0,
             file=sys.stdout,        # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.
@@ -351,58 +1107,110 @@ class M3U8_Segments:
             writer_thread.daemon = True
             writer_thread.start()
 
-            # Configure workers and delay
-            max_workers = self._get_worker_count(type)
-            
-            # Download segments with completion verification
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
-                for index, segment_url in enumerate(self.segments):
+            if self.encrypted:
+                self.decrypt_executor = ThreadPoolExecutor(max_workers=DECRYPT_WORKERS, thread_name_prefix="decrypt")
 
-                    # Check for interrupt before submitting each task
-                    if self.interrupt_flag.is_set():
-                        break
+            if DOWNLOAD_ENGINE == "async":
+                asyncio.run(self._download_all_async(progress_bar))
+            else:
+                self._download_all_threaded(progress_bar, type)
 
-                    time.sleep(TQDM_DELAY_WORKER)
-                    futures.append(executor.submit(self.download_segment, segment_url, index, progress_bar))
+            # Segments still being decrypted are not missing
+            self._wait_decryption()
 
-                # Wait for futures with interrupt handling
-                for future in as_completed(futures):
-                    if self.interrupt_flag.is_set():
-                        break
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logging.error(f"Error in download thread: {str(e)}")
-
-                # Interrupt handling for missing segments
-                if not self.interrupt_flag.is_set():
-                    total_segments = len(self.segments)
-                    completed_segments = len(self.downloaded_segments)
+            # Interrupt handling for missing segments
+            if not self.interrupt_flag.is_set():
+                total_segments = len(self.segments)
+                completed_segments = len(self.downloaded_segments)
+                
+                if completed_segments < total_segments:
+                    missing_segments = set(range(total_segments)) - self.downloaded_segments
+                    logging.warning(f"Missing segments: {sorted(missing_segments)}")
                     
-                    if completed_segments < total_segments:
-                        missing_segments = set(range(total_segments)) - self.downloaded_segments
-                        logging.warning(f"Missing segments: {sorted(missing_segments)}")
-                        
-                        # Retry missing segments with interrupt check
-                        for index in missing_segments:
-                            if self.interrupt_flag.is_set():
-                                break
-
-                            try:
-                                self.download_segment(self.segments[index], index, progress_bar)
-                                
-                            except Exception as e:
-                                logging.error(f"Failed to retry segment {index}: {str(e)}")
+                    # Retry missing segments with interrupt check, the writer already skipped the failed ones
+                    for index in sorted(missing_segments - self.failed_segments):
+                        if self.interrupt_flag.is_set():
+                            break
+
+                        try:
+                            self.download_segment(self.segments[index], index, progress_bar)
+                            
+                        except Exception as e:
+                            logging.error(f"Failed to retry segment {index}: {str(e)}")
 
         finally:
             self._cleanup_resources(writer_thread, progress_bar)
 
+        if self.remux_process is not None and not self.remuxed:
+            raise RuntimeError(f"Remux to {self.remux_path} failed, see {self.remux_log_path}")
+
+        if self.write_error is not None:
+            raise RuntimeError(f"Writing {self.tmp_file_path} failed: {self.write_error}")
+
         if not self.interrupt_flag.is_set():
             self._verify_download_completion()
 
         return self._generate_results(type)
     
+    def _download_all_threaded(self, progress_bar: tqdm, type: str) -> None:
+        """
+        Downloads segments with a pool of worker threads.
+
+        Parameters:
+            - progress_bar (tqdm): Progress counter for tracking download progress.
+            - type (str): Type of download: 'video' or 'audio'
+        """
+        with ThreadPoolExecutor(max_workers=self.controller.maximum) as executor:
+            futures = []
+            for index, segment_url in enumerate(self.segments):
+                if index < self.resume_index:
+                    continue
+
+                # Check for interrupt before submitting each task
+                if self.interrupt_flag.is_set():
+                    break
+
+                # Backpressure: wait for the writer to catch up
+                if not self._wait_for_reorder_window(index):
+                    break
+
+                time.sleep(TQDM_DELAY_WORKER)
+                futures.append(executor.submit(self.download_segment, segment_url, index, progress_bar))
+
+            # Wait for futures with interrupt handling
+            for future in as_completed(futures):
+                if self.interrupt_flag.is_set():
+                    break
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Error in download thread: {str(e)}")
+    
+    def _resume_from_journal(self, description: str) -> None:
+        """
+        Open the segment journal and skip every segment already written by a previous run.
+
+        Parameters:
+            - description: Description of the stream, used in the resume message.
+        """
+        try:
+            self.resume_index, resume_offset = self.journal.open(self.segments)
+
+        except Exception as e:
+            logging.error(f"Can't open segment journal, download from scratch: {str(e)}")
+            self.journal.close()
+            self.resume_index = 0
+            return
+
+        if self.resume_index:
+            console.print(
+                f"[cyan]Resume {description}: [green]{self.resume_index}[white]/[green]{len(self.segments)} "
+                f"[cyan]segments already downloaded ([green]{internet_manager.format_file_size(resume_offset)}[cyan])"
+            )
+
+        self.expected_index = self.resume_index
+        self.downloaded_segments.update(range(self.resume_index))
+
     def _get_bar_format(self, description: str) -> str:
         """
         Generate platform-appropriate progress bar format.
@@ -424,13 +1232,34 @@ class M3U8_Segments:
         }.get(stream_type.lower(), 1)
 
         return base_workers
+
+    def _create_controller(self, stream_type: str) -> M3U8_Worker_Controller:
+        """
+        Create the controller of the requests in flight. When `adaptive_workers` is enabled it starts
+        from the configured worker count and adapts to the CDN, otherwise the limit is fixed.
+        """
+        if DOWNLOAD_ENGINE == "async":
+            initial, maximum = self._get_worker_count(stream_type), ASYNC_CONCURRENCY
+            if not ADAPTIVE_WORKERS:
+                initial = ASYNC_CONCURRENCY
+        else:
+            initial = self._get_worker_count(stream_type)
+            maximum = max(initial, MAX_ADAPTIVE_WORKERS)
+
+        if not ADAPTIVE_WORKERS:
+            return M3U8_Worker_Controller(initial, initial, initial)
+        
+        return M3U8_Worker_Controller(initial, 1, maximum, active_retries=lambda: self.active_retries)
     
     def _generate_results(self, stream_type: str) -> Dict:
         """Package final download results."""
         return {
             'type': stream_type,
             'nFailed': self.info_nFailed,
-            'stopped': self.download_interrupted
+            'stopped': self.download_interrupted,
+            'resumable': self.journal.exists(),
+            'remux': self.remux_path if self.remuxed else None,
+            'container': self.container
         }
     
     def _verify_download_completion(self) -> None:
@@ -442,9 +1271,26 @@ class M3U8_Segments:
         
     def _cleanup_resources(self, writer_thread: threading.Thread, progress_bar: tqdm) -> None:
         """Ensure resource cleanup and final reporting."""
+        if self.decrypt_executor is not None:
+            self._wait_decryption()
+            self.decrypt_executor.shutdown(wait=True)
+            self.decrypt_executor = None
+
         self.stop_event.set()
         writer_thread.join(timeout=30)
         progress_bar.close()
+
+        if self.remux_process is not None:
+            self.remuxed = finish_remux(self.remux_process, self.remux_log_path)
+
+        self.class_ts_estimator.close()
+        self._close_http_clients()
+
+        # Keep the journal only if the user stopped the download or the writer didn't reach the end:
+        # segments that failed every retry are merged as missing, a rerun would fail on them again
+        completed = (not self.interrupt_flag.is_set() and self.expected_index >= len(self.segments) and not writer_thread.is_alive())
+        self.journal.close(remove=completed)
+        self.metrics.dump(len(self.segments))
         
         #if self.download_interrupted:
         #    console.print("\n[red]Download terminated by user")
@@ -462,5 +1308,8 @@ class M3U8_Segments:
                      f"[white]Total retries: [green]{self.info_nRetry} "
                      f"[white]Failed segments: [red]{self.info_nFailed}")
         
-        if self.info_nRetry > len(self.segments) * 0.3:
+        if ADAPTIVE_WORKERS and self.controller is not None:
+            console.print(f"[cyan]Adaptive workers: [white]final limit [green]{self.controller.limit}")
+
+        elif self.info_nRetry > len(self.segments) * 0.3:
             console.print("[yellow]Warning: High retry count detected. Consider reducing worker count in config.")
\ No newline at end of file
@@ -7,6 +7,7 @@ import time
 import signal
 import logging
 from functools import partial
+from typing import Optional
 
 
 # External libraries
@@ -27,6 +28,8 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 # Logic class
 from ...FFmpeg import print_duration_table
+from .ranges import MP4_Ranges, probe_ranges, CONNECTIONS
+from .stream import ThrottledProgress, copy_stream
 
 
 # Config
@@ -34,6 +37,7 @@ REQUEST_VERIFY = config_manager.get_bool('REQUESTS', 'verify')
 GET_ONLY_LINK = config_manager.get_bool('M3U8_PARSER', 'get_only_link')
 REQUEST_TIMEOUT = config_manager.get_float('REQUESTS', 'timeout')
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
+SEGMENTED_DOWNLOAD = config_manager.get_bool('MP4_DOWNLOAD', 'segmented')
 
 
 # Variable
@@ -70,6 +74,91 @@ def signal_handler(signum, frame, interrupt_handler, original_handler):
         signal.signal(signum, original_handler)
 
 
+def create_progress_bar(total: int) -> tqdm:
+    """
+    Create the progress bar of an MP4 download.
+
+    Parameters:
+        - total (int): Size of the file in bytes.
+    """
+    return tqdm(
+        total=total,
+        ascii='░▒█',
+        bar_format=f"{Colors.YELLOW}[MP4]{Colors.WHITE}: "
+                   f"{Colors.RED}{{percentage:.2f}}% {Colors.MAGENTA}{{bar}} {Colors.WHITE}[ "
+                   f"{Colors.YELLOW}{{n_fmt}}{Colors.WHITE} / {Colors.RED}{{total_fmt}} {Colors.WHITE}] "
+                   f"{Colors.YELLOW}{{elapsed}} {Colors.WHITE}< {Colors.CYAN}{{remaining}}{Colors.WHITE}, "
+                   f"{Colors.YELLOW}{{rate_fmt}}{{postfix}} ",
+        unit='iB',
+        unit_scale=True,
+        desc='Downloading',
+        mininterval=0.05,
+        file=sys.stdout                         # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.  
+    )
+
+
+def download_segmented(url: str, headers: dict, temp_path: str, interrupt_handler: InterruptHandler) -> Optional[bool]:
+    """
+    Download the file over several connections, one byte range each.
+
+    Returns:
+        bool: True if completed, False if stopped (the ranges can be resumed), None if the server does not support ranges.
+    """
+    client_params = {
+        'timeout': REQUEST_TIMEOUT,
+        'verify': REQUEST_VERIFY,
+        'follow_redirects': True,
+        'limits': httpx.Limits(max_connections=CONNECTIONS + 1, max_keepalive_connections=CONNECTIONS + 1)
+    }
+
+    with httpx.Client(**client_params) as client:
+        try:
+            total, accept_ranges, validators = probe_ranges(client, url, headers)
+        except Exception as e:
+            logging.info(f"Range probe failed, use a single connection: {e}")
+            return None
+
+        if not accept_ranges or total == 0:
+            return None
+
+        with create_progress_bar(total) as bar:
+            ranges = MP4_Ranges(client, url, headers, temp_path, total, validators)
+            return ranges.download(bar, lambda: interrupt_handler.force_quit)
+
+
+def download_single(url: str, headers: dict, temp_path: str, interrupt_handler: InterruptHandler) -> bool:
+    """
+    Stream the whole file over a single connection.
+
+    Returns:
+        bool: False if the server returned no content.
+    """
+    with httpx.Client() as client:
+        with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            total = int(response.headers.get('content-length', 0))
+            
+            if total == 0:
+                console.print("[bold red]No video stream found.[/bold red]")
+                return False
+
+            with open(temp_path, 'wb') as file, create_progress_bar(total) as bar:
+                progress = ThrottledProgress(bar)
+
+                try:
+                    if not copy_stream(response.iter_bytes(), file.write, progress, lambda: interrupt_handler.force_quit):
+                        console.print("\n[bold red]Force quitting... Saving partial download.[/bold red]")
+
+                except KeyboardInterrupt:
+                    if not interrupt_handler.force_quit:
+                        interrupt_handler.kill_download = True
+
+                finally:
+                    progress.flush()
+
+    return True
+
+
 def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = None):
     """
     Downloads an MP4 video with enhanced interrupt handling.
@@ -115,62 +204,32 @@ def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = No
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
     try:
-        with httpx.Client() as client:
-            with client.stream("GET", url, headers=headers) as response:
-                response.raise_for_status()
-                total = int(response.headers.get('content-length', 0))
-                
-                if total == 0:
-                    console.print("[bold red]No video stream found.[/bold red]")
-                    return None, False
-
-                # Create a fancy progress bar
-                progress_bar = tqdm(
-                    total=total,
-                    ascii='░▒█',
-                    bar_format=f"{Colors.YELLOW}[MP4]{Colors.WHITE}: "
-                               f"{Colors.RED}{{percentage:.2f}}% {Colors.MAGENTA}{{bar}} {Colors.WHITE}[ "
-                               f"{Colors.YELLOW}{{n_fmt}}{Colors.WHITE} / {Colors.RED}{{total_fmt}} {Colors.WHITE}] "
-                               f"{Colors.YELLOW}{{elapsed}} {Colors.WHITE}< {Colors.CYAN}{{remaining}}{Colors.WHITE}, "
-                               f"{Colors.YELLOW}{{rate_fmt}}{{postfix}} ",
-                    unit='iB',
-                    unit_scale=True,
-                    desc='Downloading',
-                    mininterval=0.05,
-                    file=sys.stdout                         # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.  
-                )
-
-                downloaded = 0
-                with open(temp_path, 'wb') as file, progress_bar as bar:
-                    try:
-                        for chunk in response.iter_bytes(chunk_size=1024):
-                            if interrupt_handler.force_quit:
-                                console.print("\n[bold red]Force quitting... Saving partial download.[/bold red]")
-                                break
-                            
-                            if chunk:
-                                size = file.write(chunk)
-                                downloaded += size
-                                bar.update(size)
-
-                    except KeyboardInterrupt:
-                        if not interrupt_handler.force_quit:
-                            interrupt_handler.kill_download = True
+        completed = download_segmented(url, headers, temp_path, interrupt_handler) if SEGMENTED_DOWNLOAD else None
+
+        if completed is False:
+            console.print("\n[bold yellow]Download stopped, run it again to resume from where it stopped.[/bold yellow]")
+            return None, True
+
+        if completed is None and not download_single(url, headers, temp_path, interrupt_handler):
+            return None, False
                     
         if os.path.exists(temp_path):
             os.rename(temp_path, path)
 
         if os.path.exists(path):
+            file_size = internet_manager.format_file_size(os.path.getsize(path))
+            duration = print_duration_table(path, description=False, return_string=True)
+
             console.print(Panel(
                 f"[bold green]Download completed{' (Partial)' if interrupt_handler.force_quit else ''}![/bold green]\n"
-                f"[cyan]File size: [bold red]{internet_manager.format_file_size(os.path.getsize(path))}[/bold red]\n"
-                f"[cyan]Duration: [bold]{print_duration_table(path, description=False, return_string=True)}[/bold]", 
+                f"[cyan]File size: [bold red]{file_size}[/bold red]\n"
+                f"[cyan]Duration: [bold]{duration}[/bold]", 
                 title=f"{os.path.basename(path.replace('.mp4', ''))}", 
                 border_style="green"
             ))
 
             if TELEGRAM_BOT:
-                message = f"Download completato{'(Parziale)' if interrupt_handler.force_quit else ''}\nDimensione: {internet_manager.format_file_size(os.path.getsize(path))}\nDurata: {print_duration_table(path, description=False, return_string=True)}\nTitolo: {os.path.basename(path.replace('.mp4', ''))}"
+                message = f"Download completato{'(Parziale)' if interrupt_handler.force_quit else ''}\nDimensione: {file_size}\nDurata: {duration}\nTitolo: {os.path.basename(path.replace('.mp4', ''))}"
                 clean_message = re.sub(r'\[[a-zA-Z]+\]', '', message)
                 bot.send_message(clean_message, None)
 
@@ -183,7 +242,9 @@ def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = No
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         console.print(f"[bold red]Unexpected Error: {e}[/bold red]")
-        if os.path.exists(temp_path):
+
+        # Keep the ranges downloaded so far, the next run resumes them
+        if os.path.exists(temp_path) and not os.path.exists(f"{temp_path}.ranges"):
             os.remove(temp_path)
         return None, interrupt_handler.kill_download
     
@@ -0,0 +1,266 @@
+# 18.10.26
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+
+# External libraries
+import httpx
+from tqdm import tqdm
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Logic class
+from .stream import ThrottledProgress, copy_stream
+
+
+# Config
+REQUEST_MAX_RETRY = config_manager.get_int('REQUESTS', 'max_retry')
+CONNECTIONS = max(1, config_manager.get_int('MP4_DOWNLOAD', 'connections'))
+MIN_RANGE_SIZE = max(1, config_manager.get_int('MP4_DOWNLOAD', 'min_range_mb')) * 1024 * 1024
+STATE_SAVE_INTERVAL = 1.0
+
+
+def probe_ranges(client: httpx.Client, url: str, headers: dict) -> Tuple[int, bool, Dict[str, str]]:
+    """
+    Ask for the first byte of the file to learn its size, whether the server honours byte ranges
+    and the validators (ETag, Last-Modified) that tell if the file changes between runs.
+
+    Parameters:
+        - client (httpx.Client): Client used for the download.
+        - url (str): Url of the file.
+        - headers (dict): Headers of the download.
+
+    Returns:
+        Tuple[int, bool, dict]: Total size in bytes (0 if unknown), True if ranges are supported
+                                and the validators sent by the server ('etag', 'last_modified').
+    """
+    with client.stream("GET", url, headers={**headers, 'Range': 'bytes=0-0'}) as response:
+        response.raise_for_status()
+        validators = {name: response.headers[header] for name, header in (('etag', 'etag'), ('last_modified', 'last-modified')) if header in response.headers}
+
+        if response.status_code == 206:
+            match = re.match(r'bytes\s+\d+-\d+/(\d+)', response.headers.get('content-range', ''))
+            if match:
+                return int(match.group(1)), True, validators
+
+        return int(response.headers.get('content-length', 0)), False, validators
+
+
+class MP4_Ranges:
+    def __init__(self, client: httpx.Client, url: str, headers: dict, temp_path: str, total: int, validators: Optional[Dict[str, str]] = None):
+        """
+        Initialize the MP4_Ranges object.
+
+        Downloads a file as N byte ranges in parallel, each written at its own offset of a
+        preallocated file. Progress of every range is saved to `<temp_path>.ranges`, so an
+        interrupted download restarts where each range stopped, unless the file changed on the server.
+
+        Parameters:
+            - client (httpx.Client): Client used for the download, with room for `connections` requests.
+            - url (str): Url of the file.
+            - headers (dict): Headers of the download.
+            - temp_path (str): File the content is written to.
+            - total (int): Size of the file in bytes.
+            - validators (dict): ETag and Last-Modified of the file, from `probe_ranges`.
+        """
+        self.client = client
+        self.url = url
+        self.headers = headers
+        self.temp_path = temp_path
+        self.state_path = f"{temp_path}.ranges"
+        self.total = total
+        self.validators = validators or {}
+        self.ranges: List[List[int]] = []      # [start, end (inclusive), bytes done]
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.fd = None
+
+    @staticmethod
+    def split(total: int, connections: int = CONNECTIONS) -> List[List[int]]:
+        """
+        Split `total` bytes in at most `connections` ranges of at least `min_range_mb`.
+        """
+        count = max(1, min(connections, total // MIN_RANGE_SIZE))
+        size = -(-total // count)
+        return [[start, min(start + size, total) - 1, 0] for start in range(0, total, size)]
+
+    def _load_state(self) -> bool:
+        """
+        Load the ranges of a previous run, if they belong to the same file.
+        """
+        if not os.path.exists(self.state_path) or not os.path.exists(self.temp_path):
+            return False
+
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+
+            if state.get('total') != self.total or os.path.getsize(self.temp_path) != self.total:
+                return False
+
+            # Same size but a different file: the bytes already written can't be reused
+            if state.get('validators', {}) != self.validators:
+                logging.info(f"{self.url} changed since the last run, download from scratch")
+                return False
+
+            self.ranges = [list(r) for r in state['ranges']]
+            return True
+
+        except Exception as e:
+            logging.error(f"Can't read ranges state {self.state_path}: {e}")
+            return False
+
+    def _save_state(self) -> None:
+        """Atomically save the progress of every range."""
+        with self.lock:
+            state = {'url': self.url, 'total': self.total, 'validators': self.validators, 'ranges': self.ranges}
+
+        tmp_state = f"{self.state_path}.tmp"
+        with open(tmp_state, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_state, self.state_path)
+
+    @property
+    def downloaded(self) -> int:
+        """Bytes already written."""
+        with self.lock:
+            return sum(r[2] for r in self.ranges)
+
+    @property
+    def completed(self) -> bool:
+        """True once every range has been fully written."""
+        with self.lock:
+            return all(r[0] + r[2] > r[1] for r in self.ranges)
+
+    def _if_range(self) -> Dict[str, str]:
+        """
+        If-Range header, so a file changed during the download is answered with 200 instead of the range.
+        """
+        etag = self.validators.get('etag')
+        if etag and not etag.startswith('W/'):
+            return {'If-Range': etag}
+
+        if 'last_modified' in self.validators:
+            return {'If-Range': self.validators['last_modified']}
+        return {}
+
+    def _write_at(self, data: bytes, offset: int) -> None:
+        """
+        Write `data` at `offset` of the output file, without moving a shared file position.
+        """
+        if hasattr(os, 'pwrite'):
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(self.fd, view, offset)
+                view = view[written:]
+                offset += written
+        else:
+            with self.lock:
+                os.lseek(self.fd, offset, os.SEEK_SET)
+                os.write(self.fd, data)
+
+    def _download_range(self, position: int, progress: ThrottledProgress) -> None:
+        """
+        Fetch what is missing of range `position`, retrying from the last byte written.
+        """
+        for attempt in range(REQUEST_MAX_RETRY):
+            start, end, done = self.ranges[position]
+            if start + done > end or self.stop_event.is_set():
+                return
+
+            try:
+                range_headers = {**self.headers, **self._if_range(), 'Range': f'bytes={start + done}-{end}'}
+                with self.client.stream("GET", self.url, headers=range_headers) as response:
+                    response.raise_for_status()
+
+                    if response.status_code != 206:
+                        raise ValueError(f"Server ignored the range request (status {response.status_code})")
+
+                    def write(data: memoryview) -> None:
+                        nonlocal done
+                        data = data[:end + 1 - (start + done)]
+                        self._write_at(data, start + done)
+                        done += len(data)
+
+                        with self.lock:
+                            self.ranges[position][2] = done
+
+                    if not copy_stream(response.iter_bytes(), write, progress, self.stop_event.is_set):
+                        return
+
+                if start + done > end:
+                    return
+                raise ValueError(f"Range {start}-{end} closed early at {start + done}")
+
+            except Exception as e:
+                if attempt + 1 == REQUEST_MAX_RETRY:
+                    raise
+
+                logging.info(f"Attempt {attempt + 1} failed for range {start}-{end}: {e}")
+                time.sleep(1.1 * (2 ** attempt))
+
+    def download(self, progress_bar: tqdm, should_stop) -> bool:
+        """
+        Download every range, resuming the previous run when possible.
+
+        Parameters:
+            - progress_bar (tqdm): Progress bar in bytes.
+            - should_stop (Callable): Returns True when the download must stop (force quit).
+
+        Returns:
+            bool: True if the file is complete, False if it was stopped and can be resumed.
+        """
+        if not self._load_state():
+            self.ranges = self.split(self.total)
+
+            # Preallocate, the file stays sparse where supported
+            with open(self.temp_path, 'wb') as f:
+                f.truncate(self.total)
+
+        progress = ThrottledProgress(progress_bar)
+        resumed = self.downloaded
+        if resumed:
+            logging.info(f"Resume {self.temp_path} from {resumed} bytes")
+            progress_bar.update(resumed)
+
+        self._save_state()
+        self.fd = os.open(self.temp_path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.ranges)) as executor:
+                futures = [executor.submit(self._download_range, position, progress) for position in range(len(self.ranges))]
+                last_save = time.monotonic()
+
+                while wait(futures, timeout=0.25).not_done:
+                    if should_stop():
+                        self.stop_event.set()
+
+                    if time.monotonic() - last_save >= STATE_SAVE_INTERVAL:
+                        self._save_state()
+                        last_save = time.monotonic()
+
+                # Surface the first range that failed
+                for future in futures:
+                    future.result()
+
+        finally:
+            progress.flush()
+            os.close(self.fd)
+            self.fd = None
+            self._save_state()
+
+        if self.completed:
+            os.remove(self.state_path)
+            return True
+
+        return False
@@ -0,0 +1,110 @@
+# 18.10.26
+
+import time
+import threading
+from typing import Callable, Iterable
+
+
+# External libraries
+from tqdm import tqdm
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+CHUNK_SIZE = max(64 * 1024, int(config_manager.get_float('MP4_DOWNLOAD', 'chunk_size_mb') * 1024 * 1024))
+PROGRESS_INTERVAL = config_manager.get_float('MP4_DOWNLOAD', 'progress_interval')
+
+
+class ThrottledProgress:
+    def __init__(self, progress_bar: tqdm, interval: float = PROGRESS_INTERVAL):
+        """
+        Initialize the ThrottledProgress object.
+
+        Accumulates the bytes received and forwards them to tqdm at most once every `interval` seconds,
+        instead of once per network chunk. Safe to share between threads.
+
+        Parameters:
+            - progress_bar (tqdm): Progress bar in bytes.
+            - interval (float): Seconds between two updates of the bar.
+        """
+        self.progress_bar = progress_bar
+        self.interval = interval
+        self.pending = 0
+        self.last_update = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, size: int) -> bool:
+        """
+        Account `size` bytes.
+
+        Returns:
+            bool: True if the bar has just been refreshed, a good moment for the caller's periodic checks.
+        """
+        with self.lock:
+            self.pending += size
+            now = time.monotonic()
+
+            if now - self.last_update < self.interval:
+                return False
+
+            self.progress_bar.update(self.pending)
+            self.pending = 0
+            self.last_update = now
+            return True
+
+    def flush(self) -> None:
+        """Forward the bytes not shown yet."""
+        with self.lock:
+            if self.pending:
+                self.progress_bar.update(self.pending)
+                self.pending = 0
+
+
+def copy_stream(chunks: Iterable[bytes], write: Callable[[memoryview], None], progress: ThrottledProgress, should_stop: Callable[[], bool], chunk_size: int = CHUNK_SIZE) -> bool:
+    """
+    Copy a response body to `write` through a single reused buffer of `chunk_size` bytes,
+    so the file sees few large writes whatever the size of the network chunks.
+
+    Parameters:
+        - chunks (Iterable[bytes]): Body of the response, e.g. `response.iter_bytes()`.
+        - write (Callable): Receives each full buffer (a memoryview valid only during the call).
+        - progress (ThrottledProgress): Progress accounting.
+        - should_stop (Callable): Checked on every progress refresh, stops the copy when True.
+        - chunk_size (int): Size of the buffer.
+
+    Returns:
+        bool: False if the copy was stopped by `should_stop`.
+    """
+    buffer = bytearray(chunk_size)
+    filled = 0
+
+    with memoryview(buffer) as view:
+        for chunk in chunks:
+            data = memoryview(chunk)
+
+            # Large chunks skip the buffer when it is empty
+            if not filled and len(data) >= chunk_size:
+                write(data)
+            else:
+                while data:
+                    size = min(chunk_size - filled, len(data))
+                    view[filled:filled + size] = data[:size]
+                    filled += size
+                    data = data[size:]
+
+                    if filled == chunk_size:
+                        write(view)
+                        filled = 0
+
+            if progress.update(len(chunk)) and should_stop():
+                if filled:
+                    write(view[:filled])
+                return False
+
+        if filled:
+            write(view[:filled])
+
+    return True
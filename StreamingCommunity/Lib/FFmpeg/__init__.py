@@ -1,4 +1,5 @@
 # 18.04.24
 
-from .command import join_video, join_audios, join_subtitle
+from .command import join_video, join_audios, join_subtitle, join_all, start_remux, finish_remux
+from .scheduler import postprocess_scheduler
 from .util import print_duration_table, get_video_duration
\ No newline at end of file
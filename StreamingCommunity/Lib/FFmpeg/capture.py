@@ -4,6 +4,7 @@ import re
 import logging
 import threading
 import subprocess
+from typing import Callable, Optional
 
 
 # External library
@@ -16,16 +17,17 @@ from StreamingCommunity.Util.os import internet_manager
 
 # Variable
 console = Console()
-terminate_flag = threading.Event()
 
 
-def capture_output(process: subprocess.Popen, description: str) -> None:
+def capture_output(process: subprocess.Popen, description: str, terminate_flag: threading.Event, on_progress: Optional[Callable[[dict], None]] = None) -> None:
     """
     Function to capture and print output from a subprocess.
 
     Parameters:
         - process (subprocess.Popen): The subprocess whose output is captured.
         - description (str): Description of the command being executed.
+        - terminate_flag (threading.Event): Set once the process has exited.
+        - on_progress (Callable): Receives each parsed progress line (with 'bytes') instead of printing it.
     """
     try:
         max_length = 0
@@ -55,6 +57,9 @@ def capture_output(process: subprocess.Popen, description: str) -> None:
                         else:
                             byte_size = int(re.findall(r'\d+', data.get('size', '0'))[0]) * 1000
 
+                        if on_progress is not None:
+                            on_progress({**data, 'bytes': byte_size})
+                            continue
 
                         # Construct the progress string with formatted output information
                         progress_string = (f" {description}[white]: "
@@ -124,18 +129,20 @@ def terminate_process(process):
         logging.error(f"Failed to terminate process: {e}")
 
 
-def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
+def capture_ffmpeg_real_time(ffmpeg_command: list, description: str, on_progress: Optional[Callable[[dict], None]] = None) -> Optional[int]:
     """
     Function to capture real-time output from ffmpeg process.
 
     Parameters:
         - ffmpeg_command (list): The command to execute ffmpeg.
         - description (str): Description of the command being executed.
-    """
-    global terminate_flag
+        - on_progress (Callable): Receives each parsed progress line instead of printing it.
 
-    # Clear the terminate_flag before starting a new capture
-    terminate_flag.clear()
+    Returns:
+        int: Exit code of ffmpeg, None if it could not be started.
+    """
+    # One flag for each capture, several ffmpeg processes can run at the same time
+    terminate_flag = threading.Event()
 
     try:
 
@@ -143,7 +150,7 @@ def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
         process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
 
         # Start a thread to capture and print output
-        output_thread = threading.Thread(target=capture_output, args=(process, description))
+        output_thread = threading.Thread(target=capture_output, args=(process, description, terminate_flag, on_progress))
         output_thread.start()
 
         try:
@@ -160,5 +167,8 @@ def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
             terminate_flag.set()
             output_thread.join()
 
+        return process.returncode
+
     except Exception as e:
-        logging.error(f"Failed to start ffmpeg process: {e}")
\ No newline at end of file
+        logging.error(f"Failed to start ffmpeg process: {e}")
+        return None
\ No newline at end of file
@@ -1,5 +1,6 @@
 # 31.01.24
 
+import os
 import sys
 import logging
 import subprocess
@@ -18,6 +19,7 @@ from StreamingCommunity.Util.os import os_manager, suppress_output, get_ffmpeg_p
 # Logic class
 from .util import need_to_force_to_ts, check_duration_v_a
 from .capture import capture_ffmpeg_real_time
+from .scheduler import current_job
 from ..M3U8 import M3U8_Codec
 
 
@@ -91,7 +93,40 @@ def select_subtitle_encoder() -> Optional[str]:
     return None
 
 
-def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
+def run_ffmpeg(ffmpeg_cmd: list, description: str, check: bool = False) -> Optional[int]:
+    """
+    Runs an FFmpeg command showing its progress, inside a post-processing job the progress
+    is reported to the job instead of the console.
+
+    Parameters:
+        - ffmpeg_cmd (list): The command to execute.
+        - description (str): Name of the step, e.g. 'Join video'.
+        - check (bool): In debug mode, raise if FFmpeg fails.
+
+    Returns:
+        int: Exit code of ffmpeg, None if it could not be started.
+    """
+    job = current_job()
+    if job is not None:
+        return capture_ffmpeg_real_time(ffmpeg_cmd, f"[cyan]{description}", on_progress=job.update)
+
+    if DEBUG_MODE:
+        return subprocess.run(ffmpeg_cmd, check=check).returncode
+
+    if get_use_large_bar():
+        return_code = capture_ffmpeg_real_time(ffmpeg_cmd, f"[cyan]{description}")
+        print()
+
+    else:
+        console.log(f"[purple]FFmpeg [white][[cyan]{description}[white]] ...")
+        with suppress_output():
+            return_code = capture_ffmpeg_real_time(ffmpeg_cmd, f"[cyan]{description}")
+            print()
+
+    return return_code
+
+
+def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None, input_format: str = None):
     """
     Joins single ts video file to mp4
     
@@ -99,6 +134,7 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
         - video_path (str): The path to the video file.
         - out_path (str): The path to save the output file.
         - codec (M3U8_Codec): The video codec to use. Defaults to 'copy'.
+        - input_format (str): Container detected while downloading, skips probing the file.
     """
     ffmpeg_cmd = [get_ffmpeg_path()]
 
@@ -107,7 +143,10 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
         ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
 
     # Add mpegts to force to detect input file as ts file
-    if need_to_force_to_ts(video_path):
+    if input_format:
+        ffmpeg_cmd.extend(['-f', input_format])
+
+    elif need_to_force_to_ts(video_path):
         #console.log("[red]Force input file to 'mpegts'.")
         ffmpeg_cmd.extend(['-f', 'mpegts'])
         vcodec = "libx264"
@@ -153,61 +192,90 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
     ffmpeg_cmd += [out_path, "-y"]
 
     # Run join
-    if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
-    else:
-
-        if get_use_large_bar():
-            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join video")
-            print()
-
-        else:
-            console.log(f"[purple]FFmpeg [white][[cyan]Join video[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join video")
-                print()
+    run_ffmpeg(ffmpeg_cmd, "Join video", check=True)
 
     return out_path
 
 
-def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None):
+def start_remux(out_path: str, log_path: str) -> subprocess.Popen:
     """
-    Joins audio tracks with a video file using FFmpeg.
-    
+    Starts FFmpeg remuxing an MPEG-TS stream written to its stdin into an mp4, streams are copied.
+    Segments can be piped while they are downloaded, so no intermediate ts file is written.
+
     Parameters:
-        - video_path (str): The path to the video file.
-        - audio_tracks (list[dict[str, str]]): A list of dictionaries containing information about audio tracks.
-            Each dictionary should contain the 'path' key with the path to the audio file.
         - out_path (str): The path to save the output file.
+        - log_path (str): File receiving the FFmpeg log, read back if the remux fails.
+
+    Returns:
+        subprocess.Popen: The FFmpeg process, write the stream to its unbuffered `stdin`.
     """
-    video_audio_same_duration, duration_diff = check_duration_v_a(video_path, audio_tracks[0].get('path'))
+    ffmpeg_cmd = [
+        get_ffmpeg_path(), '-loglevel', DEBUG_FFMPEG, '-nostats',
+        '-f', 'mpegts', '-i', 'pipe:0',
+        '-c', 'copy',
+        out_path, '-y'
+    ]
+    logging.info(f"FFmpeg command: {ffmpeg_cmd}")
 
-    # Start command with locate ffmpeg
-    ffmpeg_cmd = [get_ffmpeg_path()]
+    with open(log_path, 'wb') as log_file:
+        return subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=log_file, bufsize=0)
 
-    # Enabled the use of gpu
-    if USE_GPU:
-        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
 
-    # Insert input video path
-    ffmpeg_cmd.extend(['-i', video_path])
+def finish_remux(process: subprocess.Popen, log_path: str, timeout: float = 120) -> bool:
+    """
+    Waits for a remux started by `start_remux` once its stdin is closed.
 
-    # Add audio tracks as input
-    for i, audio_track in enumerate(audio_tracks):
-        if os_manager.check_file(audio_track.get('path')):
-            ffmpeg_cmd.extend(['-i', audio_track.get('path')])
-        else:
-            logging.error(f"Skip audio join: {audio_track.get('path')} dont exist")
+    Parameters:
+        - process (subprocess.Popen): The FFmpeg process.
+        - log_path (str): File with the FFmpeg log.
+        - timeout (float): Seconds to wait for FFmpeg to finalize the file.
 
-    # Map the video and audio streams
-    ffmpeg_cmd.append('-map')
-    ffmpeg_cmd.append('0:v')            # Map video stream from the first input (video_path)
-    
-    for i in range(1, len(audio_tracks) + 1):
-        ffmpeg_cmd.append('-map')
-        ffmpeg_cmd.append(f'{i}:a')     # Map audio streams from subsequent inputs
+    Returns:
+        bool: True if FFmpeg completed the file.
+    """
+    try:
+        if process.stdin and not process.stdin.closed:
+            process.stdin.close()
+        process.wait(timeout=timeout)
 
-    # Add output Parameters
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.error(f"Remux did not complete: {e}")
+        process.kill()
+        process.wait()
+
+    if process.returncode != 0:
+        try:
+            with open(log_path, 'r', errors='replace') as f:
+                logging.error(f"Remux failed ({process.returncode}): {f.read()[-2000:]}")
+        except OSError:
+            logging.error(f"Remux failed ({process.returncode})")
+        return False
+
+    return True
+
+
+def input_arguments(path: str, input_format: str = None) -> List[str]:
+    """
+    Arguments of an FFmpeg input, with `-f` when the container is already known.
+
+    Parameters:
+        - path (str): The path of the input file.
+        - input_format (str): FFmpeg input format, None to let FFmpeg detect it.
+    """
+    if input_format:
+        return ['-f', input_format, '-i', path]
+    return ['-i', path]
+
+
+def add_codec_arguments(ffmpeg_cmd: list, codec: M3U8_Codec, caller: str) -> None:
+    """
+    Appends the video/audio codec, bitrate and preset options of a join.
+
+    Parameters:
+        - ffmpeg_cmd (list): The command being built.
+        - codec (M3U8_Codec): Codec of the stream, used when `use_codec` is enabled.
+        - caller (str): Name of the join, for the log.
+    """
     if USE_CODEC:
         if USE_VCODEC:
             if codec.video_codec_name: 
@@ -216,7 +284,7 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
                 else: 
                     ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
             else: 
-                console.log("[red]Cant find vcodec for 'join_audios'")
+                console.log(f"[red]Cant find vcodec for '{caller}'")
         else:
             if USE_GPU:
                 ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
@@ -225,7 +293,7 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
             if codec.audio_codec_name: 
                 ffmpeg_cmd.extend(['-c:a', codec.audio_codec_name])
             else: 
-                console.log("[red]Cant find acodec for 'join_audios'")
+                console.log(f"[red]Cant find acodec for '{caller}'")
 
         if USE_BITRATE:
             ffmpeg_cmd.extend(['-b:v',  f'{codec.video_bitrate // 1000}k'])
@@ -240,6 +308,49 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
     else:
         ffmpeg_cmd.extend(['-preset', 'fast'])
 
+
+def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None, video_format: str = None):
+    """
+    Joins audio tracks with a video file using FFmpeg.
+    
+    Parameters:
+        - video_path (str): The path to the video file.
+        - audio_tracks (list[dict[str, str]]): A list of dictionaries containing information about audio tracks.
+            Each dictionary should contain the 'path' key with the path to the audio file,
+            and optionally the 'format' key with the container detected while downloading.
+        - out_path (str): The path to save the output file.
+        - video_format (str): Container of the video detected while downloading.
+    """
+    video_audio_same_duration, duration_diff = check_duration_v_a(video_path, audio_tracks[0].get('path'))
+
+    # Start command with locate ffmpeg
+    ffmpeg_cmd = [get_ffmpeg_path()]
+
+    # Enabled the use of gpu
+    if USE_GPU:
+        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
+
+    # Insert input video path
+    ffmpeg_cmd.extend(input_arguments(video_path, video_format))
+
+    # Add audio tracks as input
+    for i, audio_track in enumerate(audio_tracks):
+        if os_manager.check_file(audio_track.get('path')):
+            ffmpeg_cmd.extend(input_arguments(audio_track.get('path'), audio_track.get('format')))
+        else:
+            logging.error(f"Skip audio join: {audio_track.get('path')} dont exist")
+
+    # Map the video and audio streams
+    ffmpeg_cmd.append('-map')
+    ffmpeg_cmd.append('0:v')            # Map video stream from the first input (video_path)
+    
+    for i in range(1, len(audio_tracks) + 1):
+        ffmpeg_cmd.append('-map')
+        ffmpeg_cmd.append(f'{i}:a')     # Map audio streams from subsequent inputs
+
+    # Add output Parameters
+    add_codec_arguments(ffmpeg_cmd, codec, 'join_audios')
+
     # Use shortest input path for video and audios
     if not video_audio_same_duration:
         console.log(f"[red]Use shortest input (Duration difference: {duration_diff:.2f} seconds)...")
@@ -249,19 +360,7 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
     ffmpeg_cmd += [out_path, "-y"]
 
     # Run join
-    if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
-    else:
-
-        if get_use_large_bar():
-            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join audio")
-            print()
-
-        else:
-            console.log(f"[purple]FFmpeg [white][[cyan]Join audio[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join audio")
-                print()
+    run_ffmpeg(ffmpeg_cmd, "Join audio", check=True)
 
     return out_path
 
@@ -304,18 +403,80 @@ def join_subtitle(video_path: str, subtitles_list: List[Dict[str, str]], out_pat
     logging.info(f"FFmpeg command: {ffmpeg_cmd}")
 
     # Run join
-    if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
+    run_ffmpeg(ffmpeg_cmd, "Join subtitle", check=True)
 
-    else:
-        if get_use_large_bar():
-            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join subtitle")
-            print()
+    return out_path
 
-        else:
-            console.log(f"[purple]FFmpeg [white][[cyan]Join subtitle[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join subtitle")
-                print()
 
-    return out_path
\ No newline at end of file
+def join_all(video_path: str, audio_tracks: List[Dict[str, str]], subtitles_list: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None, video_format: str = None) -> Optional[str]:
+    """
+    Joins audio tracks and subtitles with a video file in a single FFmpeg pass,
+    instead of `join_audios` followed by `join_subtitle` rewriting the whole file twice.
+    
+    Parameters:
+        - video_path (str): The path to the video file.
+        - audio_tracks (list[dict[str, str]]): Audio tracks, each with the 'path' key and optionally 'format'.
+        - subtitles_list (list[dict[str, str]]): Subtitles, each with the 'path' and 'language' keys.
+        - out_path (str): The path to save the output file.
+        - codec (M3U8_Codec): The codec of the stream, used when `use_codec` is enabled.
+        - video_format (str): Container of the video detected while downloading.
+
+    Returns:
+        str: `out_path`, or None if the single pass is not possible or fails and the joins must run one by one.
+    """
+    subtitle_encoder = select_subtitle_encoder()
+    if subtitle_encoder is None:
+        return None
+
+    audio_tracks = [track for track in audio_tracks if os_manager.check_file(track.get('path'))]
+    subtitles_list = [subtitle for subtitle in subtitles_list if os_manager.check_file(subtitle.get('path'))]
+    if not audio_tracks:
+        return None
+
+    video_audio_same_duration, duration_diff = check_duration_v_a(video_path, audio_tracks[0].get('path'))
+
+    ffmpeg_cmd = [get_ffmpeg_path()]
+
+    # Enabled the use of gpu
+    if USE_GPU:
+        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
+
+    # Inputs: video, audios, subtitles
+    ffmpeg_cmd.extend(input_arguments(video_path, video_format))
+    for track in audio_tracks:
+        ffmpeg_cmd.extend(input_arguments(track['path'], track.get('format')))
+    for subtitle in subtitles_list:
+        ffmpeg_cmd.extend(['-i', subtitle['path']])
+
+    # Map video of the first input, then every audio and subtitle input
+    ffmpeg_cmd.extend(['-map', '0:v'])
+    for i in range(1, len(audio_tracks) + 1):
+        ffmpeg_cmd.extend(['-map', f'{i}:a'])
+
+    for idx, subtitle in enumerate(subtitles_list):
+        ffmpeg_cmd.extend(['-map', f'{len(audio_tracks) + 1 + idx}:s'])
+        ffmpeg_cmd.extend([f'-metadata:s:s:{idx}', f"title={subtitle['language']}"])
+
+    # Add output Parameters
+    add_codec_arguments(ffmpeg_cmd, codec, 'join_all')
+    ffmpeg_cmd.extend(['-c:s', subtitle_encoder])
+
+    # Use shortest input path for video and audios
+    if not video_audio_same_duration:
+        console.log(f"[red]Use shortest input (Duration difference: {duration_diff:.2f} seconds)...")
+        ffmpeg_cmd.extend(['-shortest', '-strict', 'experimental'])
+
+    # Overwrite
+    ffmpeg_cmd += [out_path, "-y"]
+    logging.info(f"FFmpeg command: {ffmpeg_cmd}")
+
+    # Run join
+    return_code = run_ffmpeg(ffmpeg_cmd, "Join audio and subtitle")
+
+    if return_code != 0 or not os.path.exists(out_path):
+        logging.error(f"Single pass join failed ({return_code}), joining audio and subtitles one at a time")
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        return None
+
+    return out_path
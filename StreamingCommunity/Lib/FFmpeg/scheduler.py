@@ -0,0 +1,191 @@
+# 18.10.26
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, List, Optional
+
+
+# External library
+from rich.console import Console
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.os import internet_manager
+from StreamingCommunity.Util.metrics import metrics_registry
+
+
+# Config
+POSTPROCESS_WORKERS = config_manager.get_int('M3U8_CONVERSION', 'postprocess_workers')
+
+
+# Variable
+console = Console()
+_current = threading.local()
+JOBS = metrics_registry.gauge('ffmpeg_postprocess_jobs', 'Post-processing jobs by state')
+JOB_TIME = metrics_registry.histogram('ffmpeg_postprocess_seconds', 'Time spent running a post-processing job', buckets=(1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+
+
+def current_job() -> Optional['PostProcessJob']:
+    """Job run by the calling thread, None outside the post-processing workers."""
+    return getattr(_current, 'job', None)
+
+
+class PostProcessJob:
+    def __init__(self, name: str, func: Callable, args: tuple, kwargs: dict):
+        """
+        One merge/remux job run by the scheduler.
+
+        Parameters:
+            - name (str): Shown in the progress and in the logs, usually the output file name.
+            - func (Callable): Work to run, its FFmpeg commands report progress to this job.
+            - args (tuple), kwargs (dict): Arguments of `func`.
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def update(self, data: dict) -> None:
+        """Last progress line of the running FFmpeg command, parsed by the capture parser."""
+        with self.lock:
+            self.progress = data
+
+    def describe(self) -> str:
+        """One line status: name, state and the FFmpeg speed/size of the current step."""
+        with self.lock:
+            progress = dict(self.progress)
+
+        line = f"[cyan]{self.name}[white]: [yellow]{self.status}"
+        if progress and self.status == 'running':
+            line += (f"[white] ([green]'time': [yellow]{progress.get('time', 'N/A')}[white], "
+                     f"[green]'speed': [yellow]{progress.get('speed', 'N/A')}[white], "
+                     f"[green]'size': [yellow]{internet_manager.format_file_size(progress.get('bytes', 0))}[white])")
+        return line
+
+    def run(self):
+        _current.job = self
+        self.status = 'running'
+        self.started = time.monotonic()
+
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+            self.status = 'done'
+            return self.result
+
+        except Exception as e:
+            self.status = 'failed'
+            self.error = str(e)
+            logging.error(f"Post-processing of {self.name} failed", exc_info=True)
+
+        finally:
+            self.finished = time.monotonic()
+            JOB_TIME.observe(self.finished - self.started, status=self.status)
+            _current.job = None
+
+
+class PostProcessScheduler:
+    def __init__(self, workers: int = POSTPROCESS_WORKERS):
+        """
+        Runs merge/remux jobs in background so the next download starts while FFmpeg is still working.
+
+        Each worker drives one FFmpeg process, at most `workers` run at once. Submitting blocks when
+        `workers` more jobs are already waiting, bounding the temporary folders kept on disk.
+
+        Parameters:
+            - workers (int): FFmpeg jobs running at the same time, 0 runs them inline.
+        """
+        self.workers = max(0, workers)
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.slots = threading.BoundedSemaphore(self.workers * 2) if self.workers else None
+        self.jobs: List[PostProcessJob] = []
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _update_metrics(self) -> None:
+        with self.lock:
+            jobs = list(self.jobs)
+        for status in ('queued', 'running'):
+            JOBS.set(sum(1 for job in jobs if job.status == status), status=status)
+
+    def _job_done(self, job: PostProcessJob) -> None:
+        self.slots.release()
+        self._update_metrics()
+        if job.status == 'failed':
+            console.print(f"[red]Post-processing of {job.name} failed: {job.error}")
+
+    def submit(self, name: str, func: Callable, *args, **kwargs) -> PostProcessJob:
+        """
+        Queue `func(*args, **kwargs)` on the worker pool.
+
+        Parameters:
+            - name (str): Name of the job.
+            - func (Callable): Work to run.
+
+        Returns:
+            PostProcessJob: The queued job, its `future` resolves to the result of `func`.
+        """
+        if not self.enabled:
+            raise RuntimeError("Post-processing scheduler is disabled")
+
+        job = PostProcessJob(name, func, args, kwargs)
+        self.slots.acquire()
+
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='postprocess')
+            self.jobs.append(job)
+            job.future = self.executor.submit(job.run)
+
+        job.future.add_done_callback(lambda _: self._job_done(job))
+        self._update_metrics()
+        logging.info(f"Post-processing queued: {name}")
+        return job
+
+    def pending(self) -> List[PostProcessJob]:
+        with self.lock:
+            return [job for job in self.jobs if not job.future.done()]
+
+    def wait_all(self, interval: float = 0.5) -> List[PostProcessJob]:
+        """
+        Blocks until every queued job has finished, printing the progress of the running ones.
+
+        Returns:
+            List[PostProcessJob]: Jobs completed since the last call.
+        """
+        pending = self.pending()
+        if pending:
+            console.print(f"\n[cyan]Waiting for [red]{len(pending)} [cyan]post-processing job(s) ...")
+
+        max_length = 0
+        while pending:
+            wait([job.future for job in pending], timeout=interval, return_when=FIRST_COMPLETED)
+
+            line = " | ".join(job.describe() for job in pending if job.status == 'running')
+            max_length = max(max_length, len(line))
+            console.print(line.ljust(max_length), end="\r")
+            pending = self.pending()
+
+        with self.lock:
+            finished, self.jobs = self.jobs, []
+
+        if max_length:
+            print()
+        return finished
+
+
+postprocess_scheduler = PostProcessScheduler()
@@ -1,6 +1,10 @@
 # 02.04.24
 
+from .container import detect_container
+from .controller import M3U8_Worker_Controller, M3U8_Connection_Budget
 from .decryptor import M3U8_Decryption
 from .estimator import M3U8_Ts_Estimator
+from .journal import M3U8_Journal
+from .metrics import M3U8_Metrics
 from .parser import M3U8_Parser, M3U8_Codec
 from .url_fixer import M3U8_UrlFix
\ No newline at end of file
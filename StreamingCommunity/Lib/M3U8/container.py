@@ -0,0 +1,117 @@
+# 18.10.26
+
+import struct
+from typing import Optional, Tuple
+
+
+# Costant
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+TS_SYNC_PACKETS = 3
+MP4_BOXES = (b'ftyp', b'styp', b'moof', b'moov', b'sidx', b'mdat', b'emsg')
+MAX_PREFIX_SEARCH = 64 * 1024
+ID3_HEADER_SIZE = 10
+
+
+def _is_ts_at(data, offset: int) -> bool:
+    """True if there is an MPEG-TS sync byte at `offset` and every 188 bytes after it (up to 3 packets)."""
+    packets = min(TS_SYNC_PACKETS, (len(data) - offset + TS_PACKET_SIZE - 1) // TS_PACKET_SIZE)
+    if packets <= 0:
+        return False
+    return all(data[offset + i * TS_PACKET_SIZE] == TS_SYNC_BYTE for i in range(packets))
+
+
+def _png_end(data) -> Optional[int]:
+    """Offset just after the IEND chunk of a PNG at the start of `data`, None if it is truncated."""
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, = struct.unpack_from('>I', data, offset)
+        chunk_type = bytes(data[offset + 4:offset + 8])
+        offset += 12 + length
+
+        if chunk_type == b'IEND':
+            return offset if offset <= len(data) else None
+
+    return None
+
+
+def _find_ts_start(data, start: int) -> Optional[int]:
+    """First offset from `start` where MPEG-TS packets begin, looking at most `MAX_PREFIX_SEARCH` bytes ahead."""
+    view = bytes(data[start:start + MAX_PREFIX_SEARCH + TS_PACKET_SIZE * TS_SYNC_PACKETS])
+    position = view.find(TS_SYNC_BYTE)
+
+    while position != -1 and position <= MAX_PREFIX_SEARCH:
+        if _is_ts_at(data, start + position):
+            return start + position
+        position = view.find(TS_SYNC_BYTE, position + 1)
+
+    return None
+
+
+def _skip_id3(data) -> int:
+    """Offset just after the ID3v2 tags at the start of `data` (their size is a 28 bit syncsafe integer)."""
+    offset = 0
+    while len(data) >= offset + ID3_HEADER_SIZE and bytes(data[offset:offset + 3]) == b'ID3':
+        flags = data[offset + 5]
+        size = 0
+        for byte in data[offset + 6:offset + 10]:
+            size = (size << 7) | (byte & 0x7F)
+
+        offset += ID3_HEADER_SIZE + size + (ID3_HEADER_SIZE if flags & 0x10 else 0)
+
+    return offset
+
+
+def _audio_format(data, offset: int) -> Optional[str]:
+    """FFmpeg input format of the packed audio frame at `offset`, None if the sync word is not recognised."""
+    if len(data) < offset + 2:
+        return None
+    first, second = data[offset], data[offset + 1]
+
+    # ADTS: 12 bit sync word, layer 00
+    if first == 0xFF and (second & 0xF6) == 0xF0:
+        return 'aac'
+
+    # MPEG audio: 11 bit sync word, layer 00 is reserved
+    if first == 0xFF and (second & 0xE0) == 0xE0 and (second & 0x06):
+        return 'mp3'
+
+    # AC-3 and E-AC-3 share the sync word, the bitstream id (bsid) tells them apart
+    if first == 0x0B and second == 0x77 and len(data) >= offset + 6:
+        bsid = data[offset + 5] >> 3
+        if bsid <= 10:
+            return 'ac3'
+        if bsid <= 16:
+            return 'eac3'
+
+    return None
+
+
+def detect_container(data) -> Tuple[Optional[str], int]:
+    """
+    Sniffs the container of a (decrypted) segment from its first bytes.
+
+    Some CDNs disguise segments as images, prepending a PNG to the MPEG-TS data:
+    the PNG is skipped and the offset of the real data is returned.
+
+    Parameters:
+        - data (bytes): Content of the segment, bytes, bytearray or memoryview.
+
+    Returns:
+        Tuple[str, int]: FFmpeg input format ('mpegts', 'mp4', 'aac', 'mp3', 'ac3', 'eac3') or None if unknown,
+                         and the offset the media data starts at.
+    """
+    if len(data) >= 8 and bytes(data[:8]) == PNG_SIGNATURE:
+        start = _png_end(data) or len(PNG_SIGNATURE)
+        offset = start if _is_ts_at(data, start) else _find_ts_start(data, start)
+        return ('mpegts', offset) if offset is not None else (None, 0)
+
+    if len(data) and data[0] == TS_SYNC_BYTE and _is_ts_at(data, 0):
+        return 'mpegts', 0
+
+    if len(data) >= 8 and bytes(data[4:8]) in MP4_BOXES:
+        return 'mp4', 0
+
+    # Packed audio: the frames after the ID3 timestamp tags tell the codec
+    return _audio_format(data, _skip_id3(data)), 0
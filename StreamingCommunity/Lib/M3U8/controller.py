@@ -0,0 +1,210 @@
+# 18.10.26
+
+import time
+import logging
+import threading
+from typing import Callable
+
+
+# External libraries
+import httpx
+
+
+# Costant
+CONGESTION_STATUS = {408, 429, 500, 502, 503, 504}
+DECREASE_FACTOR = 0.5
+THROUGHPUT_TOLERANCE = 0.05
+LATENCY_FACTOR = 2.0
+MIN_WINDOW_SECONDS = 0.5
+
+
+class M3U8_Worker_Controller:
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 1, active_retries: Callable[[], int] = None):
+        """
+        Initialize the M3U8_Worker_Controller object.
+
+        AIMD controller for the number of segment requests in flight: the limit grows by one after
+        every window of requests where throughput did not drop, and is halved on 429/5xx and transport errors.
+        With `minimum == maximum` the limit is fixed.
+
+        Parameters:
+            - initial (int): Requests in flight at start.
+            - minimum (int): Lower bound of the limit.
+            - maximum (int): Upper bound of the limit.
+            - active_retries (Callable): Returns the number of segments waiting to be retried.
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.active_retries = active_retries
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+        # Samples of the current window
+        self.previous_throughput = 0.0
+        self.min_latency = None
+        self.last_decrease = 0.0
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now: float) -> None:
+        """Start a new measurement window at the current limit."""
+        self.window_start = now
+        self.window_bytes = 0
+        self.window_latency = 0.0
+        self.window_count = 0
+
+    def acquire(self, stop_event: threading.Event = None) -> bool:
+        """
+        Wait for a free slot under the current limit.
+
+        Parameters:
+            - stop_event (threading.Event): Stop waiting once set.
+
+        Returns:
+            bool: False if `stop_event` was set while waiting.
+        """
+        with self.condition:
+            while self.in_flight >= self.limit:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                self.condition.wait(timeout=0.5)
+
+            self.in_flight += 1
+            return True
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now."""
+        with self.condition:
+            if self.in_flight >= self.limit:
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        """Give back a slot taken with `acquire` or `try_acquire`."""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def record_success(self, latency: float, size: int) -> None:
+        """
+        Account a completed request.
+
+        Parameters:
+            - latency (float): Seconds from the request to the last byte.
+            - size (int): Bytes received.
+        """
+        with self.condition:
+            self.window_bytes += size
+            self.window_latency += latency
+            self.window_count += 1
+
+            if self.min_latency is None or latency < self.min_latency:
+                self.min_latency = latency
+
+            now = time.monotonic()
+            if self.window_count >= self.limit and now - self.window_start >= MIN_WINDOW_SECONDS:
+                self._close_window(now)
+
+    def record_failure(self, error: Exception) -> None:
+        """
+        Account a failed request, backing off if the error signals congestion.
+
+        Parameters:
+            - error (Exception): The error raised by the request.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            congestion = error.response.status_code in CONGESTION_STATUS
+        else:
+            congestion = isinstance(error, httpx.TransportError)
+
+        if not congestion:
+            return
+
+        with self.condition:
+            now = time.monotonic()
+
+            # Back off once per burst, the requests already in flight were sent at the old limit
+            if now - self.last_decrease < max(MIN_WINDOW_SECONDS, (self.min_latency or 0) * LATENCY_FACTOR):
+                return
+
+            new_limit = max(self.minimum, int(self.limit * DECREASE_FACTOR))
+            if new_limit != self.limit:
+                logging.info(f"Segment workers: {self.limit} -> {new_limit} ({error})")
+
+            self.limit = new_limit
+            self.last_decrease = now
+            self.previous_throughput = 0.0
+            self._reset_window(now)
+
+    def _close_window(self, now: float) -> None:
+        """
+        Compare the window with the previous one and adjust the limit.
+        """
+        throughput = self.window_bytes / max(now - self.window_start, 1e-6)
+        avg_latency = self.window_latency / self.window_count
+        retrying = self.active_retries() if self.active_retries is not None else 0
+        new_limit = self.limit
+
+        if retrying > self.limit // 2:
+            pass    # Segments are still failing, hold
+
+        elif throughput >= self.previous_throughput * (1 - THROUGHPUT_TOLERANCE):
+            new_limit = min(self.maximum, self.limit + 1)
+
+        elif avg_latency > self.min_latency * LATENCY_FACTOR:
+            new_limit = max(self.minimum, self.limit - 1)
+
+        if new_limit != self.limit:
+            logging.info(f"Segment workers: {self.limit} -> {new_limit} ({throughput / 1024 / 1024:.2f} MB/s, {avg_latency * 1000:.0f} ms)")
+            self.limit = new_limit
+            self.condition.notify_all()
+
+        self.previous_throughput = throughput
+        self._reset_window(now)
+
+
+class M3U8_Connection_Budget:
+    def __init__(self, value: int):
+        """
+        Initialize the M3U8_Connection_Budget object.
+
+        Requests in flight shared by the streams downloaded together. Works as a semaphore
+        for the worker threads; event loops register a listener to be woken up on release
+        instead of polling it.
+
+        Parameters:
+            - value (int): Requests allowed in flight across every stream.
+        """
+        self.semaphore = threading.BoundedSemaphore(value)
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        return self.semaphore.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+        with self.lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener` (from the releasing thread) every time a slot is given back."""
+        with self.lock:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
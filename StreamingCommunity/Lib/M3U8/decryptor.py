@@ -1,7 +1,6 @@
 # 03.04.24
 
 import sys
-import time
 import logging
 import importlib.util
 
@@ -41,18 +40,35 @@ class M3U8_Decryption:
         self.key = key
         self.iv = iv
         if "0x" in str(iv):
-            self.iv = bytes.fromhex(iv.replace("0x", ""))
+            self.iv = bytes.fromhex(iv.replace("0x", "").replace("0X", "").zfill(32))
         self.method = method
 
-        # Pre-create the cipher based on the encryption method
+        if self.method not in {"AES", "AES-128", "AES-128-CTR"}:
+            raise ValueError("Invalid or unsupported method")
+
+    @staticmethod
+    def sequence_iv(media_sequence: int) -> bytes:
+        """
+        IV to use when the key tag has none: the media sequence number as a 16 byte big-endian integer.
+
+        Parameters:
+            media_sequence (int): Media sequence number of the segment.
+        """
+        return media_sequence.to_bytes(16, 'big')
+
+    def new_cipher(self):
+        """
+        Create a fresh cipher, one for each segment so no state is chained between segments.
+        Building it only expands the 128 bit key, much cheaper than decrypting a segment.
+        """
         if self.method == "AES":
-            self.cipher = AES.new(self.key, AES.MODE_ECB)
+            return AES.new(self.key, AES.MODE_ECB)
         elif self.method == "AES-128":
-            self.cipher = AES.new(self.key[:16], AES.MODE_CBC, iv=self.iv)
-        elif self.method == "AES-128-CTR":
-            self.cipher = AES.new(self.key[:16], AES.MODE_CTR, nonce=self.iv)
+            return AES.new(self.key[:16], AES.MODE_CBC, iv=self.iv)
+        elif len(self.iv) == AES.block_size:
+            return AES.new(self.key[:16], AES.MODE_CTR, nonce=b"", initial_value=self.iv)
         else:
-            raise ValueError("Invalid or unsupported method")
+            return AES.new(self.key[:16], AES.MODE_CTR, nonce=self.iv)
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         """
@@ -64,28 +80,31 @@ class M3U8_Decryption:
         Returns:
             bytes: The decrypted content.
         """
-        #start = time.perf_counter_ns()
+        decrypted_data = self.new_cipher().decrypt(ciphertext)
 
         if self.method in {"AES", "AES-128"}:
-            decrypted_data = self.cipher.decrypt(ciphertext)
-            decrypted_content = unpad(decrypted_data, AES.block_size)
-        elif self.method == "AES-128-CTR":
-            decrypted_content = self.cipher.decrypt(ciphertext)
-        else:
-            raise ValueError("Invalid or unsupported method")
+            return unpad(decrypted_data, AES.block_size)
+        return decrypted_data
 
+    def decrypt_inplace(self, buffer: bytearray) -> memoryview:
         """
-        end = time.perf_counter_ns()
-
-        # Calculate the elapsed time with high precision
-        elapsed_nanoseconds = end - start
-        elapsed_milliseconds = elapsed_nanoseconds / 1_000_000
-        elapsed_seconds = elapsed_nanoseconds / 1_000_000_000
-
-        # Log performance metrics
-        logging.info("[Crypto Decryption Performance]")
-        logging.info(f"Method: {self.method}")
-        logging.info(f"Decryption Time: {elapsed_milliseconds:.4f} ms ({elapsed_seconds:.6f} s)")
-        logging.info(f"Decrypted Content Length: {len(decrypted_content)} bytes")
+        Decrypt the ciphertext directly inside `buffer`, without allocating a plaintext copy.
+
+        Parameters:
+            buffer (bytearray): The encrypted content, overwritten with the plaintext.
+
+        Returns:
+            memoryview: View over the decrypted content, padding excluded.
         """
-        return decrypted_content
\ No newline at end of file
+        view = memoryview(buffer)
+        self.new_cipher().decrypt(view, output=view)
+
+        if self.method in {"AES", "AES-128"}:
+
+            # PKCS#7 padding, checked like Cryptodome's unpad
+            pad_len = view[-1] if len(view) else 0
+            if pad_len < 1 or pad_len > AES.block_size or view[-pad_len:] != bytes([pad_len]) * pad_len:
+                raise ValueError("Padding is incorrect.")
+            return view[:len(view) - pad_len]
+        
+        return view
@@ -1,13 +1,14 @@
 # 21.04.25
 
+import math
 import time
 import logging
 import threading
+import weakref
 from collections import deque
 
 
 # External libraries
-import psutil
 from tqdm import tqdm
 
 
@@ -16,6 +17,54 @@ from StreamingCommunity.Util.color import Colors
 from StreamingCommunity.Util.os import internet_manager
 
 
+# Costant
+TICK_INTERVAL = 0.5
+EWMA_TAU = 3.0
+PRIOR_SECONDS = 30.0
+
+
+class SpeedTicker:
+    """
+    Single background thread refreshing the speed of every live estimator,
+    instead of one polling thread per download. It stops when no estimator is left.
+    """
+    def __init__(self):
+        self.estimators = weakref.WeakSet()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def register(self, estimator: 'M3U8_Ts_Estimator') -> None:
+        with self.lock:
+            self.estimators.add(estimator)
+
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="speed-ticker", daemon=True)
+                self.thread.start()
+
+    def unregister(self, estimator: 'M3U8_Ts_Estimator') -> None:
+        with self.lock:
+            self.estimators.discard(estimator)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(TICK_INTERVAL)
+
+            with self.lock:
+                estimators = list(self.estimators)
+                if not estimators:
+                    self.thread = None
+                    return
+
+            for estimator in estimators:
+                try:
+                    estimator.tick()
+                except Exception as e:
+                    logging.error(f"Error in speed capture: {str(e)}")
+
+
+speed_ticker = SpeedTicker()
+
+
 class M3U8_Ts_Estimator:
     def __init__(self, total_segments: int, segments_instance=None):
         """
@@ -24,95 +73,164 @@ class M3U8_Ts_Estimator:
         Parameters:
             - total_segments (int): Length of total segments to download.
         """
-        self.ts_file_sizes = []
         self.total_segments = total_segments
         self.segments_instance = segments_instance
         self.lock = threading.Lock()
-        self.speed = {"upload": "N/A", "download": "N/A"}
-        self._running = True
-        
-        self.speed_thread = threading.Thread(target=self.capture_speed)
-        self.speed_thread.daemon = True
-        self.speed_thread.start()
+        self.speed = "N/A"
+
+        # Bytes received, appended by the network threads and drained by the ticker (deque.append is atomic)
+        self.received_chunks = deque()
+        self.total_received = 0
+        self.rate = 0.0
+        self.last_tick = time.monotonic()
 
-    def __del__(self):
-        """Ensure thread is properly stopped when the object is destroyed."""
-        self._running = False
+        # Running totals of the stored segments, the size estimate is refined in O(1)
+        self.segment_count = 0
+        self.segment_bytes = 0
+        self.segment_seconds = 0.0
+
+        # Known before the download: playlist duration and bytes per second from BANDWIDTH or HEAD probes
+        self.total_duration = 0.0
+        self.prior_rate = None
+
+        speed_ticker.register(self)
+
+    def close(self) -> None:
+        """Stop receiving speed updates."""
+        speed_ticker.unregister(self)
         
-    def add_ts_file(self, size: int):
-        """Add a file size to the list of file sizes."""
+    def set_playlist(self, durations: list, bandwidth: int = None) -> None:
+        """
+        Set what the playlist tells before any segment is downloaded.
+
+        Parameters:
+            - durations (list): Duration of each segment in seconds.
+            - bandwidth (int): BANDWIDTH (or AVERAGE-BANDWIDTH) of the variant in bits/s, if known.
+        """
+        self.total_segments = len(durations)
+        self.total_duration = sum(durations)
+
+        if bandwidth:
+            self.prior_rate = bandwidth / 8
+
+    def add_probes(self, sizes: list, durations: list) -> None:
+        """
+        Replace the BANDWIDTH prior with the size of a few sampled segments,
+        closer to the real average than the peak bitrate advertised by the playlist.
+
+        Parameters:
+            - sizes (list): Content-Length of the sampled segments.
+            - durations (list): Duration of the same segments.
+        """
+        seconds = sum(durations)
+        if sizes and seconds > 0:
+            self.prior_rate = sum(sizes) / seconds
+
+    def add_segment(self, size: int, duration: float = 0) -> None:
+        """
+        Account a stored segment.
+
+        Parameters:
+            - size (int): Size of the segment in bytes.
+            - duration (float): Duration of the segment in seconds.
+        """
         if size <= 0:
             logging.error(f"Invalid input values: size={size}")
             return
 
-        self.ts_file_sizes.append(size)
+        with self.lock:
+            self.segment_count += 1
+            self.segment_bytes += size
+            self.segment_seconds += duration
 
-    def capture_speed(self, interval: float = 1.5):
-        """Capture the internet speed periodically with improved efficiency."""
-        last_upload, last_download = 0, 0
-        speed_buffer = deque(maxlen=3)
-        
-        while self._running:
+    def add_bytes(self, size: int) -> None:
+        """
+        Account bytes just received from the network, safe to call from any thread.
+
+        Parameters:
+            - size (int): Number of bytes.
+        """
+        self.received_chunks.append(size)
+
+    def tick(self) -> None:
+        """
+        Fold the bytes received since the last tick into an exponentially weighted rate.
+        """
+        now = time.monotonic()
+        elapsed = now - self.last_tick
+        if elapsed <= 0:
+            return
+
+        received = 0
+        while True:
             try:
-                # Get IO counters only once per loop to reduce function calls
-                io_counters = psutil.net_io_counters()
-                if not io_counters:
-                    raise ValueError("No IO counters available")
-                
-                current_upload, current_download = io_counters.bytes_sent, io_counters.bytes_recv
-                
-                if last_upload and last_download:
-                    upload_speed = (current_upload - last_upload) / interval
-                    download_speed = (current_download - last_download) / interval
-                    
-                    # Only update buffer when we have valid data
-                    if download_speed > 0:
-                        speed_buffer.append(download_speed)
-                    
-                    # Use a more efficient approach for thread synchronization
-                    avg_speed = sum(speed_buffer) / len(speed_buffer) if speed_buffer else 0
-                    formatted_upload = internet_manager.format_transfer_speed(max(0, upload_speed))
-                    formatted_download = internet_manager.format_transfer_speed(avg_speed)
-                    
-                    # Minimize lock time by preparing data outside the lock
-                    with self.lock:
-                        self.speed = {
-                            "upload": formatted_upload,
-                            "download": formatted_download
-                        }
-                
-                last_upload, last_download = current_upload, current_download
-                
-            except Exception as e:
-                if self._running:  # Only log if we're still supposed to be running
-                    logging.error(f"Error in speed capture: {str(e)}")
-                self.speed = {"upload": "N/A", "download": "N/A"}
-            
-            time.sleep(interval)
+                received += self.received_chunks.popleft()
+            except IndexError:
+                break
+
+        # Weight of the new sample grows with the time it covers
+        alpha = 1 - math.exp(-elapsed / EWMA_TAU)
+        rate = (1 - alpha) * self.rate + alpha * (received / elapsed) if self.total_received else received / elapsed
+
+        with self.lock:
+            self.total_received += received
+            self.rate = rate
+            self.last_tick = now
+            self.speed = internet_manager.format_transfer_speed(rate) if self.total_received else "N/A"
+
+    def get_eta(self, total_size: float = None) -> float:
+        """
+        Seconds left to receive `total_size` bytes at the current rate, None if unknown.
+
+        Parameters:
+            - total_size (float): Expected size of the download in bytes, the estimate by default.
+        """
+        if total_size is None:
+            total_size = self.estimate_total_size()
+
+        with self.lock:
+            if self.rate <= 0 or not total_size:
+                return None
+            return max(0.0, total_size - self.total_received) / self.rate
+
+    def estimate_total_size(self) -> float:
+        """
+        Expected size of the whole stream in bytes, 0 if nothing is known yet.
+
+        With segment durations the estimate is bytes per second of media times the playlist duration,
+        the prior counting as `PRIOR_SECONDS` of media so the first segments don't swing it.
+        Without durations it falls back to the mean segment size.
+        """
+        with self.lock:
+            count, size, seconds = self.segment_count, self.segment_bytes, self.segment_seconds
+
+        if self.total_duration > 0:
+            if self.prior_rate:
+                return (self.prior_rate * PRIOR_SECONDS + size) / (PRIOR_SECONDS + seconds) * self.total_duration
+            if seconds > 0:
+                return size / seconds * self.total_duration
+
+        if count:
+            return size / count * self.total_segments
+        return 0.0
 
     def calculate_total_size(self) -> str:
         """
         Calculate the total size of the files.
 
         Returns:
-            str: The mean size of the files in a human-readable format.
+            str: The estimated size of the stream in a human-readable format.
         """
         try:
-            # Only do calculations if we have data
-            if not self.ts_file_sizes:
-                return "0 B"
-                
-            total_size = sum(self.ts_file_sizes)
-            mean_size = total_size / len(self.ts_file_sizes)
-            return internet_manager.format_file_size(mean_size)
+            return internet_manager.format_file_size(self.estimate_total_size())
 
         except Exception as e:
             logging.error("An unexpected error occurred: %s", e)
             return "Error"
     
-    def update_progress_bar(self, total_downloaded: int, progress_counter: tqdm) -> None:
+    def update_progress_bar(self, segment_size: int, progress_counter: tqdm, duration: float = 0) -> None:
         try:
-            self.add_ts_file(total_downloaded * self.total_segments)
+            self.add_segment(segment_size, duration)
             
             file_total_size = self.calculate_total_size()
             if file_total_size == "Error":
@@ -127,10 +245,9 @@ class M3U8_Ts_Estimator:
                 with self.segments_instance.active_retries_lock:
                     retry_count = self.segments_instance.active_retries
             
-            # Get speed data outside of any locks
             speed_data = ["N/A", ""]
             with self.lock:
-                download_speed = self.speed['download']
+                download_speed = self.speed
             
             if download_speed != "N/A":
                 speed_data = download_speed.split(" ")
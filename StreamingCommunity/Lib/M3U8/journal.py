@@ -0,0 +1,183 @@
+# 18.10.26
+
+import os
+import json
+import zlib
+import logging
+from typing import List, Tuple
+from urllib.parse import urlparse
+
+
+# Internal utilities
+from StreamingCommunity.Util.os import compute_sha1_hash
+
+
+# Costant
+VERIFY_TAIL_ENTRIES = 8
+
+
+class M3U8_Journal:
+    def __init__(self, file_path: str):
+        """
+        Initialize the M3U8_Journal object.
+
+        The journal is a JSON-lines file kept next to the output file: a header with the playlist
+        signature followed by one entry (index, offset, length, crc32) for each segment written.
+
+        Parameters:
+            - file_path (str): Path of the file the segments are written to.
+        """
+        self.file_path = file_path
+        self.journal_path = f"{file_path}.journal"
+        self.handle = None
+        self.offset = 0
+
+    @staticmethod
+    def compute_signature(segments: List[str]) -> str:
+        """
+        Compute a signature of the playlist that survives token changes in the segment urls.
+
+        Parameters:
+            - segments (List[str]): Segment urls.
+        """
+        return compute_sha1_hash("\n".join(urlparse(seg).path for seg in segments))
+
+    def exists(self) -> bool:
+        """Check if there is an unfinished download to resume."""
+        return os.path.exists(self.journal_path)
+
+    def _read_entries(self, signature: str, total_segments: int) -> List[dict]:
+        """
+        Read the journal entries, returns an empty list if the journal belongs to another playlist.
+        """
+        entries = []
+
+        try:
+            with open(self.journal_path, 'r') as f:
+                header = json.loads(f.readline() or "{}")
+
+                if header.get('signature') != signature or header.get('total') != total_segments:
+                    logging.warning(f"Journal {self.journal_path} does not match the playlist, restart from scratch")
+                    return []
+
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break   # Torn write at the end of the journal
+
+        except Exception as e:
+            logging.error(f"Can't read journal {self.journal_path}: {e}")
+            return []
+
+        return entries
+
+    def _verify_entry(self, f, entry: dict) -> bool:
+        """
+        Check that the bytes on disk for `entry` match its checksum.
+        """
+        f.seek(entry['o'])
+        data = f.read(entry['l'])
+        return len(data) == entry['l'] and zlib.crc32(data) == entry['c']
+
+    def _find_resume_point(self, entries: List[dict]) -> List[dict]:
+        """
+        Returns the longest run of contiguous, consistent entries starting from segment 0.
+        """
+        by_index = {entry['i']: entry for entry in entries}
+        good, offset = [], 0
+
+        while len(good) in by_index:
+            entry = by_index[len(good)]
+            if entry['o'] != offset:
+                break
+
+            good.append(entry)
+            offset += entry['l']
+
+        # Drop entries pointing past the end of the data file
+        data_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        while good and good[-1]['o'] + good[-1]['l'] > data_size:
+            good.pop()
+
+        if not good:
+            return good
+
+        with open(self.file_path, 'rb') as f:
+            first_checked = max(0, len(good) - VERIFY_TAIL_ENTRIES)
+            for position in range(first_checked, len(good)):
+                if not self._verify_entry(f, good[position]):
+                    logging.warning(f"Checksum mismatch for segment {good[position]['i']}, resume before it")
+                    good = good[:position]
+                    break
+
+        return good
+
+    def open(self, segments: List[str]) -> Tuple[int, int]:
+        """
+        Open the journal for writing, resuming a previous download when possible.
+        The data file is truncated to the last contiguous good offset.
+
+        Parameters:
+            - segments (List[str]): Segment urls of the playlist being downloaded.
+
+        Returns:
+            Tuple[int, int]: Index of the first segment to download and the byte offset it starts at.
+        """
+        signature = self.compute_signature(segments)
+        good = []
+
+        if self.exists() and os.path.exists(self.file_path):
+            good = self._find_resume_point(self._read_entries(signature, len(segments)))
+
+        self.offset = good[-1]['o'] + good[-1]['l'] if good else 0
+
+        if good:
+            with open(self.file_path, 'r+b') as f:
+                f.truncate(self.offset)
+
+        # Rewrite the journal with only the entries that are still valid
+        self.handle = open(self.journal_path, 'w')
+        self.handle.write(json.dumps({'signature': signature, 'total': len(segments)}) + "\n")
+        for entry in good:
+            self.handle.write(json.dumps(entry) + "\n")
+        self.handle.flush()
+
+        return len(good), self.offset
+
+    def record(self, index: int, data: bytes) -> None:
+        """
+        Append the entry of a segment just written to the data file.
+
+        Parameters:
+            - index (int): Index of the segment.
+            - data (bytes): Content written for the segment.
+        """
+        if self.handle is None:
+            return
+
+        entry = {'i': index, 'o': self.offset, 'l': len(data), 'c': zlib.crc32(data)}
+        self.handle.write(json.dumps(entry) + "\n")
+        self.offset += len(data)
+
+    def flush(self) -> None:
+        """Flush the entries recorded so far."""
+        if self.handle is not None:
+            self.handle.flush()
+
+    def close(self, remove: bool = False) -> None:
+        """
+        Close the journal.
+
+        Parameters:
+            - remove (bool): Delete the journal, used once every segment has been written.
+        """
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+        if remove and self.exists():
+            try:
+                os.remove(self.journal_path)
+            except OSError as e:
+                logging.error(f"Can't remove journal {self.journal_path}: {e}")
@@ -0,0 +1,135 @@
+# 18.10.26
+
+import time
+import threading
+
+
+# External libraries
+import httpx
+
+
+# Internal utilities
+from StreamingCommunity.Util.metrics import metrics_registry, dump_jsonl, DUMP_JSONL
+
+
+# Variable
+SEGMENT_LATENCY = metrics_registry.histogram('hls_segment_latency_seconds', 'Time from segment request to last byte')
+SEGMENT_BYTES = metrics_registry.counter('hls_segment_bytes_total', 'Bytes of segments downloaded')
+SEGMENT_RETRIES = metrics_registry.counter('hls_segment_retries_total', 'Failed segment attempts by status code or error')
+SEGMENT_FAILED = metrics_registry.counter('hls_segment_failed_total', 'Segments given up after the last retry')
+DECRYPT_TIME = metrics_registry.histogram('hls_decrypt_seconds', 'Time spent decrypting a segment', buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25))
+DOWNLOAD_SPEED = metrics_registry.gauge('hls_download_bytes_per_second', 'Average download speed of the current stream')
+QUEUE_DEPTH = metrics_registry.gauge('hls_queue_depth', 'Segments waiting in the writer queue')
+REORDER_BUFFER = metrics_registry.gauge('hls_reorder_buffer_segments', 'Segments held in memory waiting for an earlier one')
+WORKERS = metrics_registry.gauge('hls_workers_limit', 'Segment requests allowed in flight')
+
+
+def error_label(error: Exception) -> str:
+    """Status code for HTTP errors, exception name otherwise."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return str(error.response.status_code)
+    return type(error).__name__
+
+
+def summarize(values: list) -> dict:
+    """Count, mean and percentiles of a list of seconds."""
+    if not values:
+        return {'count': 0}
+
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': pick(0.50),
+        'p90': pick(0.90),
+        'p99': pick(0.99),
+        'max': ordered[-1]
+    }
+
+
+class M3U8_Metrics:
+    def __init__(self, url: str, stream_type: str):
+        """
+        Initialize the M3U8_Metrics object.
+
+        Collects the metrics of one stream download: forwards them to the process registry
+        (labelled by stream type) and keeps the samples for the JSON-lines summary.
+
+        Parameters:
+            - url (str): Playlist url.
+            - stream_type (str): 'video', 'audio', ...
+        """
+        self.url = url
+        self.stream_type = stream_type
+        self.start_time = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.latencies = []
+        self.decrypt_times = []
+        self.bytes = 0
+        self.retries = {}
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.max_reorder_buffer = 0
+
+    def segment_downloaded(self, latency: float, size: int) -> None:
+        SEGMENT_LATENCY.observe(latency, type=self.stream_type)
+        SEGMENT_BYTES.inc(size, type=self.stream_type)
+
+        with self.lock:
+            self.latencies.append(latency)
+            self.bytes += size
+            DOWNLOAD_SPEED.set(round(self.bytes / max(time.monotonic() - self.start_time, 1e-6)), type=self.stream_type)
+
+    def segment_retry(self, error: Exception) -> None:
+        label = error_label(error)
+        SEGMENT_RETRIES.inc(type=self.stream_type, status=label)
+
+        with self.lock:
+            self.retries[label] = self.retries.get(label, 0) + 1
+
+    def segment_failed(self) -> None:
+        SEGMENT_FAILED.inc(type=self.stream_type)
+        with self.lock:
+            self.failed += 1
+
+    def segment_decrypted(self, seconds: float) -> None:
+        DECRYPT_TIME.observe(seconds, type=self.stream_type)
+        with self.lock:
+            self.decrypt_times.append(seconds)
+
+    def writer_state(self, queue_depth: int, reorder_buffer: int) -> None:
+        QUEUE_DEPTH.set(queue_depth, type=self.stream_type)
+        REORDER_BUFFER.set(reorder_buffer, type=self.stream_type)
+
+        with self.lock:
+            self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+            self.max_reorder_buffer = max(self.max_reorder_buffer, reorder_buffer)
+
+    def workers(self, limit: int) -> None:
+        WORKERS.set(limit, type=self.stream_type)
+
+    def summary(self, segments: int) -> dict:
+        """Summary of the download, as written to the JSON-lines dump."""
+        elapsed = time.monotonic() - self.start_time
+        with self.lock:
+            return {
+                'url': self.url,
+                'type': self.stream_type,
+                'segments': segments,
+                'bytes': self.bytes,
+                'seconds': round(elapsed, 3),
+                'bytes_per_second': round(self.bytes / max(elapsed, 1e-6)),
+                'latency': summarize(self.latencies),
+                'decrypt': summarize(self.decrypt_times),
+                'retries': dict(self.retries),
+                'failed': self.failed,
+                'max_queue_depth': self.max_queue_depth,
+                'max_reorder_buffer': self.max_reorder_buffer
+            }
+
+    def dump(self, segments: int) -> None:
+        """Append the summary to the JSON-lines dump, if enabled."""
+        if DUMP_JSONL:
+            dump_jsonl(self.summary(segments))
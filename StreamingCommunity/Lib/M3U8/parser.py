@@ -255,6 +255,22 @@ class M3U8_Video:
 
         return result
 
+    def get_bandwidth(self, uri):
+        """
+        Returns the bitrate of a variant, AVERAGE-BANDWIDTH when the playlist has it.
+
+        Parameters:
+            - uri (str): The URI of the variant.
+
+        Returns:
+            int or None: Bits per second, or None if the variant is not found.
+        """
+        for video in self.video_playlist:
+            if video['uri'] == uri:
+                return video.get('average_bandwidth') or video['bandwidth']
+
+        return None
+
 
 class M3U8_Audio:
     def __init__(self, audio_playlist) -> None:
@@ -384,6 +400,10 @@ class M3U8_Parser:
         self.segments = []
         self.video_playlist = []
         self.keys = None
+        self.segment_keys = []
+        self.segment_sequences = []
+        self.segment_durations = []
+        self.segment_init = []
         self.subtitle_playlist = []
         self.subtitle = []
         self.audio_playlist = []
@@ -406,7 +426,7 @@ class M3U8_Parser:
         
         self.__parse_video_info__(m3u8_obj)
         self.__parse_subtitles_and_audio__(m3u8_obj)
-        self.__parse_segments__(m3u8_obj)
+        self.__parse_segments__(m3u8_obj, self.__parse_init_keys__(raw_content))
         self.is_master_playlist = self.__is_master__(m3u8_obj)
 
     @staticmethod
@@ -500,7 +520,8 @@ class M3U8_Parser:
                     self.video_playlist.append({
                         "uri": playlist.uri, 
                         "resolution": playlist.stream_info.resolution,
-                        "bandwidth": playlist.stream_info.bandwidth
+                        "bandwidth": playlist.stream_info.bandwidth,
+                        "average_bandwidth": playlist.stream_info.average_bandwidth
                     })
 
                     if there_is_codec:
@@ -512,7 +533,8 @@ class M3U8_Parser:
                     self.video_playlist.append({
                         "uri": playlist.uri, 
                         "resolution": M3U8_Parser.extract_resolution(playlist.uri),
-                        "bandwidth": playlist.stream_info.bandwidth
+                        "bandwidth": playlist.stream_info.bandwidth,
+                        "average_bandwidth": playlist.stream_info.average_bandwidth
                     })    
 
                     if there_is_codec:
@@ -523,15 +545,19 @@ class M3U8_Parser:
         except Exception as e:
             logging.error(f"Error parsing video info: {e}")
 
-    def __parse_encryption_keys__(self, obj) -> None:
+    def __parse_encryption_keys__(self, obj) -> dict:
         """
         Extracts encryption keys either from the M3U8 object or from individual segments.
+        The first key found is also kept in `self.keys`.
 
         Parameters:
             - obj: Either the main M3U8 object or an individual segment.
+
+        Returns:
+            dict: The key in effect for `obj`, None if it is not encrypted.
         """
         try:
-            if hasattr(obj, 'key') and obj.key is not None:
+            if hasattr(obj, 'key') and obj.key is not None and obj.key.method not in (None, 'NONE'):
                 key_info = {
                     'method': obj.key.method,
                     'iv': obj.key.iv,
@@ -541,18 +567,73 @@ class M3U8_Parser:
                 if self.keys is None:
                     self.keys = key_info
 
-                """
-                elif obj.key.uri not in self.keys:
-                    if isinstance(self.keys, dict):
-                        self.keys[obj.key.uri] = key_info
-                    else:
-                        old_key = self.keys
-                        self.keys = {'default': old_key, obj.key.uri: key_info}
-                """
+                return key_info
 
         except Exception as e:
             logging.error(f"Error parsing encryption keys: {e}")
-            pass
+
+        return None
+
+    def __parse_init_keys__(self, raw_content: str) -> list:
+        """
+        Finds the key in effect at the EXT-X-MAP of each segment. The init section is encrypted
+        by the EXT-X-KEY before its EXT-X-MAP, a key tag after the map only applies to the segments.
+
+        Parameters:
+            - raw_content (str): The content of the M3U8 file.
+
+        Returns:
+            list: For each segment, None or (key_info, position of the first segment after the map).
+        """
+        init_keys = []
+        current_key, map_key = None, None
+
+        for line in raw_content.splitlines():
+            line = line.strip()
+
+            if line.startswith('#EXT-X-KEY:'):
+                attributes = dict(re.findall(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)', line.split(':', 1)[1]))
+                attributes = {name: value.strip('"') for name, value in attributes.items()}
+                method = attributes.get('METHOD', 'NONE')
+
+                # Sample encryption leaves the init section in clear
+                current_key = None
+                if method != 'NONE' and not method.startswith('SAMPLE-AES'):
+                    current_key = {'method': method, 'iv': attributes.get('IV'), 'uri': attributes.get('URI')}
+
+            elif line.startswith('#EXT-X-MAP:'):
+                map_key = [current_key, None] if current_key else None
+
+            elif line and not line.startswith('#'):
+                if map_key is not None and map_key[1] is None:
+                    map_key[1] = len(init_keys)
+                init_keys.append(tuple(map_key) if map_key else None)
+
+        return init_keys
+
+    def __parse_init_section__(self, segment, init_key: tuple = None, first_sequence: int = 0) -> dict:
+        """
+        Extracts the EXT-X-MAP (media initialization section) of a fragmented MP4 segment.
+
+        Parameters:
+            - segment: An individual segment of the M3U8 object.
+            - init_key (tuple): Key in effect at the map and position of its first segment, from `__parse_init_keys__`.
+            - first_sequence (int): Media sequence number of the first segment of the playlist.
+
+        Returns:
+            dict: 'uri' and 'byterange' of the init section, 'key' and 'sequence' (for the IV)
+                  if it is encrypted, None for MPEG-TS segments.
+        """
+        init_section = getattr(segment, 'init_section', None)
+        if init_section is None or not init_section.uri:
+            return None
+
+        return {
+            'uri': init_section.uri,
+            'byterange': init_section.byterange,
+            'key': init_key[0] if init_key else None,
+            'sequence': first_sequence + init_key[1] if init_key else None
+        }
 
     def __parse_subtitles_and_audio__(self, m3u8_obj) -> None:
         """
@@ -584,30 +665,42 @@ class M3U8_Parser:
         except Exception as e:
             logging.error(f"Error parsing subtitles and audio: {e}")
 
-    def __parse_segments__(self, m3u8_obj) -> None:
+    def __parse_segments__(self, m3u8_obj, init_keys: list = None) -> None:
         """
         Extracts segment information from the M3U8 object.
 
         Parameters:
             - m3u8_obj: The M3U8 object containing segment data.
+            - init_keys (list): Key in effect at the init section of each segment, from `__parse_init_keys__`.
         """
+        init_keys = init_keys or []
+
         try:
-            for segment in m3u8_obj.segments:
+            first_sequence = m3u8_obj.media_sequence or 0
+
+            for position, segment in enumerate(m3u8_obj.segments):
 
-                # Parse key
-                self.__parse_encryption_keys__(segment)
+                # Parse key, it can change (rotate) from one segment to the next
+                key_info = self.__parse_encryption_keys__(segment)
                 
                 # Collect all index duration
                 self.duration += segment.duration
 
                 if "vtt" not in segment.uri:
                     self.segments.append(segment.uri)
+                    self.segment_keys.append(key_info)
+                    self.segment_sequences.append(first_sequence + position)
+                    self.segment_durations.append(segment.duration or 0)
+                    init_key = init_keys[position] if position < len(init_keys) else None
+                    self.segment_init.append(self.__parse_init_section__(segment, init_key, first_sequence))
                 else:
                     self.subtitle.append(segment.uri)
             
             # Second check if there is key in main m3u8 obj
             if self.keys is None:
-                self.__parse_encryption_keys__(m3u8_obj)
+                key_info = self.__parse_encryption_keys__(m3u8_obj)
+                if key_info is not None:
+                    self.segment_keys = [key_info] * len(self.segments)
 
         except Exception as e:
             logging.error(f"Error parsing segments: {e}")
@@ -12,6 +12,7 @@ from rich.console import Console
 # Internal utilities
 from .obj_tmbd import Json_film
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import http_cache
 from StreamingCommunity.Util.table import TVShowManager
 
 
@@ -113,9 +114,15 @@ class TheMovieDB:
         if params is None:
             params = {}
 
-        params['api_key'] = self.api_key
+        # The api key is added only when sending, so it is not part of the cache key stored on disk
         url = f"{self.base_url}/{endpoint}"
-        response = httpx.get(url, params=params, timeout=MAX_TIMEOUT)
+        response = http_cache.get(
+            url,
+            'tmdb_trending' if endpoint.startswith('trending/') else 'tmdb',
+            params=params,
+            send=lambda url, params, **kwargs: httpx.get(url, params={**params, 'api_key': self.api_key}, **kwargs),
+            timeout=MAX_TIMEOUT
+        )
         response.raise_for_status()
         
         return response.json()
@@ -0,0 +1,203 @@
+# 18.10.26
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+
+# External libraries
+import httpx
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.metrics import metrics_registry
+
+
+# Config
+ENABLE = config_manager.get_bool('HTTP_CACHE', 'enable')
+CACHE_PATH = config_manager.get('HTTP_CACHE', 'path')
+MAX_SIZE_MB = config_manager.get_float('HTTP_CACHE', 'max_size_mb')
+TTL = config_manager.get_dict('HTTP_CACHE', 'ttl')
+
+
+# Variable
+CACHE_REQUESTS = metrics_registry.counter('http_cache_requests_total', 'Cached GET requests by endpoint and result (hit, revalidated, miss)')
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+class HTTPCache:
+    def __init__(self, path: str = CACHE_PATH, max_size_mb: float = MAX_SIZE_MB, ttl: Dict[str, float] = TTL, enabled: bool = ENABLE):
+        """
+        On-disk cache of the metadata GET requests (series pages, season lists, TMDB), kept between runs.
+
+        A response is served from disk for the TTL of its endpoint, then revalidated with
+        If-None-Match/If-Modified-Since: a 304 renews it without downloading the body again.
+        The least recently used responses are dropped once the cache is bigger than `max_size_mb`.
+
+        Parameters:
+            - path (str): SQLite database file.
+            - max_size_mb (float): Size of the stored bodies the cache is kept under.
+            - ttl (dict): Seconds a response is fresh for each endpoint, 'default' for the others.
+            - enabled (bool): False sends every request to the site.
+        """
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.ttl = ttl
+        self.enabled = enabled
+        self.connection: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use, the cache is disabled if it can't be opened."""
+        if self.connection is None and self.enabled:
+            try:
+                folder = os.path.dirname(self.path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+
+                self.connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute(SCHEMA)
+                self.connection.commit()
+
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"Can't open HTTP cache {self.path}: {e}")
+                self.enabled = False
+                self.connection = None
+
+        return self.connection
+
+    def _execute(self, query: str, args: tuple = ()) -> list:
+        with self.lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+
+            try:
+                rows = connection.execute(query, args).fetchall()
+                connection.commit()
+                return rows
+
+            except sqlite3.Error as e:
+                logging.error(f"HTTP cache query failed: {e}")
+                return []
+
+    def get_ttl(self, endpoint: str) -> float:
+        return float(self.ttl.get(endpoint, self.ttl.get('default', 0)))
+
+    def _build_response(self, url: str, row: tuple) -> httpx.Response:
+        status, content_type, etag, last_modified, body = row
+        headers = {'x-cache': 'HIT'}
+        for name, value in (('content-type', content_type), ('etag', etag), ('last-modified', last_modified)):
+            if value:
+                headers[name] = value
+
+        return httpx.Response(status, headers=headers, content=body, request=httpx.Request('GET', url))
+
+    def _store(self, url: str, endpoint: str, response: httpx.Response) -> None:
+        now = time.time()
+        body = response.content
+        self._execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, endpoint, response.status_code, response.headers.get('content-type'), response.headers.get('etag'),
+             response.headers.get('last-modified'), body, len(body), now + self.get_ttl(endpoint), now)
+        )
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop the least recently used responses until the stored bodies fit in `max_size`."""
+        rows = self._execute("SELECT SUM(size) FROM responses")
+        total = rows[0][0] if rows and rows[0][0] else 0
+        if total <= self.max_size:
+            return
+
+        evicted = []
+        for url, size in self._execute("SELECT url, size FROM responses ORDER BY accessed"):
+            if total <= self.max_size:
+                break
+            evicted.append((url,))
+            total -= size
+
+        with self.lock:
+            try:
+                with self.connection:
+                    self.connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+            except sqlite3.Error as e:
+                logging.error(f"HTTP cache eviction failed: {e}")
+                return
+
+        logging.info(f"HTTP cache: evicted {len(evicted)} responses")
+
+    def get(self, url: str, endpoint: str = 'default', params: Optional[dict] = None, headers: Optional[dict] = None,
+            send: Callable[..., httpx.Response] = httpx.get, **kwargs) -> httpx.Response:
+        """
+        GET `url`, from the cache while fresh, otherwise with a conditional request.
+        Only 200 responses are stored, any other status is returned as is.
+
+        Parameters:
+            - url (str): Url to get.
+            - endpoint (str): Kind of request, picks the TTL (e.g. 'series', 'episodes', 'tmdb').
+            - params (dict): Query parameters, part of the cache key.
+            - headers (dict): Request headers.
+            - send (Callable): Sends the request, called as `send(url, params=..., headers=..., **kwargs)`.
+
+        Returns:
+            httpx.Response: Response of the site, or rebuilt from the cache (header `x-cache: HIT`).
+        """
+        if not self.enabled or self.get_ttl(endpoint) <= 0:
+            return send(url, params=params, headers=headers, **kwargs)
+
+        key = str(httpx.URL(url, params=params))
+        rows = self._execute("SELECT status, content_type, etag, last_modified, body, expires FROM responses WHERE url = ?", (key,))
+        row = rows[0] if rows else None
+
+        if row is not None and time.time() < row[5]:
+            self._execute("UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), key))
+            CACHE_REQUESTS.inc(endpoint=endpoint, result='hit')
+            return self._build_response(key, row[:5])
+
+        # Expired: ask the site whether it changed
+        request_headers = dict(headers or {})
+        if row is not None:
+            if row[2]:
+                request_headers['If-None-Match'] = row[2]
+            if row[3]:
+                request_headers['If-Modified-Since'] = row[3]
+
+        response = send(url, params=params, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and row is not None:
+            now = time.time()
+            self._execute("UPDATE responses SET expires = ?, accessed = ? WHERE url = ?", (now + self.get_ttl(endpoint), now, key))
+            CACHE_REQUESTS.inc(endpoint=endpoint, result='revalidated')
+            return self._build_response(key, row[:5])
+
+        CACHE_REQUESTS.inc(endpoint=endpoint, result='miss')
+        if response.status_code == 200:
+            self._store(key, endpoint, response)
+
+        return response
+
+    def clear(self) -> None:
+        self._execute("DELETE FROM responses")
+
+
+http_cache = HTTPCache()
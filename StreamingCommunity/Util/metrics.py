@@ -0,0 +1,220 @@
+# 18.10.26
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+import http.server
+from typing import Dict, List, Optional, Tuple
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+ENABLE_HTTP = config_manager.get_bool('METRICS', 'enable_http')
+HTTP_HOST = config_manager.get('METRICS', 'host')
+HTTP_PORT = config_manager.get_int('METRICS', 'port')
+DUMP_JSONL = config_manager.get_bool('METRICS', 'dump_jsonl')
+DUMP_FOLDER = config_manager.get('METRICS', 'dump_folder')
+
+# Variable
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metric:
+    def __init__(self, name: str, documentation: str, kind: str):
+        """
+        Base of every metric: one value (or histogram) for each combination of labels.
+
+        Parameters:
+            - name (str): Prometheus name of the metric.
+            - documentation (str): Description shown in the exposition.
+            - kind (str): counter, gauge or histogram.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.values: Dict[Tuple[Tuple[str, str], ...], object] = {}
+        self.lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        """Lines of the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for key, value in self.values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+    def snapshot(self) -> list:
+        with self.lock:
+            return [{'labels': dict(key), 'value': value} for key, value in self.values.items()]
+
+
+class Counter(Metric):
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation, 'counter')
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation, 'gauge')
+
+    def set(self, value: float, **labels) -> None:
+        with self.lock:
+            self.values[_labels_key(labels)] = value
+
+
+class Histogram(Metric):
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, 'histogram')
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels_key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+
+            state['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, state in self.values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), state['counts']):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {state['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+        return lines
+
+    def snapshot(self) -> list:
+        with self.lock:
+            return [
+                {'labels': dict(key), 'buckets': list(self.buckets), 'counts': list(state['counts']), 'sum': state['sum'], 'count': state['count']}
+                for key, state in self.values.items()
+            ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Process-wide registry of the download metrics, exposed as Prometheus text or JSON.
+        """
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+        self.server: Optional[http.server.ThreadingHTTPServer] = None
+
+    def _register(self, metric_class, name: str, documentation: str, **kwargs) -> Metric:
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, documentation, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge, name, documentation)
+
+    def histogram(self, name: str, documentation: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {metric.name: {'type': metric.kind, 'values': metric.snapshot()} for metric in metrics}
+
+    def start_http_server(self, host: str = HTTP_HOST, port: int = HTTP_PORT) -> None:
+        """
+        Serve `/metrics` (Prometheus) and `/metrics.json` from a daemon thread, once per process.
+        """
+        with self.lock:
+            if self.server is not None:
+                return
+
+            registry = self
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def log_message(self, *args):
+                    pass
+
+                def do_GET(self):
+                    if self.path.startswith('/metrics.json'):
+                        body, content_type = json.dumps(registry.snapshot()).encode(), 'application/json'
+                    elif self.path.startswith('/metrics'):
+                        body, content_type = registry.render_prometheus().encode(), 'text/plain; version=0.0.4'
+                    else:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            try:
+                self.server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as e:
+                logging.error(f"Can't start metrics endpoint on {host}:{port}: {e}")
+                return
+
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            logging.info(f"Metrics endpoint on http://{host}:{port}/metrics")
+
+
+def dump_jsonl(record: dict, file_name: str = 'downloads.jsonl') -> None:
+    """
+    Append one JSON record to `<dump_folder>/<file_name>`, one line per download.
+
+    Parameters:
+        - record (dict): Summary of a download.
+        - file_name (str): Name of the JSON-lines file.
+    """
+    try:
+        os.makedirs(DUMP_FOLDER, exist_ok=True)
+        with open(os.path.join(DUMP_FOLDER, file_name), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': time.time(), **record}) + "\n")
+
+    except Exception as e:
+        logging.error(f"Can't dump metrics: {e}")
+
+
+metrics_registry = MetricsRegistry()
+if ENABLE_HTTP:
+    metrics_registry.start_http_server()
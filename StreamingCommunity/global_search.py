@@ -6,17 +6,24 @@ import time
 import glob
 import logging
 import importlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 
 # External library
-from rich.console import Console
+from rich.console import Console, Group
 from rich.prompt import Prompt
 from rich.table import Table
 from rich.progress import Progress
+from rich.live import Live
 
 
 # Internal utilities
 from StreamingCommunity.Util.message import start_message
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+SEARCH_TIMEOUT = config_manager.get_int('REQUESTS', 'search_timeout')
 
 
 # Variable
@@ -159,49 +166,48 @@ def global_search(search_terms: str = None, selected_sites: list = None):
     console.print(f"\n[bold green]Searching for:[/bold green] [yellow]{search_terms}[/yellow]")
     console.print(f"[bold green]Searching across:[/bold green] {len(selected_sites)} sites")
     
-    with Progress() as progress:
-        search_task = progress.add_task("[cyan]Searching...", total=len(selected_sites))
-        
-        # Search each selected site
-        for alias in selected_sites:
-            site_name = alias.split("_")[0].capitalize()
-            progress.update(search_task, description=f"[cyan]Searching {site_name}...")
-            
-            func, _ = search_functions[alias]
-            try:
-                # Call the search function with get_onlyDatabase=True to get database object
-                database = func(search_terms, get_onlyDatabase=True)
-                
-                # Check if database has media_list attribute and it's not empty
-                if database and hasattr(database, 'media_list') and len(database.media_list) > 0:
-                    # Store media_list items with additional source information
-                    all_results[alias] = []
-                    for element in database.media_list:
-                        # Convert element to dictionary if it's an object
-                        if hasattr(element, '__dict__'):
-                            item_dict = element.__dict__.copy()
-                        else:
-                            item_dict = {}  # Fallback for non-object items
-                        
-                        # Add source information
-                        item_dict['source'] = site_name
-                        item_dict['source_alias'] = alias
-                        all_results[alias].append(item_dict)
-                        
-                    console.print(f"[green]Found {len(database.media_list)} results from {site_name}")
-
-            except Exception as e:
-                console.print(f"[bold red]Error searching {site_name}:[/bold red] {str(e)}")
-            
-            progress.update(search_task, advance=1)
-    
+    all_media_items = []
+    progress = Progress()
+    search_task = progress.add_task("[cyan]Searching...", total=len(selected_sites))
+
+    # Every site is searched at the same time, results are shown as soon as a site answers
+    executor = ThreadPoolExecutor(max_workers=max(1, len(selected_sites)), thread_name_prefix='search')
+    futures = {executor.submit(search_site, search_functions[alias][0], search_terms, alias): alias for alias in selected_sites}
+    deadline = time.monotonic() + SEARCH_TIMEOUT
+    pending = set(futures)
+
+    with Live(Group(progress, build_results_table(all_media_items)), console=console, refresh_per_second=8) as live:
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+
+            for future in done:
+                alias = futures[future]
+                site_name = alias.split("_")[0].capitalize()
+
+                try:
+                    results = future.result()
+                    if results:
+                        all_results[alias] = results
+                        all_media_items.extend(results)
+                        console.print(f"[green]Found {len(results)} results from {site_name}")
+
+                except Exception as e:
+                    console.print(f"[bold red]Error searching {site_name}:[/bold red] {str(e)}")
+
+                progress.update(search_task, advance=1)
+
+            live.update(Group(progress, build_results_table(all_media_items)))
+
+    # Slow or dead sites are left behind, their requests end on their own timeout
+    for future in pending:
+        console.print(f"[bold red]Timeout searching {futures[future].split('_')[0].capitalize()}[/bold red] (> {SEARCH_TIMEOUT}s)")
+    executor.shutdown(wait=False, cancel_futures=True)
+
     # Display the consolidated results
     if all_results:
-        all_media_items = []
-        for alias, results in all_results.items():
-            for item in results:
-                all_media_items.append(item)
-        
+
         # Display consolidated results
         display_consolidated_results(all_media_items, search_terms)
         
@@ -220,19 +226,52 @@ def global_search(search_terms: str = None, selected_sites: list = None):
     
     return all_results
 
-def display_consolidated_results(all_media_items, search_terms):
+def search_site(func, search_terms: str, alias: str) -> list:
     """
-    Display consolidated search results from multiple sites.
-    
+    Search one site and convert its results to dicts tagged with their source.
+
+    Parameters:
+        func (Callable): Search function of the site.
+        search_terms (str): The terms to search for.
+        alias (str): Alias of the site, e.g. 'streamingcommunity_search'.
+
+    Returns:
+        list: Media items found, empty if none.
+    """
+    site_name = alias.split("_")[0].capitalize()
+
+    # Call the search function with get_onlyDatabase=True to get database object
+    database = func(search_terms, get_onlyDatabase=True)
+
+    # Check if database has media_list attribute and it's not empty
+    if not database or not hasattr(database, 'media_list'):
+        return []
+
+    results = []
+    for element in list(database.media_list):
+        # Convert element to dictionary if it's an object
+        if hasattr(element, '__dict__'):
+            item_dict = element.__dict__.copy()
+        else:
+            item_dict = {}  # Fallback for non-object items
+
+        # Add source information
+        item_dict['source'] = site_name
+        item_dict['source_alias'] = alias
+        results.append(item_dict)
+
+    return results
+
+def build_results_table(all_media_items):
+    """
+    Build the table of the consolidated results.
+
     Parameters:
         all_media_items (list): List of media items from all searched sites.
-        search_terms (str): The search terms used.
-    """    
-    time.sleep(1)
-    start_message()
 
-    console.print(f"\n[bold green]Search results for:[/bold green] [yellow]{search_terms}[/yellow] \n")
-    
+    Returns:
+        Table: One numbered row for each item.
+    """
     table = Table(show_header=True, header_style="bold cyan")
     table.add_column("#", style="dim", width=4)
     table.add_column("Title", min_width=20)
@@ -252,8 +291,22 @@ def display_consolidated_results(all_media_items, search_terms):
             str(media_type),
             str(source),
         )
+
+    return table
+
+def display_consolidated_results(all_media_items, search_terms):
+    """
+    Display consolidated search results from multiple sites.
     
-    console.print(table)
+    Parameters:
+        all_media_items (list): List of media items from all searched sites.
+        search_terms (str): The search terms used.
+    """    
+    time.sleep(1)
+    start_message()
+
+    console.print(f"\n[bold green]Search results for:[/bold green] [yellow]{search_terms}[/yellow] \n")
+    console.print(build_results_table(all_media_items))
 
 def select_from_consolidated_results(all_media_items):
     """
@@ -25,6 +25,7 @@ from StreamingCommunity.Util.os import os_summary, internet_manager
 from StreamingCommunity.Util.logger import Logger
 from StreamingCommunity.Upload.update import update as git_update
 from StreamingCommunity.Lib.TMBD import tmdb
+from StreamingCommunity.Lib.FFmpeg import postprocess_scheduler
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance, TelegramSession
 
 
@@ -51,8 +52,10 @@ def run_function(func: Callable[..., None], close_console: bool = False, search_
     if close_console:
         while 1:
             func(search_terms)
+            postprocess_scheduler.wait_all()
     else:
         func(search_terms)
+        postprocess_scheduler.wait_all()
 
 
 # !!! DA METTERE IN COMUNE CON QUELLA DI GLOBAL
@@ -306,6 +309,7 @@ def main(script_id = 0):
     # Check if global search is requested
     if getattr(args, 'global'):
         global_search(search_terms)
+        postprocess_scheduler.wait_all()
         return
 
     # Create mappings using module indice
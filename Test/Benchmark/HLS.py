@@ -0,0 +1,182 @@
+# 18.10.26
+
+"""
+Offline HLS benchmark against a local mock CDN, no real site is contacted.
+
+Runs M3U8_Segments on a synthetic media playlist (and, with --full, HLS_Downloader end to end on real
+segments encoded by ffmpeg) and reports throughput, p50/p99 segment latency, peak RSS and CPU.
+
+Usage:
+    python Test/Benchmark/HLS.py --segments 300 --segment-kb 512 --encrypt --jitter-ms 40 --error-rate 0.02
+    python Test/Benchmark/HLS.py --engine async --slow-every 10 --slow-ms 500
+    python Test/Benchmark/HLS.py --full
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+
+# Fix import
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+# External libraries
+import psutil
+
+
+# Internal utilities
+from mock_cdn import CDNSettings, MockCDN, generate_media
+
+
+class ResourceMonitor:
+    def __init__(self, interval: float = 0.02):
+        """
+        Samples RSS of this process in background, while CPU time is taken from the process counters.
+
+        Parameters:
+            - interval (float): Seconds between two RSS samples.
+        """
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_rss = self.process.memory_info().rss
+        self.cpu_start = self.process.cpu_times()
+        self.wall_start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.wall = time.perf_counter() - self.wall_start
+        cpu_end = self.process.cpu_times()
+        self.cpu = (cpu_end.user - self.cpu_start.user) + (cpu_end.system - self.cpu_start.system)
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile, 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def report(name: str, size: int, monitor: ResourceMonitor, stats: dict, check: str) -> None:
+    """Print one line of results."""
+    latencies = [value * 1000 for value in stats['latencies']]
+    errors = sum(count for status, count in stats['counters'].items() if status != '200')
+
+    print(
+        f"{name:<22} {size / monitor.wall / 1024 / 1024:>8.1f} MB/s "
+        f"p50 {percentile(latencies, 50):>7.1f} ms  p99 {percentile(latencies, 99):>7.1f} ms  "
+        f"mean {statistics.fmean(latencies) if latencies else 0:>7.1f} ms  "
+        f"RSS {monitor.peak_rss / 1024 / 1024:>7.1f} MB  CPU {monitor.cpu / monitor.wall * 100:>6.1f}%  "
+        f"errors {errors:>4}  {monitor.wall:>6.2f} s  {check}"
+    )
+
+
+def bench_segments(cdn: MockCDN, settings: CDNSettings, tmp_dir: str, track: str = 'video') -> None:
+    """Download one media playlist with M3U8_Segments and check the output byte by byte."""
+    from StreamingCommunity.Lib.Downloader.HLS.segments import M3U8_Segments
+
+    folder = os.path.join(tmp_dir, f'segments_{track}')
+    os.makedirs(folder, exist_ok=True)
+    cdn.stats()     # Reset the counters
+
+    with ResourceMonitor() as monitor:
+        M3U8_Segments(url=f"{cdn.base_url}/{track}/index.m3u8", tmp_folder=folder).download_streams(track.capitalize(), track)
+
+    with open(os.path.join(folder, '0.ts'), 'rb') as f:
+        check = 'OK' if f.read() == settings.expected_track(track) else 'CORRUPT'
+
+    report(f"M3U8_Segments ({track})", settings.segments * settings.segment_size, monitor, cdn.stats(), check)
+
+
+def bench_downloader(cdn: MockCDN, settings: CDNSettings, tmp_dir: str) -> None:
+    """Run HLS_Downloader on the master playlist, merge included (needs ffmpeg)."""
+    from StreamingCommunity.Lib.Downloader import HLS_Downloader
+
+    output_path = os.path.join(tmp_dir, 'full', 'benchmark.mp4')
+    media_size = sum(os.path.getsize(os.path.join(settings.media_dir, 'video', name)) for name in os.listdir(os.path.join(settings.media_dir, 'video')))
+    cdn.stats()
+
+    with ResourceMonitor() as monitor:
+        result = HLS_Downloader(m3u8_url=f"{cdn.base_url}/master.m3u8", output_path=output_path).start()
+
+    report("HLS_Downloader", media_size, monitor, cdn.stats(), 'OK' if result.get('error') is None else f"ERROR {result['error']}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline HLS benchmark with a local mock CDN")
+    parser.add_argument('--segments', type=int, default=200, help="segments of each playlist")
+    parser.add_argument('--segment-kb', type=int, default=512, help="size of each synthetic segment")
+    parser.add_argument('--encrypt', action='store_true', help="serve AES-128 encrypted segments")
+    parser.add_argument('--latency-ms', type=float, default=5, help="delay before each segment")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="random extra delay, segments complete out of order")
+    parser.add_argument('--slow-every', type=int, default=0, help="slow down every N-th segment")
+    parser.add_argument('--slow-ms', type=float, default=300, help="extra delay of the slow segments")
+    parser.add_argument('--error-rate', type=float, default=0, help="probability of an error answer")
+    parser.add_argument('--error-status', type=int, default=503, help="status code of the injected errors")
+    parser.add_argument('--engine', choices=['thread', 'async'], help="override M3U8_DOWNLOAD.engine")
+    parser.add_argument('--workers', type=int, help="override the video/audio worker count")
+    parser.add_argument('--audio', action='store_true', help="also download the audio rendition")
+    parser.add_argument('--full', action='store_true', help="run HLS_Downloader end to end on real segments (needs ffmpeg)")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    # Overrides are applied to the module constants read from config.json
+    import StreamingCommunity.Lib.Downloader.HLS.segments as segments_module
+    if args.engine:
+        segments_module.DOWNLOAD_ENGINE = args.engine
+    if args.workers:
+        segments_module.DEFAULT_VIDEO_WORKERS = segments_module.DEFAULT_AUDIO_WORKERS = args.workers
+
+    settings = CDNSettings(
+        segments=args.segments, segment_kb=args.segment_kb, encrypt=args.encrypt,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_every=args.slow_every, slow_ms=args.slow_ms,
+        error_rate=args.error_rate, error_status=args.error_status
+    )
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        print(
+            f"{settings.segments} segments x {settings.segment_kb} KiB, encrypt={settings.encrypt}, "
+            f"latency={settings.latency_ms}+{settings.jitter_ms} ms, error_rate={settings.error_rate}, "
+            f"engine={segments_module.DOWNLOAD_ENGINE}"
+        )
+
+        with MockCDN(settings) as cdn:
+            bench_segments(cdn, settings, tmp_dir, 'video')
+            if args.audio:
+                bench_segments(cdn, settings, tmp_dir, 'audio')
+
+        if args.full:
+            settings.media_dir = os.path.join(tmp_dir, 'media')
+            settings.audio = False
+
+            if not generate_media(settings.media_dir, settings.segments, settings.duration):
+                print("HLS_Downloader        skipped, ffmpeg not found")
+            else:
+                with MockCDN(settings) as cdn:
+                    bench_downloader(cdn, settings, tmp_dir)
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
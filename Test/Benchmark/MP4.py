@@ -0,0 +1,116 @@
+# 18.10.26
+
+"""
+Offline benchmark of the MP4 download paths against a local HTTP file server.
+Reports throughput and CPU usage of the downloading process (the server runs in its own process).
+
+Usage: python Test/Benchmark/MP4.py [size_mb]
+"""
+
+import re
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing
+import http.server
+import socketserver
+
+# Fix import
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+# External libraries
+import httpx
+from tqdm import tqdm
+
+
+# Variable
+SIZE_MB = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    data = b''
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        size = len(self.data)
+        match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+
+        if match:
+            start, end = int(match.group(1)), int(match.group(2) or size - 1)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            start, end = 0, size - 1
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        try:
+            self.wfile.write(memoryview(self.data)[start:end + 1])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+def serve(size: int, port_queue) -> None:
+    """Serve `size` random bytes on a free local port."""
+    RangeHandler.data = os.urandom(size)
+    server = ThreadingServer(('127.0.0.1', 0), RangeHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def legacy_download(url: str, temp_path: str) -> None:
+    """The previous MP4 path: 1 KiB chunks, a tqdm update and a flag check for each of them."""
+    force_quit = False
+    with httpx.Client() as client:
+        with client.stream("GET", url) as response:
+            total = int(response.headers.get('content-length', 0))
+            with open(temp_path, 'wb') as file, tqdm(total=total, unit='iB', unit_scale=True, mininterval=0.05, file=sys.stdout) as bar:
+                for chunk in response.iter_bytes(chunk_size=1024):
+                    if force_quit:
+                        break
+                    if chunk:
+                        bar.update(file.write(chunk))
+
+
+def measure(name: str, func, *args) -> None:
+    """Run `func` and print bytes/s and CPU% of this process."""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    func(*args)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    size = SIZE_MB * 1024 * 1024
+    print(f"{name:<32} {size / wall / 1024 / 1024:>9.1f} MB/s {cpu / wall * 100:>7.1f}% CPU {wall:>7.2f} s")
+
+
+if __name__ == '__main__':
+    from StreamingCommunity.Lib.Downloader.MP4.downloader import InterruptHandler, download_single, download_segmented
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(SIZE_MB * 1024 * 1024, port_queue), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/video.mp4"
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        print(f"MP4 download of {SIZE_MB} MiB from {url}")
+        measure("iter_bytes(1024), per-chunk tqdm", legacy_download, url, os.path.join(tmp_dir, 'legacy.mp4'))
+        measure("buffered, throttled progress", download_single, url, {}, os.path.join(tmp_dir, 'single.mp4'), InterruptHandler())
+        measure("segmented ranges", download_segmented, url, {}, os.path.join(tmp_dir, 'ranges.mp4'), InterruptHandler())
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        server.terminate()
@@ -0,0 +1,279 @@
+# 18.10.26
+
+"""
+Local mock CDN for the HLS benchmarks: synthetic master/media playlists and segments, optional AES-128,
+injected latency, slow segments (out-of-order completion) and error rates. Runs in its own process so it
+does not skew the CPU and memory numbers of the downloader.
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import subprocess
+import threading
+import multiprocessing
+import http.server
+import socketserver
+from typing import Dict, List, Optional
+
+
+# External libraries
+import httpx
+from Cryptodome.Cipher import AES
+from Cryptodome.Util.Padding import pad
+
+
+# Variable
+KEY = bytes(range(16))
+TS_PACKET = 188
+
+
+def segment_payload(seed: int, track: str, index: int, size: int) -> bytes:
+    """
+    Deterministic content of a synthetic segment, TS sync byte every 188 bytes.
+    Used by the server and by the benchmark to check the downloaded file.
+    """
+    data = bytearray(random.Random(f"{seed}-{track}-{index}").randbytes(size))
+    data[::TS_PACKET] = b'\x47' * len(range(0, size, TS_PACKET))
+    return bytes(data)
+
+
+def encrypt_segment(data: bytes, media_sequence: int) -> bytes:
+    """AES-128 CBC with the media sequence number as IV, like a packager that omits the IV attribute."""
+    return AES.new(KEY, AES.MODE_CBC, iv=media_sequence.to_bytes(16, 'big')).encrypt(pad(data, AES.block_size))
+
+
+class CDNSettings:
+    def __init__(self, segments: int = 200, segment_kb: int = 512, duration: float = 4.0, encrypt: bool = False,
+                 latency_ms: float = 0, jitter_ms: float = 0, slow_every: int = 0, slow_ms: float = 0,
+                 error_rate: float = 0, error_status: int = 503, audio: bool = True, seed: int = 1,
+                 media_dir: Optional[str] = None):
+        """
+        Initialize the CDNSettings object.
+
+        Parameters:
+            - segments (int): Segments of each media playlist.
+            - segment_kb (int): Size of each synthetic segment.
+            - duration (float): EXTINF of each segment.
+            - encrypt (bool): Serve AES-128 encrypted segments.
+            - latency_ms (float): Delay before the first byte of each segment.
+            - jitter_ms (float): Random extra delay, segments complete out of order.
+            - slow_every (int): Every N-th segment is slowed down by `slow_ms` (0 disables).
+            - slow_ms (float): Extra delay of the slow segments.
+            - error_rate (float): Probability of answering a segment request with `error_status`.
+            - error_status (int): Status code of the injected errors.
+            - audio (bool): Add a separate audio rendition to the master playlist.
+            - seed (int): Seed of the synthetic content.
+            - media_dir (str): Serve real segments (`video/seg{i}.ts`) from this folder instead of synthetic ones.
+        """
+        self.segments = segments
+        self.segment_kb = segment_kb
+        self.duration = duration
+        self.encrypt = encrypt
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_every = slow_every
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.audio = audio and media_dir is None
+        self.seed = seed
+        self.media_dir = media_dir
+
+    @property
+    def segment_size(self) -> int:
+        return self.segment_kb * 1024
+
+    def expected_track(self, track: str) -> bytes:
+        """Plain content the downloader must produce for a synthetic track."""
+        return b''.join(segment_payload(self.seed, track, i, self.segment_size) for i in range(self.segments))
+
+
+def generate_media(folder: str, segments: int, duration: float) -> bool:
+    """
+    Encode a real test clip with ffmpeg and split it in `segments` TS files of `duration` seconds.
+
+    Returns:
+        bool: False if ffmpeg is not available.
+    """
+    if shutil.which('ffmpeg') is None:
+        return False
+
+    os.makedirs(os.path.join(folder, 'video'), exist_ok=True)
+    subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'testsrc=size=1280x720:rate=25',
+        '-f', 'lavfi', '-i', 'sine=frequency=440',
+        '-t', str(segments * duration),
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', str(int(25 * duration)),
+        '-c:a', 'aac',
+        '-f', 'segment', '-segment_time', str(duration), '-segment_format', 'mpegts',
+        os.path.join(folder, 'video', 'seg%d.ts')
+    ], check=True)
+    return True
+
+
+class CDNHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    settings: CDNSettings = None
+    latencies: List[float] = []
+    counters: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bytes, status: int = 200, content_type: str = 'application/octet-stream') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _media_playlist(self) -> bytes:
+        settings = self.settings
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-TARGETDURATION:{int(settings.duration + 0.999)}', '#EXT-X-MEDIA-SEQUENCE:0']
+        if settings.encrypt:
+            lines.append('#EXT-X-KEY:METHOD=AES-128,URI="/key.bin"')
+
+        for index in range(settings.segments):
+            lines += [f'#EXTINF:{settings.duration:.3f},', f'seg{index}.ts']
+
+        lines.append('#EXT-X-ENDLIST')
+        return ('\n'.join(lines) + '\n').encode()
+
+    def _master_playlist(self) -> bytes:
+        settings = self.settings
+        bandwidth = int(settings.segment_size * 8 / settings.duration)
+        lines = ['#EXTM3U']
+
+        if settings.audio:
+            lines.append('#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",LANGUAGE="ita",NAME="Italian",DEFAULT=YES,URI="/audio/index.m3u8"')
+            lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION=1280x720,CODECS="avc1.640028,mp4a.40.2",AUDIO="aud"')
+        else:
+            lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION=1280x720,CODECS="avc1.640028,mp4a.40.2"')
+
+        lines.append('/video/index.m3u8')
+        return ('\n'.join(lines) + '\n').encode()
+
+    def _segment(self, track: str, index: int) -> bytes:
+        settings = self.settings
+
+        if settings.media_dir:
+            with open(os.path.join(settings.media_dir, track, f'seg{index}.ts'), 'rb') as f:
+                data = f.read()
+        else:
+            data = segment_payload(settings.seed, track, index, settings.segment_size)
+
+        return encrypt_segment(data, index) if settings.encrypt else data
+
+    def do_GET(self):
+        settings = self.settings
+        path = self.path.split('?')[0]
+
+        if path == '/master.m3u8':
+            return self._send(self._master_playlist(), content_type='application/vnd.apple.mpegurl')
+        if path in ('/video/index.m3u8', '/audio/index.m3u8'):
+            return self._send(self._media_playlist(), content_type='application/vnd.apple.mpegurl')
+        if path == '/key.bin':
+            return self._send(KEY)
+
+        if path == '/stats':
+            with self.lock:
+                body = json.dumps({'latencies': self.latencies, 'counters': self.counters}).encode()
+                CDNHandler.latencies = []
+                CDNHandler.counters = {}
+            return self._send(body, content_type='application/json')
+
+        track, _, name = path.strip('/').partition('/')
+        if track not in ('video', 'audio') or not name.startswith('seg') or not name.endswith('.ts'):
+            return self._send(b'', status=404)
+
+        start = time.perf_counter()
+        index = int(name[3:-3])
+
+        delay = settings.latency_ms + random.uniform(0, settings.jitter_ms)
+        if settings.slow_every and index % settings.slow_every == settings.slow_every - 1:
+            delay += settings.slow_ms
+        time.sleep(delay / 1000)
+
+        if random.random() < settings.error_rate:
+            with self.lock:
+                self.counters[str(settings.error_status)] = self.counters.get(str(settings.error_status), 0) + 1
+            return self._send(b'', status=settings.error_status)
+
+        self._send(self._segment(track, index))
+
+        with self.lock:
+            self.latencies.append(time.perf_counter() - start)
+            self.counters['200'] = self.counters.get('200', 0) + 1
+
+
+    def do_HEAD(self):
+        """Content-Length of a segment, used by the size probes of the downloader."""
+        track, _, name = self.path.split('?')[0].strip('/').partition('/')
+        if track not in ('video', 'audio') or not name.startswith('seg') or not name.endswith('.ts'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(self._segment(track, int(name[3:-3])))))
+        self.end_headers()
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def _serve(settings: CDNSettings, port_queue) -> None:
+    CDNHandler.settings = settings
+    server = ThreadingServer(('127.0.0.1', 0), CDNHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class MockCDN:
+    def __init__(self, settings: CDNSettings):
+        """
+        Initialize the MockCDN object.
+
+        Parameters:
+            - settings (CDNSettings): What the CDN serves and how it misbehaves.
+        """
+        self.settings = settings
+        self.process = None
+        self.base_url = None
+
+    def start(self) -> str:
+        """Start the server process, returns its base url."""
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(self.settings, port_queue), daemon=True)
+        self.process.start()
+        self.base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+        return self.base_url
+
+    def stats(self) -> dict:
+        """Segment latencies (seconds) and status counters since the previous call."""
+        return httpx.get(f"{self.base_url}/stats").json()
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
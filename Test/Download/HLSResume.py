@@ -0,0 +1,81 @@
+# 18.10.26
+
+import unittest
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+sys.path.append(os.path.join(src_path, 'Test', 'Benchmark'))
+
+
+
+# Import
+import time
+import shutil
+import tempfile
+import threading
+from mock_cdn import CDNSettings, MockCDN
+from StreamingCommunity.Util.os import get_ffmpeg_path
+from StreamingCommunity.Lib.Downloader import HLS_Downloader
+
+
+class TestHLSResume(unittest.TestCase):
+    def setUp(self):
+        self.settings = CDNSettings(segments=40, segment_kb=64, latency_ms=50, audio=False)
+        self.cdn = MockCDN(self.settings)
+        self.cdn.start()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.tmp_dir, 'resume.mp4')
+
+    def tearDown(self):
+        self.cdn.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _stop_after(self, downloader: HLS_Downloader, segments: int) -> dict:
+        """Run the download in a thread and stop it (two Ctrl+C) once `segments` are downloaded."""
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(downloader.start()))
+        thread.start()
+
+        while thread.is_alive():
+            manager = downloader.download_manager
+            if manager is not None and manager.active_downloaders and len(manager.active_downloaders[0].downloaded_segments) >= segments:
+                manager.active_downloaders[0].handle_interrupt()
+                manager.active_downloaders[0].handle_interrupt()
+                break
+            time.sleep(0.01)
+
+        thread.join()
+        return result
+
+    def test_stop_and_resume(self):
+        m3u8_url = f"{self.cdn.base_url}/master.m3u8"
+        first = HLS_Downloader(m3u8_url=m3u8_url, output_path=self.output_path)
+        result = self._stop_after(first, 10)
+
+        # The stopped stream is kept for the next run, not merged
+        video_folder = os.path.join(first.path_manager.temp_dir, 'video')
+        self.assertTrue(result['stopped'])
+        self.assertIsNone(result['error'])
+        self.assertFalse(os.path.exists(self.output_path))
+        self.assertTrue(os.path.exists(os.path.join(video_folder, '0.ts.journal')))
+
+        second = HLS_Downloader(m3u8_url=m3u8_url, output_path=self.output_path)
+        result = second.start()
+        segments = second.download_manager.active_downloaders[0]
+        self.assertGreater(segments.resume_index, 0)
+        self.assertEqual(len(segments.downloaded_segments), self.settings.segments)
+
+        if get_ffmpeg_path():
+            self.assertIsNone(result['error'])
+            self.assertTrue(os.path.exists(self.output_path))
+
+        else:
+            with open(os.path.join(video_folder, '0.ts'), 'rb') as f:
+                self.assertEqual(f.read(), self.settings.expected_track('video'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import unittest
+from unittest.mock import patch
+import httpx
+from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
+from StreamingCommunity.Api.Site.guardaserie.util.ScrapeSerie import GetSerieInfo
+
+
+def episode(season: int, number: int) -> str:
+    return f'<li><a data-num="{season}x{number}" data-title="Episode {number}" data-link="https://host/{season}/{number}"></a></li>'
+
+
+PAGE = (
+    '<h1 class="entry-title">Show</h1>'
+    '<div class="tt_season"><ul><li>1</li><li>2</li><li>3</li></ul></div>'
+    f'<div class="tab-pane" id="season-1"><ul>{episode(1, 1)}{episode(1, 2)}</ul></div>'
+    # Season 2 has no tab at all, season 3 has an entry without link
+    f'<div class="tab-pane" id="season-3"><ul>{episode(3, 1)}<li>coming soon</li>{episode(3, 3)}</ul></div>'
+)
+
+
+class TestGuardaserieScrape(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def fake_get(url, endpoint='default', **kwargs):
+            self.requests.append(url)
+            return httpx.Response(200, text=self.page, request=httpx.Request('GET', url))
+
+        self.page = PAGE
+        self.patcher = patch('StreamingCommunity.Api.Site.guardaserie.util.ScrapeSerie.http_cache.get', side_effect=fake_get)
+        self.patcher.start()
+        self.scraper = GetSerieInfo(MediaItem(name='Show (search)', url='https://guardaserie/show'))
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_malformed_season(self):
+        self.assertEqual(self.scraper.get_seasons_number(), 3)
+        self.assertEqual([e['number'] for e in self.scraper.get_episode_number(1)], ['1x1', '1x2'])
+        self.assertEqual(self.scraper.get_episode_number(2), [])
+        self.assertEqual([e['number'] for e in self.scraper.get_episode_number(3)], ['3x1', '3x3'])
+
+        # Every season comes from a single request of the page
+        self.assertEqual(len(self.requests), 1)
+
+    def test_missing_title(self):
+        self.page = PAGE.replace('<h1 class="entry-title">Show</h1>', '')
+
+        self.assertEqual(self.scraper.get_seasons_number(), 3)
+        self.assertEqual(self.scraper.tv_name, 'Show (search)')
+
+
+if __name__ == '__main__':
+    unittest.main()
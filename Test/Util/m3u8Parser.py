@@ -0,0 +1,108 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import shutil
+import tempfile
+import unittest
+from Cryptodome.Cipher import AES
+from Cryptodome.Util.Padding import pad
+from StreamingCommunity.Lib.M3U8 import M3U8_Parser, M3U8_Decryption, detect_container
+from StreamingCommunity.Lib.Downloader.HLS.segments import M3U8_Segments
+
+
+KEY = bytes(range(16))
+INIT = b'\x00\x00\x00\x18ftypiso6' + bytes(16)
+PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:7
+#EXT-X-TARGETDURATION:4
+#EXT-X-MEDIA-SEQUENCE:5
+#EXT-X-KEY:METHOD=AES-128,URI="key.bin"
+#EXT-X-MAP:URI="init.mp4"
+#EXTINF:4.0,
+seg5.m4s
+#EXTINF:4.0,
+seg6.m4s
+#EXT-X-KEY:METHOD=NONE
+#EXT-X-MAP:URI="init2.mp4"
+#EXT-X-KEY:METHOD=AES-128,URI="key.bin",IV=0x000102030405060708090a0b0c0d0e0f
+#EXTINF:4.0,
+seg7.m4s
+#EXT-X-ENDLIST
+"""
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self, resources: dict):
+        self.resources = resources
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.resources[url.rsplit('/', 1)[-1]])
+
+
+class TestM3U8InitSection(unittest.TestCase):
+    def setUp(self):
+        self.parser = M3U8_Parser()
+        self.parser.parse_data("https://cdn.example/video/index.m3u8", PLAYLIST)
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_key_in_effect_at_map(self):
+        first, second, third = self.parser.segment_init
+
+        self.assertEqual(first['key']['method'], 'AES-128')
+        self.assertEqual(first['sequence'], 5)
+        self.assertEqual(second, first)
+
+        # The key tag after the second map only applies to the segment
+        self.assertIsNone(third['key'])
+        self.assertIsNotNone(self.parser.segment_keys[2])
+
+    def test_encrypted_init_section_is_decrypted(self):
+        encrypted = AES.new(KEY, AES.MODE_CBC, iv=M3U8_Decryption.sequence_iv(5)).encrypt(pad(INIT, AES.block_size))
+
+        segments = M3U8_Segments("https://cdn.example/video/index.m3u8", self.tmp_dir)
+        segments._get_http_client = lambda url: FakeClient({'init.mp4': encrypted, 'init2.mp4': INIT, 'key.bin': KEY})
+        segments.parse_data(PLAYLIST)
+
+        self.assertEqual(segments._get_init_section(0), INIT)
+        self.assertEqual(segments._get_init_section(2), INIT)
+
+
+class TestPackedAudioContainer(unittest.TestCase):
+    def id3(self, size: int) -> bytes:
+        return b'ID3\x04\x00\x00' + bytes([0, 0, size >> 7, size & 0x7F]) + bytes(size)
+
+    def test_codec_after_id3_tag(self):
+        frames = {
+            'aac': b'\xff\xf1\x50\x80',
+            'mp3': b'\xff\xfb\x90\x64',
+            'ac3': b'\x0b\x77\x00\x00\x00\x40',
+            'eac3': b'\x0b\x77\x00\x00\x00\x80'
+        }
+        for name, frame in frames.items():
+            self.assertEqual(detect_container(self.id3(300) + frame), (name, 0))
+
+    def test_unknown_codec(self):
+        self.assertEqual(detect_container(self.id3(300) + bytes(8)), (None, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()